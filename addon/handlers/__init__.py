@@ -0,0 +1,55 @@
+import bpy
+from bpy.app.handlers import persistent
+
+from ..utils.action_archive import clear_stub_registry, queue_stubs_from_depsgraph
+from ..utils.action_stats import clear_cache, mark_dirty_from_depsgraph
+from ..utils.boundary_index import clear_index, mark_stale_from_depsgraph
+from ..utils.nla_cow import clear_snapshots, queue_cow_from_depsgraph
+
+# Hooks run on every depsgraph update, each isolated so one failure can't block the rest
+_DEPSGRAPH_HOOKS = (
+    queue_stubs_from_depsgraph,
+    mark_dirty_from_depsgraph,
+    queue_cow_from_depsgraph,
+    mark_stale_from_depsgraph,
+)
+
+
+@persistent
+def ah_depsgraph_update_post(scene, depsgraph):
+    """Single entry point for the add-on's depsgraph hooks"""
+    for hook in _DEPSGRAPH_HOOKS:
+        try:
+            hook(depsgraph)
+        except Exception as e:
+            print(f"Anim Helper depsgraph handler error in {hook.__name__}: {str(e)}")
+
+
+@persistent
+def ah_load_post(*args):
+    """Drop per-file caches when another .blend is opened"""
+    clear_cache()
+    clear_snapshots()
+    clear_index()
+    clear_stub_registry()
+
+
+# (handler list, function) pairs
+_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, ah_depsgraph_update_post),
+    (bpy.app.handlers.load_post, ah_load_post),
+)
+
+
+def register_handlers():
+    for handler_list, func in _HANDLERS:
+        # Drop stale copies left by a reload before adding the current one
+        for existing in [h for h in handler_list if getattr(h, "__name__", "") == func.__name__]:
+            handler_list.remove(existing)
+        handler_list.append(func)
+
+
+def unregister_handlers():
+    for handler_list, func in reversed(_HANDLERS):
+        for existing in [h for h in handler_list if getattr(h, "__name__", "") == func.__name__]:
+            handler_list.remove(existing)
@@ -0,0 +1,30 @@
+import bpy
+
+# (keymap name, space type, operator, key, modifiers, properties)
+_KEYMAP_ITEMS = (
+    ("Frames", 'EMPTY', "anim.jump_to_strip_boundary", 'RIGHT_ARROW', {'ctrl': True, 'shift': True}, {'direction': 'NEXT'}),
+    ("Frames", 'EMPTY', "anim.jump_to_strip_boundary", 'LEFT_ARROW', {'ctrl': True, 'shift': True}, {'direction': 'PREVIOUS'}),
+)
+
+_addon_keymaps = []
+
+
+def register_keymaps():
+    keyconfig = bpy.context.window_manager.keyconfigs.addon
+    if keyconfig is None:  # background mode
+        return
+    for name, space_type, idname, key, modifiers, properties in _KEYMAP_ITEMS:
+        keymap = keyconfig.keymaps.new(name=name, space_type=space_type)
+        item = keymap.keymap_items.new(idname, key, 'PRESS', **modifiers)
+        for attr, value in properties.items():
+            setattr(item.properties, attr, value)
+        _addon_keymaps.append((keymap, item))
+
+
+def unregister_keymaps():
+    for keymap, item in _addon_keymaps:
+        try:
+            keymap.keymap_items.remove(item)
+        except (ReferenceError, RuntimeError):
+            pass
+    _addon_keymaps.clear()
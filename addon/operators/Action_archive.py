@@ -0,0 +1,198 @@
+import bpy
+
+from .Facial_auto_processor import FacialAnimationProcessor
+from ..utils.action_archive import (
+    archive_action,
+    archive_directory,
+    is_stub,
+    load_index,
+    rehydrate_action,
+    remember_stub_slots,
+    save_index,
+    search_index,
+    stub_actions_in_use,
+)
+
+
+def describe_action(action):
+    """Searchable index metadata parsed from the facial naming scheme"""
+    parts = FacialAnimationProcessor().parse_speech_action_name(action.name)
+    if not parts:
+        return {"char_code": "", "kind": "", "number": 0, "suffix": ""}
+    return parts
+
+
+class AH_ArchiveActions(bpy.types.Operator):
+    """Move cold actions to compressed files in the archive folder, leaving lightweight stubs"""
+    bl_idname = "action.archive_actions"
+    bl_label = "Archive Actions"
+    bl_description = "Write actions to the archive folder and replace them with stubs that reload on demand"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    target: bpy.props.EnumProperty(
+        name="Actions",
+        items=[
+            ('SPEECH', "Speech Actions", "CC_*_SPEECH_* actions created by the facial processor"),
+            ('KEYWORD', "Keyword", "Actions containing the Action Management keyword"),
+        ],
+        default='SPEECH'
+    )
+
+    character_code: bpy.props.StringProperty(
+        name="Character Code",
+        description="Only speech actions of this character (e.g. 'JOH'). Leave empty for all",
+        default=""
+    )
+
+    only_unused: bpy.props.BoolProperty(
+        name="Only Unused Actions",
+        description="Skip actions that are assigned or placed in the NLA (only a fake user keeps them)",
+        default=True
+    )
+
+    def execute(self, context):
+        directory = archive_directory(context.scene)
+        if directory is None:
+            self.report({'ERROR'}, "Save the file or set an absolute archive folder first")
+            return {'CANCELLED'}
+
+        actions = self.get_target_actions(context)
+        if self.only_unused:
+            actions = [a for a in actions if a.users - int(a.use_fake_user) == 0]
+        if not actions:
+            self.report({'WARNING'}, "No actions to archive")
+            return {'CANCELLED'}
+
+        entries = load_index(directory)
+        archived = 0
+        failed = 0
+        for action in actions:
+            try:
+                entry = archive_action(action, directory, describe_action)
+            except Exception as e:
+                print(f"Archive skipped {action.name}: {str(e)}")
+                failed += 1
+                continue
+            entries[entry["name"]] = entry
+            archived += 1
+        save_index(directory, entries)
+        # Stubs left on strips by this run aren't new placements
+        remember_stub_slots()
+
+        message = f"Archived {archived} actions to {directory}"
+        if failed:
+            message += f" ({failed} skipped, see console)"
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+    def get_target_actions(self, context):
+        actions = [a for a in bpy.data.actions if a.library is None and not is_stub(a)]
+        if self.target == 'KEYWORD':
+            keyword = context.scene.Dprops.keyword
+            if not keyword:
+                return []
+            return [a for a in actions if keyword in a.name]
+        speech = set(FacialAnimationProcessor().find_speech_actions(self.character_code))
+        return [a for a in actions if a in speech]
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=350)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(context.scene.ah_archive, "directory")
+        layout.prop(self, "target")
+        if self.target == 'SPEECH':
+            layout.prop(self, "character_code")
+        else:
+            layout.prop(context.scene.Dprops, "keyword")
+        layout.prop(self, "only_unused")
+
+
+class AH_RehydrateActions(bpy.types.Operator):
+    """Reload archived actions from the archive folder"""
+    bl_idname = "action.rehydrate_actions"
+    bl_label = "Load Archived Actions"
+    bl_description = "Restore archived actions from their compressed files"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    mode: bpy.props.EnumProperty(
+        name="Mode",
+        items=[
+            ('RESULT', "Search Result", "The action selected in the archive search results"),
+            ('ACTIVE_OBJECT', "Active Object", "Stubs used by the active object and its shape keys"),
+            ('ALL', "All Stubs", "Every stub action in this file"),
+        ],
+        default='RESULT'
+    )
+
+    def execute(self, context):
+        directory = archive_directory(context.scene)
+        if directory is None:
+            self.report({'ERROR'}, "Save the file or set an absolute archive folder first")
+            return {'CANCELLED'}
+        props = context.scene.ah_archive
+
+        if self.mode == 'RESULT':
+            if not (0 <= props.active_index < len(props.results)):
+                self.report({'WARNING'}, "Select an archived action first")
+                return {'CANCELLED'}
+            name = props.results[props.active_index].name
+            targets = [(name, bpy.data.actions.get(name))]
+        elif self.mode == 'ACTIVE_OBJECT':
+            obj = context.active_object
+            stubs = set()
+            if obj and obj.animation_data:
+                stubs |= stub_actions_in_use(obj.animation_data)
+            if obj and obj.type == 'MESH' and obj.data.shape_keys and obj.data.shape_keys.animation_data:
+                stubs |= stub_actions_in_use(obj.data.shape_keys.animation_data)
+            targets = [(a.name, a) for a in stubs]
+        else:
+            targets = [(a.name, a) for a in bpy.data.actions if is_stub(a)]
+
+        restored = 0
+        for name, action in targets:
+            if action is not None and not is_stub(action):
+                continue
+            try:
+                rehydrate_action(directory, name, action)
+                restored += 1
+            except Exception as e:
+                self.report({'WARNING'}, str(e))
+
+        for result in props.results:
+            result.is_stub = is_stub(bpy.data.actions.get(result.name))
+
+        self.report({'INFO'}, f"Loaded {restored} archived actions")
+        return {'FINISHED'}
+
+
+class AH_SearchActionArchive(bpy.types.Operator):
+    """Search the archive index without loading any action"""
+    bl_idname = "action.search_action_archive"
+    bl_label = "Search Archive"
+    bl_description = "List archived actions matching the search text"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        props = context.scene.ah_archive
+        directory = archive_directory(context.scene)
+        if directory is None:
+            self.report({'ERROR'}, "Save the file or set an absolute archive folder first")
+            return {'CANCELLED'}
+        entries = load_index(directory)
+        matches = search_index(entries, props.search)
+
+        props.results.clear()
+        for entry in matches:
+            item = props.results.add()
+            item.name = entry["name"]
+            item.char_code = entry.get("char_code", "")
+            item.fcurves = entry.get("fcurves", 0)
+            item.keys = entry.get("keys", 0)
+            item.size_kb = entry.get("size", 0) / 1024
+            item.is_stub = is_stub(bpy.data.actions.get(entry["name"]))
+        props.active_index = 0
+
+        self.report({'INFO'}, f"{len(matches)} of {len(entries)} archived actions match")
+        return {'FINISHED'}
@@ -0,0 +1,226 @@
+import bpy
+import numpy as np
+
+from ..utils.fcurve_arrays import (
+    BEZTRIPLE_BYTES,
+    HANDLE_AUTO,
+    INTERP_BEZIER,
+    channel_default,
+    estimate_fcurve_bytes,
+    read_keyframes,
+    subset_keyframes,
+    time_fcurve_evaluation,
+    write_keyframes,
+)
+from ..utils.nla_cow import private_tweak_action
+
+
+class AH_PruneStaticChannels(bpy.types.Operator):
+    """Remove constant fcurves and redundant interior keys from actions"""
+    bl_idname = "action.prune_static_channels"
+    bl_label = "Prune Static Channels"
+    bl_description = "Delete channels that never change and collapse runs of identical keys"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope: bpy.props.EnumProperty(
+        name="Scope",
+        items=[
+            ('ALL', "All Actions", "Scan every local action in the file"),
+            ('KEYWORD', "Keyword", "Only actions containing the Action Management keyword"),
+            ('ACTIVE', "Active Action", "Only the active object's action"),
+        ],
+        default='KEYWORD'
+    )
+
+    remove_constant_channels: bpy.props.BoolProperty(
+        name="Remove Constant Channels",
+        description="Delete fcurves whose value never changes",
+        default=True
+    )
+
+    constant_mode: bpy.props.EnumProperty(
+        name="Constant Channels",
+        items=[
+            ('DEFAULT_ONLY', "At Rest Value", "Only delete constant channels sitting at their rest value (scale 1, location 0, ...)"),
+            ('ANY', "Any Value", "Delete every constant channel, whatever value it holds"),
+        ],
+        default='DEFAULT_ONLY'
+    )
+
+    collapse_redundant_keys: bpy.props.BoolProperty(
+        name="Collapse Redundant Keys",
+        description="Remove interior keys inside runs of identical, flat keys",
+        default=True
+    )
+
+    tolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        description="Maximum value difference treated as identical",
+        default=0.00001,
+        min=0.0,
+        precision=6
+    )
+
+    measure_evaluation: bpy.props.BoolProperty(
+        name="Measure Evaluation Time",
+        description="Time fcurve evaluation before and after pruning",
+        default=True
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return bool(bpy.data.actions)
+
+    def execute(self, context):
+        actions = self.get_target_actions(context)
+        if actions is None:
+            return {'CANCELLED'}
+        if not actions:
+            self.report({'INFO'}, "No actions to prune")
+            return {'CANCELLED'}
+
+        eval_before = self.measure(actions) if self.measure_evaluation else 0.0
+
+        channels_removed = 0
+        keys_removed = 0
+        bytes_saved = 0
+        actions_changed = 0
+
+        for action in actions:
+            removed_channels, removed_keys, saved = self.prune_action(action)
+            channels_removed += removed_channels
+            keys_removed += removed_keys
+            bytes_saved += saved
+            if removed_channels or removed_keys:
+                actions_changed += 1
+
+        message = (f"Pruned {channels_removed} static channels and {keys_removed} redundant keys "
+                   f"in {actions_changed}/{len(actions)} actions (~{bytes_saved / 1024:.1f} KB saved")
+        if self.measure_evaluation:
+            eval_after = self.measure(actions)
+            message += f", {max(0.0, eval_before - eval_after) * 1000:.3f} ms/frame evaluation saved"
+        self.report({'INFO'}, message + ")")
+        return {'FINISHED'}
+
+    def get_target_actions(self, context):
+        """Collect the local actions selected by the scope setting"""
+        if self.scope == 'ACTIVE':
+            obj = context.active_object
+            if not obj or not obj.animation_data or not obj.animation_data.action:
+                self.report({'ERROR'}, "Active object has no action")
+                return None
+            return [private_tweak_action(obj.animation_data)]
+
+        actions = [action for action in bpy.data.actions if action.library is None]
+        if self.scope == 'KEYWORD':
+            keyword = context.scene.Dprops.keyword
+            if not keyword:
+                self.report({'WARNING'}, "Keyword cannot be empty")
+                return None
+            actions = [action for action in actions if keyword in action.name]
+        return actions
+
+    def measure(self, actions):
+        """Per-frame fcurve evaluation cost summed over all actions"""
+        total = 0.0
+        for action in actions:
+            start, end = action.frame_range
+            frames = np.linspace(start, end, 10)
+            total += time_fcurve_evaluation(action.fcurves, frames)
+        return total
+
+    def prune_action(self, action):
+        """Prune one action, returns (channels removed, keys removed, bytes saved)"""
+        channels_removed = 0
+        keys_removed = 0
+        bytes_saved = 0
+        tol = self.tolerance
+
+        for fcurve in list(action.fcurves):
+            if len(fcurve.modifiers) or fcurve.lock:
+                continue
+
+            keys = read_keyframes(fcurve, full=self.collapse_redundant_keys)
+            count = len(keys.frames)
+            if count == 0:
+                continue
+
+            flat = self.flat_handles(keys, tol)
+            if self.remove_constant_channels and self.is_constant(fcurve, keys, flat, tol):
+                bytes_saved += estimate_fcurve_bytes(fcurve, count)
+                action.fcurves.remove(fcurve)
+                channels_removed += 1
+                continue
+
+            if self.collapse_redundant_keys and count > 2:
+                keep = self.redundant_key_mask(keys, flat, tol)
+                dropped = count - int(keep.sum())
+                if dropped:
+                    write_keyframes(fcurve, subset_keyframes(keys, keep))
+                    keys_removed += dropped
+                    bytes_saved += dropped * BEZTRIPLE_BYTES
+
+        if channels_removed:
+            for group in list(action.groups):
+                if not group.channels:
+                    action.groups.remove(group)
+
+        return channels_removed, keys_removed, bytes_saved
+
+    @staticmethod
+    def flat_handles(keys, tol):
+        """Per key: True when both Bezier handles sit at the key's value"""
+        values = keys.values
+        left_ok = np.abs(keys.handle_left[:, 1] - values) <= tol
+        right_ok = np.abs(keys.handle_right[:, 1] - values) <= tol
+        # Only the outgoing handle shapes a segment for non-Bezier keys
+        bezier = keys.interpolation == INTERP_BEZIER
+        prev_bezier = np.concatenate(([True], bezier[:-1]))
+        return (left_ok | ~prev_bezier) & (right_ok | ~bezier)
+
+    def is_constant(self, fcurve, keys, flat, tol):
+        values = keys.values
+        if np.ptp(values) > tol or not flat.all():
+            return False
+        if self.constant_mode == 'ANY':
+            return True
+        return abs(values[0] - channel_default(fcurve.data_path, fcurve.array_index)) <= tol
+
+    @staticmethod
+    def redundant_key_mask(keys, flat, tol):
+        """Keep mask dropping interior keys of flat runs of identical values"""
+        values = keys.values
+        mid = values[1:-1]
+        redundant = (
+            (np.abs(mid - values[:-2]) <= tol)
+            & (np.abs(mid - values[2:]) <= tol)
+            & flat[1:-1] & flat[:-2] & flat[2:]
+        )
+        # Plain AUTO handles of the surviving neighbours would be recalculated
+        # from different neighbours, so leave those runs alone
+        auto = (keys.handle_left_type == HANDLE_AUTO) | (keys.handle_right_type == HANDLE_AUTO)
+        redundant &= ~auto[:-2] & ~auto[2:]
+
+        keep = np.ones(len(values), dtype=bool)
+        # Run end points never qualify, so a whole run collapses to its two ends
+        keep[1:-1] = ~redundant
+        return keep
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=350)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "scope")
+        if self.scope == 'KEYWORD':
+            layout.prop(context.scene.Dprops, "keyword")
+
+        layout.separator()
+        layout.prop(self, "remove_constant_channels")
+        if self.remove_constant_channels:
+            layout.prop(self, "constant_mode")
+        layout.prop(self, "collapse_redundant_keys")
+        layout.prop(self, "tolerance")
+
+        layout.separator()
+        layout.prop(self, "measure_evaluation")
@@ -0,0 +1,204 @@
+import bpy
+
+from .Facial_auto_processor import FacialAnimationProcessor, auto_processor
+from ..utils.action_resample import resample_action
+from ..utils.anim_data import iter_animation_data
+from ..utils.nla_cow import private_tweak_action
+
+
+class AH_ResampleActions(bpy.types.Operator):
+    """Resample actions to a new frame rate or time scale directly from their fcurves"""
+    bl_idname = "action.resample_actions"
+    bl_label = "Resample / Retime Actions"
+    bl_description = "Convert actions between frame rates or scale them in time without baking the scene"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    target: bpy.props.EnumProperty(
+        name="Actions",
+        items=[
+            ('SPEECH', "Speech Actions", "CC_*_SPEECH_* actions created by the facial processor"),
+            ('KEYWORD', "Keyword", "Actions containing the Action Management keyword"),
+            ('ACTIVE', "Active Action", "Only the active object's action"),
+        ],
+        default='SPEECH'
+    )
+
+    character_code: bpy.props.StringProperty(
+        name="Character Code",
+        description="Only speech actions of this character (e.g. 'JOH'). Leave empty for all",
+        default=""
+    )
+
+    use_language_suffix: bpy.props.BoolProperty(
+        name="Current Language Only",
+        description="Only speech actions using the current language suffix",
+        default=False
+    )
+
+    retime_mode: bpy.props.EnumProperty(
+        name="Retime Mode",
+        items=[
+            ('FPS', "Frame Rate", "Convert from a source to a target frame rate"),
+            ('SCALE', "Time Scale", "Scale the timing by a factor"),
+        ],
+        default='FPS'
+    )
+
+    source_fps: bpy.props.FloatProperty(
+        name="Source FPS",
+        description="Frame rate the actions were recorded at",
+        default=60.0,
+        min=1.0
+    )
+
+    target_fps: bpy.props.FloatProperty(
+        name="Target FPS",
+        description="Frame rate to deliver at",
+        default=24.0,
+        min=1.0
+    )
+
+    time_scale: bpy.props.FloatProperty(
+        name="Time Scale",
+        description="Factor applied to timing (2 = twice as long)",
+        default=1.0,
+        min=0.01
+    )
+
+    preserve_extremes: bpy.props.BoolProperty(
+        name="Preserve Extremes",
+        description="Keep the exact value of every peak and trough key on its nearest new frame",
+        default=True
+    )
+
+    refit_keys: bpy.props.BoolProperty(
+        name="Re-fit to Sparse Keys",
+        description="Reduce the resampled keys to those needed within the tolerance",
+        default=False
+    )
+
+    refit_tolerance: bpy.props.FloatProperty(
+        name="Refit Tolerance",
+        description="Maximum value error allowed when reducing keys",
+        default=0.001,
+        min=0.0,
+        precision=4
+    )
+
+    update_strips: bpy.props.BoolProperty(
+        name="Update NLA Strips",
+        description="Fit NLA strips using these actions to the new action range",
+        default=True
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return bool(bpy.data.actions)
+
+    def execute(self, context):
+        actions = self.get_target_actions(context)
+        if not actions:
+            self.report({'WARNING'}, "No actions found to resample")
+            return {'CANCELLED'}
+
+        if self.retime_mode == 'FPS':
+            scale = self.target_fps / self.source_fps
+        else:
+            scale = self.time_scale
+
+        keys_before = 0
+        keys_after = 0
+        for action in actions:
+            before, after = resample_action(
+                action,
+                scale,
+                preserve_extremes=self.preserve_extremes,
+                refit_tolerance=self.refit_tolerance if self.refit_keys else 0.0,
+            )
+            keys_before += before
+            keys_after += after
+
+        strips_updated = self.update_nla_strips(actions) if self.update_strips else 0
+
+        message = f"Resampled {len(actions)} actions (x{scale:.3f}): {keys_before} → {keys_after} keys"
+        if strips_updated:
+            message += f", {strips_updated} NLA strips updated"
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+    def get_target_actions(self, context):
+        """Collect the actions to retime"""
+        if self.target == 'ACTIVE':
+            obj = context.active_object
+            if obj and obj.animation_data and obj.animation_data.action:
+                return [private_tweak_action(obj.animation_data)]
+            return []
+
+        if self.target == 'KEYWORD':
+            keyword = context.scene.Dprops.keyword
+            if not keyword:
+                return []
+            return [action for action in bpy.data.actions
+                    if keyword in action.name and action.library is None]
+
+        suffix = auto_processor._suffix if self.use_language_suffix else None
+        processor = FacialAnimationProcessor()
+        return [action for action in processor.find_speech_actions(self.character_code, suffix)
+                if action.library is None]
+
+    def update_nla_strips(self, actions):
+        """Fit every strip playing one of the actions to its new frame range"""
+        targets = set(actions)
+        updated = 0
+        for anim_data in iter_animation_data():
+            for track in anim_data.nla_tracks:
+                for strip in track.strips:
+                    if strip.action not in targets:
+                        continue
+                    start, end = strip.action.frame_range
+                    if end > strip.action_frame_end:
+                        strip.action_frame_end = end
+                        strip.action_frame_start = start
+                    else:
+                        strip.action_frame_start = start
+                        strip.action_frame_end = end
+                    updated += 1
+        return updated
+
+    def invoke(self, context, event):
+        self.target_fps = context.scene.render.fps / context.scene.render.fps_base
+        return context.window_manager.invoke_props_dialog(self, width=350)
+
+    def draw(self, context):
+        layout = self.layout
+
+        box = layout.box()
+        box.label(text="Actions", icon='ACTION')
+        box.prop(self, "target", text="")
+        if self.target == 'SPEECH':
+            box.prop(self, "character_code")
+            row = box.row()
+            row.prop(self, "use_language_suffix")
+            row.label(text=f"Suffix: {auto_processor._suffix or 'None'}")
+        elif self.target == 'KEYWORD':
+            box.prop(context.scene.Dprops, "keyword")
+
+        box = layout.box()
+        box.label(text="Timing", icon='TIME')
+        box.prop(self, "retime_mode", expand=True)
+        if self.retime_mode == 'FPS':
+            row = box.row(align=True)
+            row.prop(self, "source_fps")
+            row.prop(self, "target_fps")
+        else:
+            box.prop(self, "time_scale")
+
+        box = layout.box()
+        box.label(text="Keys", icon='KEYFRAME')
+        box.prop(self, "preserve_extremes")
+        box.prop(self, "refit_keys")
+        if self.refit_keys:
+            box.prop(self, "refit_tolerance")
+
+        layout.prop(self, "update_strips")
+
@@ -0,0 +1,40 @@
+import time
+
+import bpy
+
+from .Facial_auto_processor import FacialAnimationProcessor
+from ..utils.action_stats import get_action_stats
+
+
+class AH_RefreshActionStats(bpy.types.Operator):
+    """Refresh the per-action statistics list (only changed actions are re-measured)"""
+    bl_idname = "action.refresh_action_stats"
+    bl_label = "Refresh Action Statistics"
+    bl_description = "Update fcurve, key, memory and evaluation statistics for all actions"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        props = context.scene.ah_stats
+        processor = FacialAnimationProcessor()
+        start = time.perf_counter()
+
+        rows = []
+        for action in bpy.data.actions:
+            stats = get_action_stats(action, props.measure_eval)
+            parts = processor.parse_speech_action_name(action.name)
+            rows.append((action.name, parts['char_code'] if parts else "", stats))
+
+        props.items.clear()
+        for name, char_code, stats in rows:
+            item = props.items.add()
+            item.name = name
+            item.char_code = char_code
+            item.fcurves = stats['fcurves']
+            item.keys = stats['keys']
+            item.memory_kb = stats['memory'] / 1024
+            item.eval_us = stats['eval_time'] * 1e6
+        props.active_index = min(props.active_index, max(0, len(rows) - 1))
+
+        elapsed = time.perf_counter() - start
+        self.report({'INFO'}, f"Statistics for {len(rows)} actions refreshed in {elapsed:.2f}s")
+        return {'FINISHED'}
@@ -1,4 +1,12 @@
 import bpy
+import numpy as np
+
+from .Facial_auto_processor import FacialAnimationProcessor
+from ..utils.audio_envelope import envelopes_for_strips
+from ..utils.consolidation_plan import PlanApplier, store_plan
+from ..utils.lip_sync import motion_onset, speech_onset, strip_frame_of_action_frame
+from ..utils.nla_index import TrackIndex
+from ..utils.strip_matching import match_strips, parse_routing, route_audio, routing_keywords, score_matrix
 
 class AH_ConsolidateAudioNLA(bpy.types.Operator):
     """Consolidate NLA strips to single track and align to audio order or even spacing"""
@@ -26,11 +34,20 @@ class AH_ConsolidateAudioNLA(bpy.types.Operator):
         items=[
             ('ACTIVE_OBJECT', "Active Object Only", "Only process the active armature and its children"),
             ('CHARACTER_FILTER', "Character Filter", "Process strips matching the character filter"),
-            ('SELECTED_OBJECTS', "Selected Objects", "Process selected armatures and meshes")
+            ('SELECTED_OBJECTS', "Selected Objects", "Process selected armatures and meshes"),
+            ('ALL_CHARACTERS', "All Characters", "Consolidate every character in the scene in one pass, each with its own audio")
         ],
         default='ACTIVE_OBJECT'
     )
     
+    # Batch audio routing
+    audio_routing: bpy.props.StringProperty(
+        name="Audio Routing",
+        description="Extra audio keywords per character code or rig name, e.g. 'JOH:john, Marco:marco'. "
+                    "The code and the rig name are always used",
+        default=""
+    )
+    
     # Character filter for NLA
     character_filter: bpy.props.StringProperty(
         name="NLA Character Filter",
@@ -44,11 +61,54 @@ class AH_ConsolidateAudioNLA(bpy.types.Operator):
         items=[
             ('EVEN_SPACING', "Even Spacing", "Space strips evenly without requiring audio"),
             ('MOVE_NLA_TO_AUDIO', "Move NLA to Audio", "Keep audio in place, move NLA strips to match audio timing"),
-            ('MOVE_AUDIO_TO_NLA', "Move Audio to NLA", "Keep NLA in place, move audio to match NLA timing")
+            ('MOVE_AUDIO_TO_NLA', "Move Audio to NLA", "Keep NLA in place, move audio to match NLA timing"),
+            ('SPEECH_ONSET', "Match Speech Onset", "Move NLA strips so mouth motion starts when speech starts in each audio clip")
         ],
         default='EVEN_SPACING'
     )
     
+    # Pairing of NLA strips with audio strips
+    pairing_mode: bpy.props.EnumProperty(
+        name="Pairing",
+        items=[
+            ('MATCH', "Best Match", "Pair strips and audio by name (line number, character, language), duration and position, solved globally"),
+            ('ORDER', "By Order", "Pair the i-th NLA strip with the i-th audio strip")
+        ],
+        default='MATCH'
+    )
+    
+    min_match_score: bpy.props.FloatProperty(
+        name="Minimum Match Score",
+        description="Pairs scoring lower than this are left unmatched instead",
+        default=0.3,
+        min=0.0,
+        max=1.0
+    )
+    
+    preview_only: bpy.props.BoolProperty(
+        name="Plan Only",
+        description="List the audio pairing and every planned strip move in the panel without changing anything",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+    
+    # Onset detection
+    speech_threshold: bpy.props.FloatProperty(
+        name="Speech Threshold",
+        description="Loudness, as a fraction of each clip's peak, where speech is considered to start",
+        default=0.1,
+        min=0.01,
+        max=1.0
+    )
+    
+    motion_threshold: bpy.props.FloatProperty(
+        name="Mouth Motion Threshold",
+        description="Fraction of each mouth channel's range where motion is considered to start",
+        default=0.05,
+        min=0.01,
+        max=1.0
+    )
+    
     # Track naming
     rig_track_name: bpy.props.StringProperty(
         name="Rig Track Name",
@@ -112,35 +172,69 @@ class AH_ConsolidateAudioNLA(bpy.types.Operator):
             
             # Get filtered audio strips (optional now)
             audio_strips = []
-            if self.alignment_mode in ['MOVE_NLA_TO_AUDIO', 'MOVE_AUDIO_TO_NLA']:
+            if self.alignment_mode in ['MOVE_NLA_TO_AUDIO', 'MOVE_AUDIO_TO_NLA', 'SPEECH_ONSET']:
                 audio_strips = self.get_filtered_audio_strips(context)
                 if not audio_strips and self.use_audio_filter:
                     self.report({'ERROR'}, f"No audio strips found matching keyword: '{self.audio_keyword_filter}'")
                     return {'CANCELLED'}
             
-            # Get all NLA data organized by type
-            nla_data = self.get_all_nla_data(context)
+            props = context.scene.ah_consolidation
+            if self.alignment_mode == 'EVEN_SPACING':
+                props.matches.clear()
             
-            if not nla_data['rig_strips'] and not nla_data['shapekey_strips']:
-                self.report({'ERROR'}, "No NLA strips found to consolidate")
-                return {'CANCELLED'}
+            if self.target_mode == 'ALL_CHARACTERS':
+                planned = self.plan_batch(context, audio_strips)
+                if planned is None:
+                    self.report({'ERROR'}, "No NLA strips found to consolidate")
+                    return {'CANCELLED'}
+                rows, summary = planned
+            else:
+                # Get all NLA data organized by type
+                nla_data = self.get_all_nla_data(context)
+                
+                if not nla_data['rig_strips'] and not nla_data['shapekey_strips']:
+                    self.report({'ERROR'}, "No NLA strips found to consolidate")
+                    return {'CANCELLED'}
+                
+                rows = self.plan_consolidation(context, nla_data, audio_strips)
+                summary = []
             
-            # Apply consolidation
-            consolidated_count = self.apply_consolidation(context, nla_data, audio_strips)
+            # Phase 1: the plan, nothing has been changed yet
+            store_plan(props, rows, self.remove_original_tracks)
+            if self.preview_only:
+                return self.report_plan(context)
+            
+            # Phase 2: execute it; rows are marked done so a failure can be resumed
+            applier = PlanApplier(context.scene, props)
+            applier.apply_batch()
+            if applier.failed:
+                for name in applier.failed:
+                    print(f"Consolidation: {name} failed")
+                self.report({'WARNING'}, f"Consolidated {applier.applied} strips, {len(applier.failed)} failed. "
+                                         "Fix them and press Resume in the panel")
+                return {'FINISHED'}
+            if props.plan_remove_tracks:
+                applier.remove_original_tracks()
             
             mode_desc = {
                 'EVEN_SPACING': f'evenly spaced ({self.strip_spacing} frame gaps)',
                 'MOVE_NLA_TO_AUDIO': 'NLA aligned to audio positions', 
-                'MOVE_AUDIO_TO_NLA': 'audio aligned to NLA positions'
+                'MOVE_AUDIO_TO_NLA': 'audio aligned to NLA positions',
+                'SPEECH_ONSET': 'mouth motion aligned to speech onsets'
             }
             
             filter_desc = f" (filtered by '{self.audio_keyword_filter}')" if self.use_audio_filter and audio_strips else ""
             audio_count = len(audio_strips) if audio_strips else 0
             
+            for line in summary:
+                print(f"Consolidation {line}")
+            summary_desc = f" ({'; '.join(summary)})" if summary else ""
             if self.alignment_mode == 'EVEN_SPACING':
-                self.report({'INFO'}, f"Consolidated {consolidated_count} strips to {mode_desc[self.alignment_mode]}")
+                self.report({'INFO'}, f"Consolidated {applier.applied} strips to {mode_desc[self.alignment_mode]}{summary_desc}")
             else:
-                self.report({'INFO'}, f"Consolidated {consolidated_count} strips to {mode_desc[self.alignment_mode]} with {audio_count} audio clips{filter_desc}")
+                unmatched = sum(1 for item in props.plan if item.status == 'NO_AUDIO')
+                unmatched_desc = f", {unmatched} strips had no audio match" if unmatched else ""
+                self.report({'INFO'}, f"Consolidated {applier.applied} strips to {mode_desc[self.alignment_mode]} with {audio_count} audio clips{filter_desc}{unmatched_desc}{summary_desc}")
             
             return {'FINISHED'}
             
@@ -165,6 +259,153 @@ class AH_ConsolidateAudioNLA(bpy.types.Operator):
         # Sort by start frame
         return sorted(filtered_strips, key=lambda s: s.frame_start)
     
+    def plan_batch(self, context, audio_strips):
+        """Plan every character from one scan -> (plan rows, summary lines), None without strips
+        
+        Each rig is consolidated on its own. Rigs whose names give the same
+        character code only share that code for audio routing, and the
+        clash is reported.
+        """
+        characters = self.get_character_nla_data(context)
+        if not characters:
+            return None
+        
+        by_code = {}
+        for name, data in characters.items():
+            by_code.setdefault(data['code'], []).append(name)
+        for code, names in sorted(by_code.items()):
+            if len(names) > 1:
+                self.report({'WARNING'}, f"Character code {code} is shared by {', '.join(sorted(names))}; "
+                                         "their audio is told apart by rig name only")
+        
+        routed, unrouted = {}, []
+        if self.alignment_mode != 'EVEN_SPACING':
+            extra = parse_routing(self.audio_routing)
+            keywords = {name: routing_keywords(data['code'], data['owner_names'],
+                                               extra.get(data['code'], []) + extra.get(name.upper(), []))
+                        for name, data in characters.items()}
+            routed, unrouted = route_audio(audio_strips, keywords)
+            context.scene.ah_consolidation.matches.clear()
+        
+        rows = []
+        summary = []
+        for name in sorted(characters):
+            data = characters[name]
+            character_audio = routed.get(name, [])
+            character_rows = self.plan_consolidation(context, data, character_audio, data['code'], clear=False)
+            rows.extend(character_rows)
+            line = f"{name} ({data['code']}): {len(character_rows)} strips"
+            if self.alignment_mode != 'EVEN_SPACING':
+                unmatched = sum(1 for row in character_rows if row['status'] == 'NO_AUDIO')
+                line += f", {len(character_audio)} audio clips, {unmatched} without audio"
+            summary.append(line)
+        
+        for strip in unrouted:
+            print(f"Audio routing: {strip.name} matches no character")
+        return rows, summary
+    
+    def get_character_nla_data(self, context):
+        """{rig name: nla data} from a single scan of the scene
+        
+        Shape key meshes belong to their parent rig (or stand alone without
+        one), so each object, and its tracks, is handled by exactly one rig.
+        Each entry also holds the rig's character 'code'.
+        """
+        processor = FacialAnimationProcessor()
+        characters = {}
+        
+        def character(rig):
+            return characters.setdefault(rig.name, {
+                'code': processor.character_code(rig.name),
+                'rig_strips': [], 'rig_objects': [],
+                'shapekey_strips': [], 'shape_objects': [],
+                'owner_names': {rig.name}
+            })
+        
+        for obj in context.scene.objects:
+            if obj.type == 'ARMATURE' and self.process_rig_strips and obj.animation_data:
+                strips = self.collect_strips(obj, obj.animation_data, 'rig')
+                if strips:
+                    data = character(obj)
+                    data['rig_strips'].extend(strips)
+                    data['rig_objects'].append(obj)
+            elif (obj.type == 'MESH' and self.process_shapekey_strips and
+                  obj.data.shape_keys and obj.data.shape_keys.animation_data):
+                strips = self.collect_strips(obj, obj.data.shape_keys.animation_data, 'shapekey')
+                if strips:
+                    rig = obj.parent if obj.parent and obj.parent.type == 'ARMATURE' else obj
+                    data = character(rig)
+                    data['shapekey_strips'].extend(strips)
+                    data['shape_objects'].append(obj)
+        
+        for data in characters.values():
+            data['rig_strips'].sort(key=lambda s: s['strip'].frame_start)
+            data['shapekey_strips'].sort(key=lambda s: s['strip'].frame_start)
+        return characters
+    
+    def match_audio(self, context, nla_data, audio_strips, clear=True):
+        """Audio strip index for each rig and shape key strip, None where unmatched
+        
+        The result is also listed in the panel (scene.ah_consolidation.matches).
+        """
+        if not audio_strips or self.alignment_mode == 'EVEN_SPACING':
+            return {kind: [None] * len(nla_data[f'{kind}_strips']) for kind in ('rig', 'shapekey')}
+        
+        report = context.scene.ah_consolidation
+        if clear:
+            report.matches.clear()
+        parse_name = FacialAnimationProcessor().parse_speech_action_name
+        
+        pairing = {}
+        used_audio = set()
+        for kind in ('rig', 'shapekey'):
+            strips = [strip_data['strip'] for strip_data in nla_data[f'{kind}_strips']]
+            if self.pairing_mode == 'ORDER':
+                pairs = [(i, i, 1.0) for i in range(min(len(strips), len(audio_strips)))]
+                unmatched = list(range(len(pairs), len(strips)))
+            else:
+                scores = score_matrix(strips, audio_strips, parse_name)
+                pairs, unmatched, _ = match_strips(scores, self.min_match_score)
+            
+            targets = [None] * len(strips)
+            for i, j, score in pairs:
+                targets[i] = j
+                used_audio.add(j)
+                self.add_match_row(report, strips[i].name, audio_strips[j].name, kind, 'MATCHED', score)
+            for i in unmatched:
+                self.add_match_row(report, strips[i].name, "", kind, 'NO_AUDIO')
+            pairing[kind] = targets
+        
+        for j, audio in enumerate(audio_strips):
+            if j not in used_audio:
+                self.add_match_row(report, "", audio.name, 'audio', 'UNUSED_AUDIO')
+        report.active_match = 0
+        return pairing
+    
+    @staticmethod
+    def add_match_row(report, strip_name, audio_name, kind, status, score=0.0):
+        item = report.matches.add()
+        item.name = strip_name
+        item.audio_name = audio_name
+        item.kind = kind.upper()
+        item.status = status
+        item.score = score
+    
+    def report_plan(self, context):
+        """Summarize a planning run"""
+        props = context.scene.ah_consolidation
+        displaced = sum(1 for item in props.plan if item.status == 'MOVED')
+        no_audio = [item.name for item in props.plan if item.status == 'NO_AUDIO']
+        unused = [m.audio_name for m in props.matches if m.status == 'UNUSED_AUDIO']
+        for name in no_audio:
+            print(f"Consolidation plan: no audio for {name}")
+        for name in unused:
+            print(f"Consolidation plan: unused audio {name}")
+        level = {'WARNING'} if displaced or no_audio or unused else {'INFO'}
+        self.report(level, f"Planned {len(props.plan)} strips: {displaced} displaced by overlaps, "
+                           f"{len(no_audio)} without audio, {len(unused)} unused audio clips. Apply it from the panel")
+        return {'FINISHED'}
+    
     def get_target_objects(self, context):
         """Get target objects based on the selected mode"""
         target_armatures = []
@@ -243,23 +484,8 @@ class AH_ConsolidateAudioNLA(bpy.types.Operator):
         if self.process_rig_strips:
             for obj in target_armatures:
                 if obj.animation_data and obj.animation_data.nla_tracks:
-                    obj_strips = []
-                    for track in obj.animation_data.nla_tracks:
-                        for strip in track.strips:
-                            # Apply character filter if in character filter mode
-                            if (self.target_mode == 'CHARACTER_FILTER' and 
-                                self.character_filter.upper() not in strip.name.upper()):
-                                continue
-                            
-                            strip_data = {
-                                'strip': strip,
-                                'original_track': track,
-                                'object': obj,
-                                'type': 'rig'
-                            }
-                            obj_strips.append(strip_data)
-                            data['rig_strips'].append(strip_data)
-                    
+                    obj_strips = self.collect_strips(obj, obj.animation_data, 'rig')
+                    data['rig_strips'].extend(obj_strips)
                     if obj_strips:
                         data['rig_objects'].append(obj)
         
@@ -270,23 +496,8 @@ class AH_ConsolidateAudioNLA(bpy.types.Operator):
                     obj.data.shape_keys.animation_data and
                     obj.data.shape_keys.animation_data.nla_tracks):
                     
-                    obj_strips = []
-                    for track in obj.data.shape_keys.animation_data.nla_tracks:
-                        for strip in track.strips:
-                            # Apply character filter if in character filter mode
-                            if (self.target_mode == 'CHARACTER_FILTER' and 
-                                self.character_filter.upper() not in strip.name.upper()):
-                                continue
-                            
-                            strip_data = {
-                                'strip': strip,
-                                'original_track': track,
-                                'object': obj,
-                                'type': 'shapekey'
-                            }
-                            obj_strips.append(strip_data)
-                            data['shapekey_strips'].append(strip_data)
-                    
+                    obj_strips = self.collect_strips(obj, obj.data.shape_keys.animation_data, 'shapekey')
+                    data['shapekey_strips'].extend(obj_strips)
                     if obj_strips:
                         data['shape_objects'].append(obj)
         
@@ -296,160 +507,153 @@ class AH_ConsolidateAudioNLA(bpy.types.Operator):
         
         return data
     
-    def apply_consolidation(self, context, nla_data, audio_strips):
-        """Apply the consolidation to single tracks"""
-        consolidated_count = 0
-        
-        # Consolidate rig strips
-        if nla_data['rig_strips']:
-            consolidated_count += self.consolidate_rig_strips(nla_data['rig_strips'], audio_strips)
-        
-        # Consolidate shape key strips  
-        if nla_data['shapekey_strips']:
-            consolidated_count += self.consolidate_shapekey_strips(nla_data['shapekey_strips'], audio_strips)
-        
-        # Clean up original tracks if requested
-        if self.remove_original_tracks:
-            self.cleanup_original_tracks(nla_data)
-        
-        return consolidated_count
-    
-    def consolidate_rig_strips(self, rig_strips, audio_strips):
-        """Consolidate all rig strips to one track"""
-        if not rig_strips:
-            return 0
-        
-        first_armature = rig_strips[0]['object']
-        
-        if not first_armature.animation_data:
-            first_armature.animation_data_create()
-        
-        # Create consolidated track
-        consolidated_track = first_armature.animation_data.nla_tracks.new()
-        consolidated_track.name = self.rig_track_name
-        
-        strips_moved = 0
-        
-        for i, strip_data in enumerate(rig_strips):
-            strip = strip_data['strip']
-            original_track = strip_data['original_track']
-            duration = strip.frame_end - strip.frame_start
-            
-            # Determine frame position based on alignment mode
-            if self.alignment_mode == 'MOVE_NLA_TO_AUDIO' and i < len(audio_strips):
-                target_frame = audio_strips[i].frame_start
-            elif self.alignment_mode == 'MOVE_AUDIO_TO_NLA':
-                target_frame = strip.frame_start
-            else:  # EVEN_SPACING (default)
-                target_frame = self.start_frame + (i * (duration + self.strip_spacing))
-            
-            # Create new strip in consolidated track
-            new_strip = consolidated_track.strips.new(
-                name=strip.name,
-                start=int(target_frame),
-                action=strip.action
-            )
-            
-            # Copy strip properties
-            new_strip.frame_end = target_frame + duration
-            new_strip.blend_in = strip.blend_in
-            new_strip.blend_out = strip.blend_out
-            new_strip.blend_type = strip.blend_type
-            new_strip.extrapolation = strip.extrapolation
-            new_strip.influence = strip.influence
-            
-            # Remove original strip
-            original_track.strips.remove(strip)
-            
-            # Handle audio positioning (only for audio modes)
-            if i < len(audio_strips):
-                if self.alignment_mode == 'MOVE_AUDIO_TO_NLA':
-                    audio_strips[i].frame_start = target_frame
-                elif self.alignment_mode == 'EVEN_SPACING':
-                    # Don't move audio in even spacing mode
-                    pass
-            
-            strips_moved += 1
-        
-        return strips_moved
+    def collect_strips(self, obj, anim_data, kind):
+        """Strip entries of one NLA stack, honouring the character filter"""
+        strips = []
+        for track in anim_data.nla_tracks:
+            for strip in track.strips:
+                # Apply character filter if in character filter mode
+                if (self.target_mode == 'CHARACTER_FILTER' and 
+                    self.character_filter.upper() not in strip.name.upper()):
+                    continue
+                
+                strips.append({
+                    'strip': strip,
+                    'original_track': track,
+                    'object': obj,
+                    'type': kind
+                })
+        return strips
     
-    def consolidate_shapekey_strips(self, shapekey_strips, audio_strips):
-        """Consolidate all shape key strips to one track"""
-        if not shapekey_strips:
-            return 0
-        
-        first_mesh = shapekey_strips[0]['object']
-        shape_keys = first_mesh.data.shape_keys
-        
-        if not shape_keys.animation_data:
-            shape_keys.animation_data_create()
-        
-        # Create consolidated track
-        consolidated_track = shape_keys.animation_data.nla_tracks.new()
-        consolidated_track.name = self.shapekey_track_name
-        
-        strips_moved = 0
-        
-        for i, strip_data in enumerate(shapekey_strips):
-            strip = strip_data['strip']
-            original_track = strip_data['original_track']
-            duration = strip.frame_end - strip.frame_start
-            
-            # Determine frame position based on alignment mode
-            if self.alignment_mode == 'MOVE_NLA_TO_AUDIO' and i < len(audio_strips):
-                target_frame = audio_strips[i].frame_start
-            elif self.alignment_mode == 'MOVE_AUDIO_TO_NLA':
-                target_frame = strip.frame_start
-            else:  # EVEN_SPACING (default)
-                target_frame = self.start_frame + (i * (duration + self.strip_spacing))
-            
-            # Create new strip in consolidated track
-            new_strip = consolidated_track.strips.new(
-                name=strip.name,
-                start=int(target_frame),
-                action=strip.action
-            )
+    def plan_consolidation(self, context, nla_data, audio_strips, code="", clear=True):
+        """Plan rows putting one character's strips on single tracks, without touching them
+        
+        Each row holds the target frame and track of a strip and the audio move,
+        if any. Placement uses an interval index, so the plan is what the
+        apply phase will produce.
+        """
+        # Pair strips with audio before anything is planned
+        self._audio_for = self.match_audio(context, nla_data, audio_strips, clear=clear)
+        if self.alignment_mode == 'SPEECH_ONSET':
+            self._onset_frames = self.compute_onset_targets(context, nla_data, audio_strips)
+        
+        rows = []
+        for kind, track_name in (('rig', self.rig_track_name), ('shapekey', self.shapekey_track_name)):
+            entries = nla_data[f'{kind}_strips']
+            if not entries:
+                continue
             
-            # Copy strip properties
-            new_strip.frame_end = target_frame + duration
-            new_strip.blend_in = strip.blend_in
-            new_strip.blend_out = strip.blend_out
-            new_strip.blend_type = strip.blend_type
-            new_strip.extrapolation = strip.extrapolation
-            new_strip.influence = strip.influence
-            
-            # Remove original strip
-            original_track.strips.remove(strip)
-            strips_moved += 1
-        
-        return strips_moved
-    
-    def cleanup_original_tracks(self, nla_data):
-        """Remove ALL original tracks after consolidation"""
-        # Clean up rig object tracks
-        for obj in nla_data['rig_objects']:
-            if obj.animation_data and obj.animation_data.nla_tracks:
-                tracks_to_remove = []
-                for track in obj.animation_data.nla_tracks:
-                    if track.name != self.rig_track_name:
-                        tracks_to_remove.append(track)
+            # The consolidated track lives on the first object of each kind
+            target_owner = entries[0]['object'].name
+            index = TrackIndex()
+            for i, strip_data in enumerate(entries):
+                strip = strip_data['strip']
+                duration = strip.frame_end - strip.frame_start
+                audio_index = self._audio_for[kind][i]
+                
+                desired = self.desired_frame(audio_index, strip, audio_strips)
+                target_frame = self.get_target_frame(index, audio_index, strip, duration, audio_strips)
+                index.add(int(target_frame), target_frame + duration, strip)
                 
-                for track in tracks_to_remove:
-                    obj.animation_data.nla_tracks.remove(track)
-        
-        # Clean up shape object tracks
-        for obj in nla_data['shape_objects']:
-            shape_keys = obj.data.shape_keys
-            if shape_keys.animation_data and shape_keys.animation_data.nla_tracks:
-                tracks_to_remove = []
-                for track in shape_keys.animation_data.nla_tracks:
-                    if track.name != self.shapekey_track_name:
-                        tracks_to_remove.append(track)
+                if self.alignment_mode != 'EVEN_SPACING' and audio_index is None:
+                    status = 'NO_AUDIO'
+                elif desired is not None and target_frame != desired:
+                    status = 'MOVED'
+                else:
+                    status = 'OK'
                 
-                for track in tracks_to_remove:
-                    shape_keys.animation_data.nla_tracks.remove(track)
+                # Only rig strips move their audio, shape keys follow the same shot
+                move_audio = (kind == 'rig' and audio_index is not None and
+                              self.alignment_mode == 'MOVE_AUDIO_TO_NLA')
+                rows.append({
+                    'name': strip.name,
+                    'char_code': code,
+                    'kind': kind.upper(),
+                    'owner_name': strip_data['object'].name,
+                    'source_track': strip_data['original_track'].name,
+                    'target_owner': target_owner,
+                    'target_track': track_name,
+                    'frame_start': float(target_frame),
+                    'duration': float(duration),
+                    'audio_name': audio_strips[audio_index].name if audio_index is not None else "",
+                    'move_audio': move_audio,
+                    'audio_frame': float(target_frame) if move_audio else 0.0,
+                    'status': status,
+                })
+        return rows
+    
+    def desired_frame(self, audio_index, strip, audio_strips):
+        """Where the alignment mode wants a strip, None when it just follows the previous one"""
+        if self.alignment_mode == 'MOVE_NLA_TO_AUDIO' and audio_index is not None:
+            return audio_strips[audio_index].frame_start
+        if self.alignment_mode == 'SPEECH_ONSET' and audio_index in self._onset_frames:
+            return float(self._onset_frames[audio_index])
+        if self.alignment_mode == 'MOVE_AUDIO_TO_NLA':
+            return strip.frame_start
+        return None
+    
+    def get_target_frame(self, index, audio_index, strip, duration, audio_strips):
+        """Frame for a strip on the consolidated track, moved to the next gap if taken
+        
+        audio_index is the matched audio strip, None when the strip has none.
+        """
+        target_frame = self.desired_frame(audio_index, strip, audio_strips)
+        if target_frame is None:  # EVEN_SPACING (default): one spacing after the previous strip
+            if not len(index):
+                return self.start_frame
+            return index.last_end + self.strip_spacing
+        
+        # Strips from different source tracks or audio clips may overlap
+        if not index.is_free(target_frame, target_frame + duration):
+            target_frame = index.first_fit(duration, after=target_frame)
+        return target_frame
+    
+    def compute_onset_targets(self, context, nla_data, audio_strips):
+        """{audio index: start frame} that puts mouth motion onset on speech onset
+        
+        Rig and shape key strips matched to the same clip belong to the same
+        shot, so all of them use the earliest motion onset and stay in sync.
+        """
+        matched = sorted({j for targets in self._audio_for.values() for j in targets if j is not None})
+        envelopes, _, _, errors = envelopes_for_strips(context.scene, [audio_strips[j] for j in matched])
+        for path, message in errors.items():
+            print(f"Speech onset: could not analyze {path}: {message}")
+        
+        # Audio clips without a readable file or any speech fall back to their start
+        audio_onsets = {}
+        for j in matched:
+            audio = audio_strips[j]
+            audio_onsets[j] = audio.frame_start
+            if audio.name in envelopes:
+                first, values = envelopes[audio.name]
+                onset = speech_onset(values, self.speech_threshold)
+                if onset is not None:
+                    audio_onsets[j] = first + onset
+        
+        action_onsets = {}
+        motion_offsets = {}
+        for kind in ('rig', 'shapekey'):
+            for strip_data, j in zip(nla_data[f'{kind}_strips'], self._audio_for[kind]):
+                strip = strip_data['strip']
+                if j is None or strip.action is None:
+                    continue
+                if strip.action.name not in action_onsets:
+                    action_onsets[strip.action.name] = motion_onset(strip.action, self.motion_threshold)
+                onset = action_onsets[strip.action.name]
+                if onset is not None:
+                    offset = strip_frame_of_action_frame(strip, onset)
+                    motion_offsets[j] = min(motion_offsets.get(j, np.inf), offset)
+        
+        # Strips whose mouth never moves start right at the speech onset
+        return {j: float(np.round(audio_onsets[j] - motion_offsets.get(j, 0.0))) for j in matched}
     
     def invoke(self, context, event):
+        # List the pairing up front so unmatched strips show before anything moves
+        if self.alignment_mode != 'EVEN_SPACING':
+            audio_strips = self.get_filtered_audio_strips(context)
+            nla_data = self.get_all_nla_data(context)
+            if audio_strips and (nla_data['rig_strips'] or nla_data['shapekey_strips']):
+                self.match_audio(context, nla_data, audio_strips)
         return context.window_manager.invoke_props_dialog(self, width=500)
     
     def draw(self, context):
@@ -470,6 +674,20 @@ class AH_ConsolidateAudioNLA(bpy.types.Operator):
             box.prop(self, "strip_spacing")
             
         else:
+            if self.alignment_mode == 'SPEECH_ONSET':
+                box = layout.box()
+                box.label(text="Onset Detection", icon='SPEAKER')
+                box.prop(self, "speech_threshold", slider=True)
+                box.prop(self, "motion_threshold", slider=True)
+            
+            # Pairing section (only for audio modes)
+            box = layout.box()
+            box.label(text="Audio Pairing", icon='LINKED')
+            box.prop(self, "pairing_mode")
+            if self.pairing_mode == 'MATCH':
+                box.prop(self, "min_match_score", slider=True)
+            self.draw_unmatched(context, box)
+            
             # Audio filtering section (only for audio modes)
             box = layout.box()
             box.label(text="🎵 Audio Keyword Filtering", icon='SOUND')
@@ -491,6 +709,11 @@ class AH_ConsolidateAudioNLA(bpy.types.Operator):
         
         if self.target_mode == 'CHARACTER_FILTER':
             box.prop(self, "character_filter")
+        elif self.target_mode == 'ALL_CHARACTERS' and self.alignment_mode != 'EVEN_SPACING':
+            box.prop(self, "audio_routing")
+            col = box.column(align=True)
+            col.scale_y = 0.8
+            col.label(text="Audio goes to the character whose code or rig name it contains")
         
         layout.separator()
         
@@ -508,4 +731,108 @@ class AH_ConsolidateAudioNLA(bpy.types.Operator):
         layout.separator()
         
         # Cleanup
-        layout.prop(self, "remove_original_tracks")
\ No newline at end of file
+        layout.prop(self, "remove_original_tracks")
+        layout.prop(self, "preview_only")
+    
+    def draw_unmatched(self, context, layout, limit=6):
+        """Strips and clips left unpaired by the last matching run"""
+        matches = context.scene.ah_consolidation.matches
+        no_audio = [m.name for m in matches if m.status == 'NO_AUDIO']
+        unused = [m.audio_name for m in matches if m.status == 'UNUSED_AUDIO']
+        if not matches:
+            return
+        col = layout.column(align=True)
+        col.scale_y = 0.8
+        if not no_audio and not unused:
+            col.label(text="Every strip has an audio match", icon='CHECKMARK')
+            return
+        for title, names in (("Strips without audio", no_audio), ("Unused audio", unused)):
+            if not names:
+                continue
+            col.label(text=f"{title}: {len(names)}", icon='ERROR')
+            for name in names[:limit]:
+                col.label(text=f"   {name}")
+            if len(names) > limit:
+                col.label(text=f"   ... and {len(names) - limit} more (see the panel list)")
+
+class AH_ApplyConsolidationPlan(bpy.types.Operator):
+    """Execute the consolidation plan listed in the panel, in batches"""
+    bl_idname = "anim.apply_consolidation_plan"
+    bl_label = "Apply Consolidation Plan"
+    bl_description = ("Create the planned strips in batches. Finished rows are marked done, "
+                      "so an interrupted or failed run can be resumed")
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    batch_size: bpy.props.IntProperty(
+        name="Batch Size",
+        description="Strips moved per timer step",
+        default=50,
+        min=1,
+        max=1000
+    )
+    
+    @classmethod
+    def poll(cls, context):
+        return any(not item.done for item in context.scene.ah_consolidation.plan)
+    
+    def execute(self, context):
+        applier = PlanApplier(context.scene, context.scene.ah_consolidation)
+        applier.apply_batch()
+        return self.finish(context, applier)
+    
+    def invoke(self, context, event):
+        props = context.scene.ah_consolidation
+        self._applier = PlanApplier(context.scene, props)
+        self._total = len(self._applier.pending)
+        self._timer = context.window_manager.event_timer_add(0.01, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        context.window_manager.progress_begin(0, self._total)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        if event.type in {'ESC'} and event.value == 'PRESS':
+            self.stop(context)
+            remaining = len(self._applier.pending)
+            self.report({'WARNING'}, f"Paused with {remaining} strips left, press Resume to continue")
+            return {'FINISHED'}
+        
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        
+        if not self._applier.apply_batch(self.batch_size):
+            self.stop(context)
+            return self.finish(context, self._applier)
+        
+        context.window_manager.progress_update(self._total - len(self._applier.pending))
+        return {'RUNNING_MODAL'}
+    
+    def stop(self, context):
+        context.window_manager.event_timer_remove(self._timer)
+        context.window_manager.progress_end()
+    
+    def finish(self, context, applier):
+        props = context.scene.ah_consolidation
+        if applier.failed:
+            for name in applier.failed:
+                print(f"Consolidation: {name} failed")
+            self.report({'WARNING'}, f"Moved {applier.applied} strips, {len(applier.failed)} failed "
+                                     "(see the plan list). Press Resume to retry them")
+            return {'FINISHED'}
+        
+        removed = applier.remove_original_tracks() if props.plan_remove_tracks else 0
+        self.report({'INFO'}, f"Moved {applier.applied} strips, removed {removed} original tracks")
+        return {'FINISHED'}
+
+
+class AH_ClearConsolidationPlan(bpy.types.Operator):
+    """Clear the consolidation plan and pairing lists"""
+    bl_idname = "anim.clear_consolidation_plan"
+    bl_label = "Clear Consolidation Plan"
+    bl_description = "Forget the listed plan and audio pairing"
+    bl_options = {'REGISTER'}
+    
+    def execute(self, context):
+        props = context.scene.ah_consolidation
+        props.plan.clear()
+        props.matches.clear()
+        return {'FINISHED'}
@@ -0,0 +1,98 @@
+import os
+import time
+
+import bpy
+
+from ..utils.audio_envelope import (
+    cache_directory,
+    cache_key,
+    clear_memory_cache,
+    envelopes_for_strips,
+    scene_fps,
+    sound_path,
+    speech_activity,
+)
+
+
+def get_sound_strips(scene, keyword=""):
+    """Sound strips of the scene sequencer, optionally filtered by keyword, in time order"""
+    if not scene.sequence_editor:
+        return []
+    keyword = keyword.strip().lower()
+    strips = [s for s in scene.sequence_editor.sequences_all
+              if s.type == 'SOUND' and (not keyword or keyword in s.name.lower())]
+    return sorted(strips, key=lambda s: s.frame_final_start)
+
+
+class AH_AnalyzeAudio(bpy.types.Operator):
+    """Decode sound strips into per-frame loudness envelopes and cache them on disk"""
+    bl_idname = "sequencer.ah_analyze_audio"
+    bl_label = "Analyze Audio"
+    bl_description = "Build (or load from cache) the RMS envelope of every sound strip for speech-aware tools"
+    bl_options = {'REGISTER'}
+
+    keyword: bpy.props.StringProperty(
+        name="Keyword",
+        description="Only analyze sound strips containing this text. Leave empty for all",
+        default=""
+    )
+
+    rebuild: bpy.props.BoolProperty(
+        name="Rebuild Cache",
+        description="Ignore cached envelopes and decode every file again",
+        default=False
+    )
+
+    speech_threshold: bpy.props.FloatProperty(
+        name="Speech Threshold",
+        description="Loudness, as a fraction of each clip's peak, counted as speech",
+        default=0.1,
+        min=0.0,
+        max=1.0
+    )
+
+    def execute(self, context):
+        scene = context.scene
+        strips = get_sound_strips(scene, self.keyword)
+        if not strips:
+            self.report({'WARNING'}, "No sound strips found")
+            return {'CANCELLED'}
+
+        if self.rebuild:
+            self.remove_cached(strips, scene_fps(scene))
+
+        start = time.perf_counter()
+        envelopes, decoded, cached, errors = envelopes_for_strips(scene, strips)
+        elapsed = time.perf_counter() - start
+
+        for path, message in errors.items():
+            print(f"Audio analysis failed for {path}: {message}")
+
+        speech_frames = sum(int(speech_activity(values, self.speech_threshold).sum())
+                            for _, values in envelopes.values())
+        message = (f"Analyzed {len(envelopes)} clips in {elapsed:.2f}s "
+                   f"({decoded} files decoded, {cached} cached), {speech_frames} speech frames")
+        if errors:
+            message += f", {len(errors)} failed (see console)"
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+    def remove_cached(self, strips, fps):
+        clear_memory_cache()
+        directory = cache_directory()
+        for path in {sound_path(strip) for strip in strips}:
+            if not path or not os.path.isfile(path):
+                continue
+            cache_file = os.path.join(directory, f"{cache_key(path, fps)}.npy")
+            if os.path.isfile(cache_file):
+                os.remove(cache_file)
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "keyword")
+        layout.prop(self, "speech_threshold", slider=True)
+        layout.prop(self, "rebuild")
+        layout.label(text=f"Cache: {cache_directory()}")
@@ -0,0 +1,188 @@
+import bpy
+
+from ..utils.nla_index import move_strip
+from ..utils.retime import RetimeTransform, application_order, lane_moves
+
+
+class AH_BatchRetimeStrips(bpy.types.Operator):
+    """Shift, scale and snap NLA and sound strips inside a frame window in one pass"""
+    bl_idname = "anim.batch_retime_strips"
+    bl_label = "Batch Retime Strips"
+    bl_description = ("Offset, scale around a pivot and snap every rig, shape key and sound strip starting "
+                      "inside a frame window, resolving overlaps, as a single undo step")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    window_start: bpy.props.IntProperty(
+        name="Window Start",
+        description="Strips starting on or after this frame are retimed"
+    )
+    window_end: bpy.props.IntProperty(
+        name="Window End",
+        description="Strips starting before this frame are retimed"
+    )
+    offset: bpy.props.FloatProperty(
+        name="Offset",
+        description="Frames added after scaling",
+        default=0.0
+    )
+    scale: bpy.props.FloatProperty(
+        name="Scale",
+        description="Spacing factor around the pivot",
+        default=1.0,
+        min=0.01,
+        max=100.0
+    )
+    pivot: bpy.props.FloatProperty(
+        name="Pivot",
+        description="Frame that stays put when scaling"
+    )
+    snap: bpy.props.BoolProperty(
+        name="Snap to Frames",
+        description="Round the new strip positions to whole frames",
+        default=True
+    )
+    scale_lengths: bpy.props.BoolProperty(
+        name="Scale NLA Lengths",
+        description="Stretch NLA strips by the scale too (sound strips always keep their length)",
+        default=False
+    )
+    ripple: bpy.props.BoolProperty(
+        name="Ripple Later Strips",
+        description="Move strips after the window along with the window end, keeping their gaps",
+        default=False
+    )
+    scope: bpy.props.EnumProperty(
+        name="Objects",
+        items=[
+            ('SCENE', "Scene", "Every armature and shape key mesh in the scene"),
+            ('SELECTED', "Selected", "Selected armatures and shape key meshes only"),
+        ],
+        default='SCENE'
+    )
+    include_rigs: bpy.props.BoolProperty(name="Rig Strips", default=True)
+    include_shapekeys: bpy.props.BoolProperty(name="Shape Key Strips", default=True)
+    include_sound: bpy.props.BoolProperty(name="Sound Strips", default=True)
+
+    def invoke(self, context, event):
+        scene = context.scene
+        if self.window_end <= self.window_start:
+            self.window_start = scene.frame_preview_start if scene.use_preview_range else scene.frame_start
+            self.window_end = (scene.frame_preview_end if scene.use_preview_range else scene.frame_end) + 1
+            self.pivot = self.window_start
+        return context.window_manager.invoke_props_dialog(self, width=320)
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column(align=True)
+        col.prop(self, "window_start")
+        col.prop(self, "window_end")
+        col = layout.column(align=True)
+        col.prop(self, "offset")
+        col.prop(self, "scale")
+        col.prop(self, "pivot")
+        layout.prop(self, "snap")
+        layout.prop(self, "scale_lengths")
+        layout.prop(self, "ripple")
+        layout.prop(self, "scope", expand=True)
+        row = layout.row(align=True)
+        row.prop(self, "include_rigs", toggle=True)
+        row.prop(self, "include_shapekeys", toggle=True)
+        row.prop(self, "include_sound", toggle=True)
+
+    def execute(self, context):
+        if self.window_end <= self.window_start:
+            self.report({'ERROR'}, "Window end must be after window start")
+            return {'CANCELLED'}
+
+        transform = RetimeTransform(self.offset, self.scale, self.pivot, self.snap)
+        window = (self.window_start, self.window_end)
+        moved = 0
+        pushed = 0
+        failed = []
+
+        for track in self.nla_tracks(context):
+            intervals = [(strip.frame_start, strip.frame_end, strip) for strip in track.strips]
+            moves, lane_pushed = lane_moves(intervals, *window, transform, self.ripple, self.scale_lengths)
+            pushed += lane_pushed
+            for move in application_order(moves):
+                try:
+                    apply_nla_move(move)
+                    moved += 1
+                except (RuntimeError, ValueError) as e:
+                    failed.append(f"{move.item.name}: {str(e)}")
+
+        scene = context.scene
+        if self.include_sound and scene.sequence_editor:
+            for strips in channel_lanes(scene.sequence_editor.sequences):
+                if not any(s.type == 'SOUND' for s in strips):
+                    continue
+                # Other strips on the channel only hold their space, pushing sound strips if needed
+                intervals = [(s.frame_final_start, s.frame_final_end, s) for s in strips]
+                moves, lane_pushed = lane_moves(intervals, *window, transform, self.ripple,
+                                                movable=lambda s: s.type == 'SOUND')
+                pushed += lane_pushed
+                for move in application_order(moves):
+                    try:
+                        move.item.frame_start += move.new_start - move.old_start
+                        moved += 1
+                    except (RuntimeError, ValueError) as e:
+                        failed.append(f"{move.item.name}: {str(e)}")
+
+        for message in failed:
+            print(f"Batch retime: {message}")
+        summary = f"Retimed {moved} strips"
+        if pushed:
+            summary += f", {pushed} pushed later to avoid overlaps"
+        if failed:
+            self.report({'WARNING'}, f"{summary}; {len(failed)} failed (see console)")
+        else:
+            self.report({'INFO'}, summary)
+        return {'FINISHED'}
+
+    def nla_tracks(self, context):
+        """Every NLA track of the armatures and shape keys in scope"""
+        objects = context.selected_objects if self.scope == 'SELECTED' else context.scene.objects
+        tracks = []
+        seen = set()
+        for obj in objects:
+            anim_data = None
+            if obj.type == 'ARMATURE' and self.include_rigs:
+                anim_data = obj.animation_data
+            elif obj.type == 'MESH' and self.include_shapekeys and obj.data.shape_keys:
+                anim_data = obj.data.shape_keys.animation_data
+            # Meshes can share one shape key datablock
+            if anim_data and anim_data.id_data.as_pointer() not in seen:
+                seen.add(anim_data.id_data.as_pointer())
+                tracks.extend(anim_data.nla_tracks)
+        return tracks
+
+
+def channel_lanes(sequences):
+    """Strips per sequencer channel, meta strip contents as lanes of their own
+
+    Only sound strips move and a meta strip never does, so sounds inside a
+    meta are retimed once, through their own lane.
+    """
+    channels = {}
+    lanes = []
+    for strip in sequences:
+        channels.setdefault(strip.channel, []).append(strip)
+        if strip.type == 'META':
+            lanes.extend(channel_lanes(strip.sequences))
+    return list(channels.values()) + lanes
+
+
+def apply_nla_move(move):
+    """Move and resize one NLA strip; shrinking happens before moving, growing after"""
+    strip = move.item
+    old_length = move.old_end - move.old_start
+    new_length = move.new_end - move.new_start
+    ratio = new_length / old_length if old_length > 0 else 1.0
+    resize = abs(ratio - 1.0) > 1e-6
+    if resize and ratio < 1.0:
+        strip.scale *= ratio
+    move_strip(strip, move.new_start - strip.frame_start)
+    if resize and ratio > 1.0:
+        strip.scale *= ratio
+    if abs(strip.frame_end - move.new_end) > 1e-4:
+        strip.frame_end = move.new_end
@@ -0,0 +1,155 @@
+import bpy
+
+from ..utils.chain_offset import (
+    ROTATION_PROPS,
+    chain_depths,
+    chain_offsets,
+    group_bone_fcurves,
+    object_fcurves,
+    offset_fcurves,
+)
+from ..utils.nla_cow import private_tweak_action
+
+
+class AH_ChainTimeOffset(bpy.types.Operator):
+    """Offset animation along a chain of bones or empties for overlap and follow-through"""
+    bl_idname = "anim.chain_time_offset"
+    bl_label = "Chain Time Offset"
+    bl_description = "Delay each link of a bone/empty chain by a cumulative number of frames (tails, ears, antennas)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    frame_step: bpy.props.FloatProperty(
+        name="Frames per Link",
+        description="Delay added for each link down the chain",
+        default=2.0
+    )
+
+    decay: bpy.props.FloatProperty(
+        name="Decay",
+        description="Multiplier applied to the delay of each following link (1 = constant)",
+        default=1.0,
+        min=0.0,
+        max=2.0
+    )
+
+    root_offset: bpy.props.FloatProperty(
+        name="Root Offset",
+        description="Delay applied to the first link of the chain",
+        default=0.0
+    )
+
+    include_location: bpy.props.BoolProperty(
+        name="Location",
+        description="Offset location channels too",
+        default=False
+    )
+
+    include_scale: bpy.props.BoolProperty(
+        name="Scale",
+        description="Offset scale channels too",
+        default=False
+    )
+
+    wrap_mode: bpy.props.EnumProperty(
+        name="Wrap",
+        items=[
+            ('CYCLES', "Cycles", "Add a Cycles modifier so shifted keys wrap around"),
+            ('EXTEND', "Extend", "Hold the first/last values outside the shifted range (removes Cycles modifiers)"),
+        ],
+        default='CYCLES'
+    )
+
+    @classmethod
+    def poll(cls, context):
+        if context.mode == 'POSE':
+            return bool(context.selected_pose_bones)
+        return bool(context.selected_objects)
+
+    def execute(self, context):
+        props = set(ROTATION_PROPS)
+        if self.include_location:
+            props.add("location")
+        if self.include_scale:
+            props.add("scale")
+        use_cycles = self.wrap_mode == 'CYCLES'
+
+        if context.mode == 'POSE':
+            links = self.bone_chain(context)
+        else:
+            links = self.object_chain(context)
+
+        if not links:
+            self.report({'WARNING'}, "Nothing animated to offset in the selection")
+            return {'CANCELLED'}
+
+        deepest = max(depth for _, _, depth in links)
+        offsets = chain_offsets(deepest + 1, self.frame_step, self.decay, self.root_offset)
+        curves_shifted = 0
+        for name, get_fcurves, depth in links:
+            fcurves = get_fcurves(props)
+            offset_fcurves(fcurves, float(offsets[depth]), use_cycles)
+            curves_shifted += len(fcurves)
+
+        self.report({'INFO'}, f"Offset {len(links)} links ({curves_shifted} fcurves), "
+                              f"tips delayed by up to {offsets[-1]:.1f} frames")
+        return {'FINISHED'}
+
+    def bone_chain(self, context):
+        """Selected pose bones with their fcurve lookups and link index in their chain"""
+        armature = context.active_object
+        if not armature.animation_data or not armature.animation_data.action:
+            return []
+        action = private_tweak_action(armature.animation_data)
+
+        cache = {}
+
+        def lookup(bone_name):
+            def get_fcurves(props):
+                key = frozenset(props)
+                if key not in cache:
+                    cache[key] = group_bone_fcurves(action, props)
+                return cache[key].get(bone_name, [])
+            return get_fcurves
+
+        depths = chain_depths({bone.name: [parent.name for parent in bone.parent_recursive]
+                               for bone in context.selected_pose_bones})
+        return [(name, lookup(name), depth) for name, depth in sorted(depths.items(), key=lambda d: (d[1], d[0]))]
+
+    def object_chain(self, context):
+        """Selected animated objects with their fcurve lookups and link index in their chain"""
+        def ancestors(obj):
+            parents = []
+            while obj.parent:
+                obj = obj.parent
+                parents.append(obj.name)
+            return parents
+
+        # Unanimated selected objects still count as links between animated ones
+        depths = chain_depths({obj.name: ancestors(obj) for obj in context.selected_objects})
+        objects = [obj for obj in context.selected_objects
+                   if obj.animation_data and obj.animation_data.action]
+        objects.sort(key=lambda o: (depths[o.name], o.name))
+
+        def lookup(obj):
+            action = private_tweak_action(obj.animation_data)
+            return lambda props: object_fcurves(action, props)
+
+        return [(obj.name, lookup(obj), depths[obj.name]) for obj in objects]
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "frame_step")
+        layout.prop(self, "decay", slider=True)
+        layout.prop(self, "root_offset")
+
+        layout.separator()
+        layout.label(text="Channels (rotation always included):")
+        row = layout.row(align=True)
+        row.prop(self, "include_location", toggle=True)
+        row.prop(self, "include_scale", toggle=True)
+
+        layout.separator()
+        layout.prop(self, "wrap_mode", expand=True)
@@ -0,0 +1,232 @@
+import os
+
+import bpy
+
+from .Facial_auto_processor import FacialAnimationProcessor, auto_processor
+from ..utils.cue_sheet import line_key, parse_timecode, read_cue_sheet, speech_action_index
+from ..utils.audio_envelope import scene_fps
+from ..utils.nla_index import StackIndex
+
+
+class AH_ImportCueSheet(bpy.types.Operator):
+    """Place speech action strips (and sound) from an editorial cue sheet"""
+    bl_idname = "anim.import_cue_sheet"
+    bl_label = "Import Cue Sheet"
+    bl_description = ("Read a CSV, SRT or EDL cue sheet and place the matching rig and shape key "
+                      "speech actions of the selected rigs at each line's timecode")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.csv;*.tsv;*.txt;*.srt;*.edl", options={'HIDDEN'})
+
+    start_timecode: bpy.props.StringProperty(
+        name="Sheet Start",
+        description="Timecode of the sheet that lands on the scene start frame (e.g. 01:00:00:00 for most EDLs)",
+        default="00:00:00:00"
+    )
+    language_suffix: bpy.props.StringProperty(
+        name="Language Suffix",
+        description="Suffix of the speech actions to use when a line id has none (e.g. FR). "
+                    "Empty uses the current Facial Auto suffix",
+        default=""
+    )
+    track_name: bpy.props.StringProperty(
+        name="Track Name",
+        description="NLA track the strips go on; overlapping lines spill onto extra tracks",
+        default="Cue_Speech"
+    )
+    fit_mode: bpy.props.EnumProperty(
+        name="Out Points",
+        description="What the sheet's out point does to a strip",
+        items=[
+            ('TRIM', "Trim", "End the strip at the out point when the action runs longer"),
+            ('SCALE', "Scale", "Stretch or squash the strip to fill the line from in to out"),
+            ('IGNORE', "Ignore", "Strips always play the whole action"),
+        ],
+        default='TRIM'
+    )
+    include_shapekeys: bpy.props.BoolProperty(
+        name="Shape Key Strips",
+        description="Also place the SA speech actions on each rig's body mesh",
+        default=True
+    )
+    create_sound: bpy.props.BoolProperty(
+        name="Sound Strips",
+        description="Add the sound files named in the sheet to the sequencer (paths relative to the sheet)",
+        default=False
+    )
+    sound_channel: bpy.props.IntProperty(
+        name="Sound Channel",
+        default=1,
+        min=1,
+        max=128
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return any(obj.type == 'ARMATURE' for obj in context.selected_objects)
+
+    def invoke(self, context, event):
+        if not self.language_suffix:
+            self.language_suffix = auto_processor._suffix.lstrip('_')
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "start_timecode")
+        layout.prop(self, "language_suffix")
+        layout.prop(self, "track_name")
+        layout.prop(self, "fit_mode")
+        layout.prop(self, "include_shapekeys")
+        layout.prop(self, "create_sound")
+        if self.create_sound:
+            layout.prop(self, "sound_channel")
+
+    def execute(self, context):
+        scene = context.scene
+        fps = scene_fps(scene)
+        try:
+            cues = read_cue_sheet(bpy.path.abspath(self.filepath), fps)
+            start = parse_timecode(self.start_timecode, fps) if self.start_timecode.strip() else 0.0
+            offset = scene.frame_start - start
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Could not read cue sheet: {str(e)}")
+            return {'CANCELLED'}
+        if not cues:
+            self.report({'WARNING'}, "No cues found in the sheet")
+            return {'CANCELLED'}
+
+        processor = FacialAnimationProcessor()
+        rigs = {}
+        for obj in context.selected_objects:
+            if obj.type == 'ARMATURE':
+                rigs.setdefault(processor.character_code(obj.name), obj)
+        active = context.active_object
+        default_code = processor.character_code(active.name) if active and active.type == 'ARMATURE' else next(iter(rigs))
+        actions = speech_action_index(bpy.data.actions, processor.parse_speech_action_name)
+
+        placer = StripPlacer(self.track_name, self.fit_mode)
+        meshes = {}
+        placed = 0
+        unresolved = []
+        sounds = []
+        for cue in cues:
+            key = line_key(cue.line_id, cue.character or default_code, self.language_suffix, set(rigs))
+            if key is None:
+                unresolved.append(f"{cue.line_id} (no line number)")
+                continue
+            code, number, suffix = key
+            rig = rigs.get(code)
+            rig_action = actions.get((code, 'RA', number, suffix))
+            if rig is None or rig_action is None:
+                unresolved.append(f"{cue.line_id} ({'no selected rig' if rig is None else 'no action'} for {code})")
+                continue
+
+            frame = cue.start + offset
+            end = cue.end + offset if cue.end is not None else None
+            placer.place(rig.animation_data or rig.animation_data_create(), rig_action, frame, end)
+            if self.include_shapekeys:
+                shape_action = actions.get((code, 'SA', number, suffix))
+                if code not in meshes:
+                    meshes[code] = processor.find_body_mesh_in_children(rig)[0]
+                mesh = meshes[code]
+                if shape_action and mesh:
+                    shape_keys = mesh.data.shape_keys
+                    placer.place(shape_keys.animation_data or shape_keys.animation_data_create(), shape_action, frame, end)
+            if self.create_sound and cue.sound:
+                sounds.append((cue, frame))
+            placed += 1
+
+        added_sounds, missing_sounds = self.add_sounds(scene, sounds) if sounds else (0, [])
+
+        for entry in unresolved:
+            print(f"Cue sheet: unresolved line {entry}")
+        message = f"Placed {placed} of {len(cues)} lines on {placer.track_count} tracks"
+        if self.create_sound:
+            message += f", {added_sounds} sound strips"
+        if unresolved or missing_sounds:
+            message += f"; {len(unresolved)} lines unresolved, {len(missing_sounds)} sounds missing (see console)"
+            for path in missing_sounds:
+                print(f"Cue sheet: sound not found {path}")
+            self.report({'WARNING'}, message)
+        else:
+            self.report({'INFO'}, message)
+        return {'FINISHED'} if placed or added_sounds else {'CANCELLED'}
+
+    def add_sounds(self, scene, sounds):
+        """Sound strips for the placed cues, files resolved next to the cue sheet"""
+        if not scene.sequence_editor:
+            scene.sequence_editor_create()
+        sequences = scene.sequence_editor.sequences
+        existing = {s.name for s in scene.sequence_editor.sequences_all}
+        folder = os.path.dirname(bpy.path.abspath(self.filepath))
+        added = 0
+        missing = []
+        for cue, frame in sounds:
+            path = cue.sound if os.path.isabs(cue.sound) else os.path.join(folder, cue.sound)
+            if not os.path.isfile(path):
+                missing.append(path)
+                continue
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name in existing:
+                continue
+            strip = sequences.new_sound(name, path, self.sound_channel, int(round(frame)))
+            existing.add(strip.name)
+            added += 1
+        return added, missing
+
+
+class StripPlacer:
+    """Adds strips to named tracks, spilling onto new tracks where lines overlap
+
+    Each stack's tracks are indexed once, so placing hundreds of lines never
+    rescans a track.
+    """
+
+    def __init__(self, track_name, fit_mode='TRIM'):
+        self.track_name = track_name
+        self.fit_mode = fit_mode
+        self._stacks = {}
+        self._used = set()
+
+    @property
+    def track_count(self):
+        return len(self._used)
+
+    def stack(self, anim_data):
+        key = anim_data.id_data.name_full, anim_data.id_data.bl_rna.identifier
+        if key not in self._stacks:
+            self._stacks[key] = StackIndex(track for track in anim_data.nla_tracks
+                                           if track.name == self.track_name or track.name.startswith(self.track_name + "."))
+        return self._stacks[key]
+
+    def place(self, anim_data, action, frame, out_point=None):
+        """Strip of action at frame, trimmed or scaled to out_point by the fit mode"""
+        start, end = action.frame_range
+        length = end - start
+        if out_point is not None and out_point > frame and self.fit_mode != 'IGNORE':
+            if self.fit_mode == 'SCALE' or out_point - frame < length:
+                length = out_point - frame
+        stack = self.stack(anim_data)
+        strip = None
+        for track, index in stack.free_tracks(frame, frame + length):
+            try:
+                # Created at full action length, which may not fit before it is trimmed
+                strip = track.strips.new(action.name, int(round(frame)), action)
+                break
+            except RuntimeError:
+                continue
+        if strip is None:
+            track = anim_data.nla_tracks.new()
+            track.name = self.track_name
+            index = stack.track(track)
+            strip = track.strips.new(action.name, int(round(frame)), action)
+        if abs(length - (end - start)) > 1e-4:
+            if self.fit_mode == 'SCALE':
+                strip.scale = length / (end - start)
+            else:
+                strip.action_frame_end = start + length
+        index.add(strip.frame_start, strip.frame_end, strip)
+        self._used.add(track.as_pointer())
+        return strip
@@ -31,6 +31,9 @@ class AH_AutoProcessor:
 
 auto_processor = AH_AutoProcessor()
 
+# Names produced by generate_auto_names: CC_{code}_{RA|SA}_SPEECH_{NN}[_{suffix}]
+SPEECH_ACTION_PATTERN = re.compile(r'^CC_([A-Z]{3})_(RA|SA)_SPEECH_(\d+)(?:_(.+))?$')
+
 class FacialAnimationProcessor:
     BODY_MESH_BASE_NAME = "CC_Base_Body"
     
@@ -93,6 +96,46 @@ class FacialAnimationProcessor:
         bone_match = re.search(bone_pattern, data_path)
         return bone_match.group(1) if bone_match else None
 
+    def character_code(self, rig_name):
+        """Three-letter character code used in speech action names"""
+        letters_only = ''.join(c for c in rig_name if c.isalpha())
+        return letters_only[:3].upper().ljust(3, 'X')
+
+    def parse_speech_action_name(self, name):
+        """Split a generated speech action name into its parts, None if it isn't one
+        
+        Returns a dict with 'char_code', 'kind' ('RA' or 'SA'), 'number' and 'suffix'.
+        """
+        match = SPEECH_ACTION_PATTERN.match(name)
+        if not match:
+            return None
+        return {
+            'char_code': match.group(1),
+            'kind': match.group(2),
+            'number': int(match.group(3)),
+            'suffix': match.group(4) or "",
+        }
+
+    def find_speech_actions(self, char_code="", suffix=None, kind=None):
+        """Return speech actions, optionally filtered by character code, suffix and kind"""
+        char_code = char_code.strip().upper()
+        if suffix is not None:
+            suffix = suffix.strip().upper().lstrip('_')
+        
+        found = []
+        for action in bpy.data.actions:
+            parts = self.parse_speech_action_name(action.name)
+            if not parts:
+                continue
+            if char_code and parts['char_code'] != char_code:
+                continue
+            if suffix is not None and parts['suffix'] != suffix:
+                continue
+            if kind and parts['kind'] != kind:
+                continue
+            found.append(action)
+        return found
+
     def generate_auto_names(self, rig_name, suffix=""):
         """Generate automatic names with optional suffix
         
@@ -100,10 +143,7 @@ class FacialAnimationProcessor:
             rig_name: Name of the rig
             suffix: Optional suffix like "_FR", "_SP", "_IT" etc.
         """
-        letters_only = ''.join(c for c in rig_name if c.isalpha())
-        char_code = letters_only[:3].upper()
-        if len(char_code) < 3:
-            char_code = char_code.ljust(3, 'X')
+        char_code = self.character_code(rig_name)
         
         # Clean up suffix - ensure it starts with underscore if provided
         if suffix and not suffix.startswith('_'):
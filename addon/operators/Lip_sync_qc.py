@@ -0,0 +1,196 @@
+import time
+
+import bpy
+import numpy as np
+
+from .Audio_analysis import get_sound_strips
+from .NLA_flatten import consolidated_characters
+from ..utils.audio_envelope import envelopes_for_strips
+from ..utils.lip_sync import batch_cross_correlate, motion_curve, parse_keywords
+from ..utils.nla_eval import strip_action_time
+from ..utils.nla_index import TrackIndex, move_strip
+
+
+def matching_audio(sound_strips, start, end):
+    """Index of the sound strip overlapping [start, end] the most, None if none does"""
+    if not sound_strips:
+        return None
+    starts = np.array([s.frame_final_start for s in sound_strips], dtype=np.float64)
+    ends = np.array([s.frame_final_end for s in sound_strips], dtype=np.float64)
+    overlap = np.minimum(ends, end) - np.maximum(starts, start)
+    best = int(np.argmax(overlap))
+    return best if overlap[best] > 0 else None
+
+
+def audio_window(first, values, start, length):
+    """Envelope values for scene frames start .. start + length, zero outside the clip"""
+    window = np.zeros(length)
+    lo = max(start, first)
+    hi = min(start + length, first + len(values))
+    if hi > lo:
+        window[lo - start:hi - start] = values[lo - first:hi - first]
+    return window
+
+
+def resolve_strip(item):
+    """(owner, track, strip) of a result row, None for anything renamed or deleted"""
+    if item.owner_type == 'KEY':
+        owner = bpy.data.shape_keys.get(item.owner_name)
+    else:
+        owner = bpy.data.objects.get(item.owner_name)
+    if owner is None or owner.animation_data is None:
+        return None
+    track = owner.animation_data.nla_tracks.get(item.track_name)
+    if track is None:
+        return None
+    strip = track.strips.get(item.strip_name)
+    if strip is None:
+        return None
+    return owner, track, strip
+
+
+class AH_DetectLipSyncDrift(bpy.types.Operator):
+    """Cross-correlate mouth motion with the audio envelope for every consolidated facial strip"""
+    bl_idname = "anim.detect_lipsync_drift"
+    bl_label = "Detect Lip-Sync Drift"
+    bl_description = ("Find how many frames each facial strip on the consolidated tracks is early or late "
+                      "against its dialogue audio")
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        scene = context.scene
+        props = scene.ah_lipsync
+        start_time = time.perf_counter()
+
+        sound_strips = get_sound_strips(scene)
+        if not sound_strips:
+            self.report({'WARNING'}, "No sound strips found")
+            return {'CANCELLED'}
+        characters = consolidated_characters(props.rig_track_name, props.shapekey_track_name)
+        if not characters:
+            self.report({'WARNING'}, "No consolidated dialogue tracks found")
+            return {'CANCELLED'}
+
+        envelopes, decoded, cached, errors = envelopes_for_strips(scene, sound_strips)
+        for path, message in errors.items():
+            print(f"Lip-sync QC: could not decode {path}: {message}")
+
+        keywords = parse_keywords(props.channel_keywords)
+        max_lag = props.max_lag
+        rows = []
+        motions = []
+        audios = []
+        for code, stacks in sorted(characters.items()):
+            owners = [('OBJECT', rig, props.rig_track_name) for rig in stacks['rig']]
+            owners += [('KEY', key, props.shapekey_track_name) for key in stacks['shapes']]
+            for owner_type, owner, track_name in owners:
+                track = owner.animation_data.nla_tracks[track_name]
+                for strip in TrackIndex.from_track(track).items:
+                    if strip.type != 'CLIP' or strip.action is None:
+                        continue
+                    first = int(np.ceil(strip.frame_start))
+                    last = int(np.floor(strip.frame_end))
+                    audio_index = matching_audio(sound_strips, strip.frame_start, strip.frame_end)
+                    if last - first < 2 or audio_index is None:
+                        continue
+                    audio = sound_strips[audio_index]
+                    if audio.name not in envelopes:
+                        continue
+
+                    frames = np.arange(first, last + 1, dtype=np.float64)
+                    _, motion = motion_curve(strip.action, strip_action_time(strip, frames), keywords)
+                    env_first, env_values = envelopes[audio.name]
+                    motions.append(motion)
+                    audios.append(audio_window(env_first, env_values, first - max_lag, len(frames) + 2 * max_lag))
+                    rows.append((code, owner_type, owner.name, track_name, strip, audio.name))
+
+        lags, confidence = batch_cross_correlate(motions, audios, max_lag)
+
+        props.results.clear()
+        flagged = 0
+        for (code, owner_type, owner_name, track_name, strip, audio_name), lag, conf in zip(rows, lags, confidence):
+            item = props.results.add()
+            item.name = strip.name
+            item.char_code = code
+            item.owner_type = owner_type
+            item.owner_name = owner_name
+            item.track_name = track_name
+            item.strip_name = strip.name
+            item.audio_name = audio_name
+            item.frame_start = strip.frame_start
+            item.confidence = float(conf)
+            # Weak matches are reported but never moved
+            item.offset = int(lag) if conf >= props.min_confidence else 0
+            item.flagged = abs(item.offset) > props.drift_threshold
+            item.apply = item.flagged
+            flagged += int(item.flagged)
+        props.active_index = 0
+
+        elapsed = time.perf_counter() - start_time
+        self.report({'INFO'}, f"Checked {len(rows)} strips in {elapsed:.2f}s: {flagged} drifting "
+                              f"({len(envelopes)} audio strips, files decoded: {decoded}, cached: {cached})")
+        return {'FINISHED'}
+
+
+class AH_ApplyLipSyncOffsets(bpy.types.Operator):
+    """Move every checked, flagged strip by its suggested offset"""
+    bl_idname = "anim.apply_lipsync_offsets"
+    bl_label = "Apply Suggested Offsets"
+    bl_description = "Slide flagged facial strips so their mouth motion lines up with the audio"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        props = context.scene.ah_lipsync
+        return any(item.flagged and item.apply and item.offset for item in props.results)
+
+    def execute(self, context):
+        props = context.scene.ah_lipsync
+        pending = []
+        missing = 0
+        for item in props.results:
+            if not (item.flagged and item.apply and item.offset):
+                continue
+            resolved = resolve_strip(item)
+            if resolved is None:
+                missing += 1
+                continue
+            pending.append((item, *resolved))
+
+        # Strips moving later go last-first, strips moving earlier first-first,
+        # so neighbours on the same track get out of each other's way
+        pending.sort(key=lambda row: (row[0].offset < 0, -row[3].frame_start if row[0].offset > 0 else row[3].frame_start))
+
+        indices = {}
+        moved = 0
+        blocked = []
+        for item, owner, track, strip in pending:
+            key = track.as_pointer()
+            if key not in indices:
+                indices[key] = TrackIndex.from_track(track)
+            index = indices[key]
+
+            index.remove(strip)
+            start = strip.frame_start + item.offset
+            end = strip.frame_end + item.offset
+            if not index.is_free(start, end):
+                index.add(strip.frame_start, strip.frame_end, strip)
+                blocked.append(strip.name)
+                continue
+            move_strip(strip, item.offset)
+            index.add(strip.frame_start, strip.frame_end, strip)
+            item.frame_start = strip.frame_start
+            item.offset = 0
+            item.flagged = False
+            item.apply = False
+            moved += 1
+
+        for name in blocked:
+            print(f"Lip-sync QC: {name} not moved, the target range is occupied")
+        message = f"Moved {moved} strips"
+        if blocked:
+            message += f", {len(blocked)} blocked by neighbours"
+        if missing:
+            message += f", {missing} no longer found"
+        self.report({'WARNING'} if blocked or missing else {'INFO'}, message)
+        return {'FINISHED'}
@@ -0,0 +1,92 @@
+import bpy
+
+from ..utils.track_compaction import compact_stack
+
+
+class AH_CompactNLATracks(bpy.types.Operator):
+    """Pack NLA strips into the fewest tracks without overlaps and remove the emptied tracks"""
+    bl_idname = "anim.compact_nla_tracks"
+    bl_label = "Compact NLA Tracks"
+    bl_description = ("Merge non-overlapping NLA tracks (e.g. one track per facial take) into as few tracks as "
+                      "possible, keeping the stacking order of overlapping strips")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope: bpy.props.EnumProperty(
+        name="Objects",
+        items=[
+            ('SELECTED', "Selected", "Selected objects and their shape keys"),
+            ('SCENE', "Scene", "Every object and shape key in the scene"),
+        ],
+        default='SELECTED'
+    )
+    hold_mode: bpy.props.EnumProperty(
+        name="Holds",
+        items=[
+            ('CLEAR', "Clear Holds", "Set packed strips to no extrapolation so they only occupy their own range. "
+                                     "Frames outside every strip no longer hold the last pose"),
+            ('RESPECT', "Respect Holds", "Holding strips stay on their track and block the range they hold; "
+                                         "the NLA result is unchanged but fewer tracks can merge"),
+        ],
+        default='RESPECT'
+    )
+    include_shapekeys: bpy.props.BoolProperty(
+        name="Shape Keys",
+        description="Also compact the shape key NLA of meshes",
+        default=True
+    )
+    track_name: bpy.props.StringProperty(
+        name="Track Name",
+        description="Rename the remaining tracks of compacted stacks; leave empty to keep their names",
+        default=""
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=320)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "scope", expand=True)
+        layout.prop(self, "hold_mode")
+        layout.prop(self, "include_shapekeys")
+        layout.prop(self, "track_name")
+
+    def execute(self, context):
+        objects = context.selected_objects if self.scope == 'SELECTED' else context.scene.objects
+        stacks = []
+        seen = set()
+        for obj in objects:
+            owners = [obj]
+            if self.include_shapekeys and obj.type == 'MESH' and obj.data.shape_keys:
+                owners.append(obj.data.shape_keys)
+            for owner in owners:
+                anim_data = owner.animation_data
+                if anim_data and len(anim_data.nla_tracks) > 1 and owner.as_pointer() not in seen:
+                    seen.add(owner.as_pointer())
+                    stacks.append((owner, anim_data))
+
+        if not stacks:
+            self.report({'WARNING'}, "No objects with more than one NLA track")
+            return {'CANCELLED'}
+
+        moved = removed = holds = 0
+        skipped = []
+        for owner, anim_data in stacks:
+            if anim_data.use_tweak_mode:
+                skipped.append(owner.name)
+                continue
+            before = len(anim_data.nla_tracks)
+            stack_moved, stack_removed, stack_holds = compact_stack(
+                anim_data, self.hold_mode == 'CLEAR', self.track_name.strip())
+            moved += stack_moved
+            removed += stack_removed
+            holds += stack_holds
+            if stack_removed:
+                print(f"Compacted {owner.name}: {before} -> {len(anim_data.nla_tracks)} tracks")
+
+        message = f"Removed {removed} tracks, moved {moved} strips"
+        if holds:
+            message += f", cleared {holds} holds (frames outside the strips no longer hold their pose)"
+        if skipped:
+            message += f"; skipped {len(skipped)} stacks in tweak mode: {', '.join(skipped)}"
+        self.report({'WARNING'} if holds or skipped else {'INFO'}, message)
+        return {'FINISHED'}
@@ -0,0 +1,350 @@
+import time
+
+import bpy
+import numpy as np
+
+from .Facial_auto_processor import FacialAnimationProcessor
+from ..utils.nla_eval import NLAStackEvaluator, compare_with_blender, nla_frame_range, write_flat_action
+
+
+def stack_owners(obj, process_rig=True, process_shapekeys=True):
+    """(owner ID, label) pairs whose NLA stacks belong to an object's character
+
+    An armature brings its child meshes' shape keys; a mesh brings its
+    parent armature.
+    """
+    armatures = []
+    meshes = []
+    if obj.type == 'ARMATURE':
+        armatures.append(obj)
+        meshes.extend(child for child in obj.children if child.type == 'MESH' and child.data.shape_keys)
+    elif obj.type == 'MESH':
+        if obj.data.shape_keys:
+            meshes.append(obj)
+        if obj.parent and obj.parent.type == 'ARMATURE':
+            armatures.append(obj.parent)
+    else:
+        armatures.append(obj)
+
+    owners = []
+    if process_rig:
+        owners.extend((arm, arm.name) for arm in armatures if arm.animation_data)
+    if process_shapekeys:
+        owners.extend((mesh.data.shape_keys, f"{mesh.name} (Shape Keys)") for mesh in meshes
+                      if mesh.data.shape_keys.animation_data)
+    return owners
+
+
+def flatten_stack(owner, channels, frames, include_action=True, action_name="", replace_stack=True):
+    """Write evaluated NLA channels of one owner to a single action
+
+    With replace_stack the source tracks are muted and the result is placed
+    on a new track above them.
+    """
+    anim_data = owner.animation_data
+    name = action_name or f"{owner.name}_NLA_Flat"
+    action = bpy.data.actions.new(name)
+    action.id_root = 'KEY' if isinstance(owner, bpy.types.Key) else 'OBJECT'
+    write_flat_action(action, channels, frames)
+
+    if replace_stack:
+        for track in anim_data.nla_tracks:
+            track.mute = True
+        if include_action and anim_data.action:
+            anim_data.action = None
+        track = anim_data.nla_tracks.new()
+        track.name = name
+        strip = track.strips.new(name, int(frames[0]), action)
+        strip.blend_type = 'REPLACE'
+        strip.extrapolation = 'HOLD'
+    else:
+        action.use_fake_user = True
+    return action
+
+
+class AH_FlattenNLAStack(bpy.types.Operator):
+    """Flatten NLA stacks into single actions by evaluating the strips directly"""
+    bl_idname = "anim.flatten_nla_stack"
+    bl_label = "Flatten NLA Stack"
+    bl_description = "Compute the NLA result from action fcurves only (no scene bake) and write one action per stack"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    process_rig: bpy.props.BoolProperty(
+        name="Rig / Object",
+        description="Flatten the NLA stack of the armature or object",
+        default=True
+    )
+
+    process_shapekeys: bpy.props.BoolProperty(
+        name="Shape Keys",
+        description="Flatten the shape key NLA stacks of the character's meshes",
+        default=True
+    )
+
+    range_mode: bpy.props.EnumProperty(
+        name="Frame Range",
+        items=[
+            ('NLA', "NLA Strips", "From the first strip start to the last strip end"),
+            ('SCENE', "Scene", "Scene start to end frame"),
+        ],
+        default='NLA'
+    )
+
+    frame_step: bpy.props.IntProperty(
+        name="Frame Step",
+        description="Sample every Nth frame",
+        default=1,
+        min=1,
+        max=10
+    )
+
+    include_action: bpy.props.BoolProperty(
+        name="Include Active Action",
+        description="Evaluate the active action on top of the NLA tracks",
+        default=True
+    )
+
+    replace_stack: bpy.props.BoolProperty(
+        name="Replace Stack",
+        description="Mute the source tracks and place the flattened action on a new track",
+        default=True
+    )
+
+    verify_frames: bpy.props.IntProperty(
+        name="Verify Frames",
+        description="Compare this many frames against Blender's NLA result (0 to skip)",
+        default=5,
+        min=0,
+        max=50
+    )
+
+    tolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        description="Largest difference from Blender's result accepted by the check",
+        default=0.001,
+        min=0.0,
+        precision=4
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.active_object is not None
+
+    def execute(self, context):
+        owners = stack_owners(context.active_object, self.process_rig, self.process_shapekeys)
+        owners = [(owner, label) for owner, label in owners
+                  if owner.animation_data.nla_tracks or (self.include_action and owner.animation_data.action)]
+        if not owners:
+            self.report({'WARNING'}, "No NLA stacks found on the active character")
+            return {'CANCELLED'}
+
+        for owner, label in owners:
+            if owner.animation_data.use_tweak_mode:
+                self.report({'ERROR'}, f"{label} is in tweak mode, exit it before flattening")
+                return {'CANCELLED'}
+
+        flattened = []
+        warnings = []
+        for owner, label in owners:
+            frames = self.get_frames(context, owner.animation_data)
+            if frames is None:
+                continue
+
+            evaluator = NLAStackEvaluator(owner.animation_data, self.include_action)
+            channels = evaluator.evaluate(frames)
+            if not channels:
+                continue
+            if self.verify_frames:
+                # Compare while the source stack is still live
+                error, channel, frame = compare_with_blender(context.scene, owner, channels, frames,
+                                                             self.verify_frames)
+                if error > self.tolerance:
+                    warnings.append(f"{label}: {channel[0]}[{channel[1]}] differs by {error:.4f} at frame {frame:g}")
+
+            if evaluator.unsupported:
+                warnings.append(f"{label}: skipped non-clip strips {', '.join(sorted(set(evaluator.unsupported))[:3])}")
+
+            action = flatten_stack(owner, channels, frames, self.include_action,
+                                   replace_stack=self.replace_stack)
+            flattened.append(f"{action.name} ({len(channels)} channels, {len(frames)} frames)")
+
+        for warning in warnings:
+            self.report({'WARNING'}, warning)
+        if not flattened:
+            self.report({'WARNING'}, "Nothing was animated in the frame range")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Flattened {len(flattened)} stacks: {', '.join(flattened)}")
+        return {'FINISHED'}
+
+    def get_frames(self, context, anim_data):
+        if self.range_mode == 'SCENE':
+            start, end = context.scene.frame_start, context.scene.frame_end
+        else:
+            frame_range = nla_frame_range(anim_data)
+            if frame_range is None:
+                if not (self.include_action and anim_data.action):
+                    return None
+                frame_range = anim_data.action.frame_range
+            start, end = frame_range
+        start = int(np.floor(start))
+        end = int(np.ceil(end))
+        frames = np.arange(start, end + 1, self.frame_step, dtype=np.float64)
+        if frames[-1] != end:
+            frames = np.append(frames, float(end))
+        return frames
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=320)
+
+    def draw(self, context):
+        layout = self.layout
+
+        box = layout.box()
+        box.label(text="Stacks", icon='NLA')
+        row = box.row(align=True)
+        row.prop(self, "process_rig", toggle=True)
+        row.prop(self, "process_shapekeys", toggle=True)
+        box.prop(self, "include_action")
+
+        box = layout.box()
+        box.label(text="Sampling", icon='TIME')
+        box.prop(self, "range_mode", expand=True)
+        box.prop(self, "frame_step")
+
+        box = layout.box()
+        box.label(text="Result", icon='ACTION')
+        box.prop(self, "replace_stack")
+        row = box.row(align=True)
+        row.prop(self, "verify_frames")
+        row.prop(self, "tolerance")
+
+
+def consolidated_characters(rig_track_name, shapekey_track_name, objects=None):
+    """Group stacks holding consolidated speech tracks by character code
+
+    -> {code: {'rig': [armatures], 'shapes': [shape key datablocks]}}
+    """
+    processor = FacialAnimationProcessor()
+    characters = {}
+    for obj in (bpy.data.objects if objects is None else objects):
+        if obj.type == 'ARMATURE' and obj.animation_data:
+            if obj.animation_data.nla_tracks.get(rig_track_name):
+                code = processor.character_code(obj.name)
+                characters.setdefault(code, {'rig': [], 'shapes': []})['rig'].append(obj)
+        elif obj.type == 'MESH' and obj.data.shape_keys and obj.data.shape_keys.animation_data:
+            if obj.data.shape_keys.animation_data.nla_tracks.get(shapekey_track_name):
+                # Shape keys belong to the character of their parent rig
+                rig = obj.parent if obj.parent and obj.parent.type == 'ARMATURE' else obj
+                code = processor.character_code(rig.name)
+                characters.setdefault(code, {'rig': [], 'shapes': []})['shapes'].append(obj.data.shape_keys)
+    return characters
+
+
+def flatten_tracks(owner, track_name, action_name, frame_step=1):
+    """Evaluate one consolidated track and bulk-write it into action_name
+
+    Returns (action, channel count, frame count) or None if the track is empty.
+    """
+    anim_data = owner.animation_data
+    frame_range = nla_frame_range(anim_data, {track_name})
+    if frame_range is None:
+        return None
+    start, end = int(np.floor(frame_range[0])), int(np.ceil(frame_range[1]))
+    frames = np.arange(start, end + 1, frame_step, dtype=np.float64)
+    if frames[-1] != end:
+        frames = np.append(frames, float(end))
+
+    channels = NLAStackEvaluator(anim_data, include_action=False, track_names={track_name}).evaluate(frames)
+    if not channels:
+        return None
+
+    action = bpy.data.actions.get(action_name)
+    if action is None or action.library is not None:
+        action = bpy.data.actions.new(action_name)
+    else:
+        action.fcurves.clear()
+    action.id_root = 'KEY' if isinstance(owner, bpy.types.Key) else 'OBJECT'
+    action.use_fake_user = True
+    write_flat_action(action, channels, frames)
+    return action, len(channels), len(frames)
+
+
+class AH_FlattenConsolidatedSpeech(bpy.types.Operator):
+    """Flatten the consolidated speech tracks of every character into master actions"""
+    bl_idname = "anim.flatten_consolidated_speech"
+    bl_label = "Flatten Consolidated Speech"
+    bl_description = "Evaluate only the consolidated dialogue tracks and write one rig and one shape key action per character"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope: bpy.props.EnumProperty(
+        name="Characters",
+        items=[
+            ('ALL', "All Characters", "Every character in the file with consolidated tracks"),
+            ('SELECTED', "Selected", "Only the selected armatures and meshes"),
+        ],
+        default='ALL'
+    )
+
+    rig_track_name: bpy.props.StringProperty(
+        name="Rig Track Name",
+        description="Consolidated rig track to flatten",
+        default="Main_Dialogue_Rig"
+    )
+
+    shapekey_track_name: bpy.props.StringProperty(
+        name="Shape Key Track Name",
+        description="Consolidated shape key track to flatten",
+        default="Main_Dialogue_Shapes"
+    )
+
+    frame_step: bpy.props.IntProperty(
+        name="Frame Step",
+        description="Sample every Nth frame",
+        default=1,
+        min=1,
+        max=10
+    )
+
+    def execute(self, context):
+        objects = context.selected_objects if self.scope == 'SELECTED' else None
+        characters = consolidated_characters(self.rig_track_name, self.shapekey_track_name, objects)
+        if not characters:
+            self.report({'WARNING'}, f"No '{self.rig_track_name}' or '{self.shapekey_track_name}' tracks found")
+            return {'CANCELLED'}
+
+        start_time = time.perf_counter()
+        written = 0
+        for code, owners in sorted(characters.items()):
+            jobs = [(owner, self.rig_track_name, f"CC_{code}_RA_MASTER") for owner in owners['rig']]
+            jobs += [(owner, self.shapekey_track_name, f"CC_{code}_SA_MASTER") for owner in owners['shapes']]
+            for owner, track_name, action_name in jobs:
+                if (len(owners['rig']) > 1 and track_name == self.rig_track_name) or \
+                        (len(owners['shapes']) > 1 and track_name == self.shapekey_track_name):
+                    # Several rigs or meshes share a code, keep their masters apart
+                    action_name = f"{action_name}_{owner.name}"
+                result = flatten_tracks(owner, track_name, action_name, self.frame_step)
+                if result is None:
+                    continue
+                action, channel_count, frame_count = result
+                print(f"Flattened {owner.name}/{track_name} -> {action.name}: "
+                      f"{channel_count} channels x {frame_count} frames")
+                written += 1
+
+        elapsed = time.perf_counter() - start_time
+        self.report({'INFO'}, f"Wrote {written} master actions for {len(characters)} characters in {elapsed:.1f}s")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=350)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "scope", expand=True)
+
+        box = layout.box()
+        box.label(text="Track Names")
+        box.prop(self, "rig_track_name")
+        box.prop(self, "shapekey_track_name")
+
+        layout.prop(self, "frame_step")
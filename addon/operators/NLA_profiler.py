@@ -0,0 +1,154 @@
+import bpy
+
+from ..utils.nla_profile import StateRestorer, sample_frames, setting_warnings, stack_range, time_frames
+
+
+class AH_ProfileNLAEvaluation(bpy.types.Operator):
+    """Time the depsgraph with each NLA track or strip of the active object muted in turn"""
+    bl_idname = "anim.profile_nla_evaluation"
+    bl_label = "Profile NLA Evaluation"
+    bl_description = ("Measure how much of the active object's playback cost comes from its NLA tracks, strips, "
+                      "drivers and constraints. Mute states and the current frame are restored afterwards")
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.active_object is not None
+
+    def execute(self, context):
+        scene = context.scene
+        props = scene.ah_profile
+        obj = context.active_object
+
+        stacks = self.stacks(obj, props.include_shapekeys)
+        if not any(len(anim_data.nla_tracks) for _, anim_data in stacks):
+            self.report({'WARNING'}, f"{obj.name} has no NLA tracks")
+            return {'CANCELLED'}
+
+        frame_range = stack_range([anim_data for _, anim_data in stacks]) or (scene.frame_start, scene.frame_end)
+        frames = sample_frames(*frame_range, props.frame_count)
+        units = []
+        for owner_name, anim_data in stacks:
+            for track in anim_data.nla_tracks:
+                if track.mute:
+                    continue
+                if props.granularity == 'TRACKS':
+                    units.append(('TRACK', owner_name, track, track))
+                else:
+                    units.extend(('STRIP', owner_name, track, strip) for strip in track.strips if not strip.mute)
+
+        state = StateRestorer()
+        original_frame = scene.frame_current
+        original_subframe = scene.frame_subframe
+        wm = context.window_manager
+        wm.progress_begin(0, len(units) + 4)
+        costs = []
+        try:
+            def timed():
+                return time_frames(scene, frames, props.repeats)
+
+            time_frames(scene, frames, 1)  # warm up caches before measuring
+            total = timed()
+            wm.progress_update(1)
+
+            for _, anim_data in stacks:
+                for track in anim_data.nla_tracks:
+                    state.set(track, "mute", True)
+            without_nla = timed()
+            state.restore()
+            wm.progress_update(2)
+
+            for fcurve in self.drivers(obj, stacks):
+                state.set(fcurve, "mute", True)
+            without_drivers = timed()
+            state.restore()
+            wm.progress_update(3)
+
+            for constraint in self.constraints(obj):
+                if hasattr(constraint, "enabled"):
+                    state.set(constraint, "enabled", False)
+                else:
+                    state.set(constraint, "mute", True)
+            without_constraints = timed()
+            state.restore()
+            wm.progress_update(4)
+
+            for i, (kind, owner_name, track, item) in enumerate(units):
+                state.set(item, "mute", True)
+                costs.append((total - timed(), kind, owner_name, track.name, item.name))
+                state.restore()
+                wm.progress_update(5 + i)
+        finally:
+            state.restore()
+            scene.frame_set(original_frame, subframe=original_subframe)
+            wm.progress_end()
+
+        nla_cost = max(total - without_nla, 0.0)
+        props.target_name = obj.name
+        props.total_ms = total * 1000.0
+        props.nla_ms = nla_cost * 1000.0
+        props.drivers_ms = max(total - without_drivers, 0.0) * 1000.0
+        props.constraints_ms = max(total - without_constraints, 0.0) * 1000.0
+
+        props.results.clear()
+        for cost, kind, owner_name, track_name, name in sorted(costs, reverse=True):
+            item = props.results.add()
+            item.name = name
+            item.kind = kind
+            item.owner_name = owner_name
+            item.track_name = track_name
+            item.cost_ms = cost * 1000.0
+            item.share = min(max(cost / nla_cost, 0.0), 1.0) if nla_cost > 0 else 0.0
+        props.active_index = 0
+
+        props.warnings.clear()
+        for owner_name, anim_data in stacks:
+            for track_name, strip_name, message in setting_warnings(anim_data):
+                item = props.warnings.add()
+                item.name = message
+                item.owner_name = owner_name
+                item.track_name = track_name
+                item.strip_name = strip_name
+        props.active_warning = 0
+
+        message = (f"{obj.name}: {props.total_ms:.2f} ms/frame, NLA {props.nla_ms:.2f}, "
+                   f"drivers {props.drivers_ms:.2f}, constraints {props.constraints_ms:.2f}")
+        if props.results:
+            top = props.results[0]
+            message += f"; most costly {top.name} ({top.cost_ms:.2f} ms)"
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+    def stacks(self, obj, include_shapekeys):
+        """(owner name, AnimData) of the object and, optionally, the shape keys it drives"""
+        stacks = []
+        if obj.animation_data:
+            stacks.append((obj.name, obj.animation_data))
+        if include_shapekeys:
+            meshes = [obj] if obj.type == 'MESH' else [child for child in obj.children if child.type == 'MESH']
+            for mesh in meshes:
+                shape_keys = mesh.data.shape_keys
+                if shape_keys and shape_keys.animation_data:
+                    stacks.append((f"{mesh.name} (Shape Keys)", shape_keys.animation_data))
+        return stacks
+
+    def drivers(self, obj, stacks):
+        """Driver fcurves of the object, its data and the profiled shape keys"""
+        owners = [obj, obj.data] + [anim_data.id_data for _, anim_data in stacks]
+        fcurves = []
+        seen = set()
+        for owner in owners:
+            anim_data = getattr(owner, "animation_data", None) if owner is not None else None
+            if anim_data is None or owner.as_pointer() in seen:
+                continue
+            seen.add(owner.as_pointer())
+            fcurves.extend(fc for fc in anim_data.drivers if not fc.mute)
+        return fcurves
+
+    def constraints(self, obj):
+        """Active object and pose bone constraints of the object"""
+        constraints = list(obj.constraints)
+        if obj.type == 'ARMATURE' and obj.pose:
+            for bone in obj.pose.bones:
+                constraints.extend(bone.constraints)
+        return [c for c in constraints if getattr(c, "enabled", not getattr(c, "mute", False))]
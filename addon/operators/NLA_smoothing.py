@@ -1,5 +1,8 @@
 import bpy
 
+from ..utils.nla_index import TrackIndex
+from ..utils.pose_distance import adaptive_blend_frames, boundary_pose_distances
+
 class AH_NLASmoothTransitions(bpy.types.Operator):
     """Smooth facial animation transitions in NLA strips to reduce head popping"""
     bl_idname = "anim.nla_smooth_transitions"
@@ -8,14 +11,39 @@ class AH_NLASmoothTransitions(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     # Properties
+    blend_mode: bpy.props.EnumProperty(
+        name="Blend Length",
+        items=[
+            ('ADAPTIVE', "Adaptive", "Blend longer where the face pose jumps more between strips"),
+            ('FIXED', "Fixed", "Same blend length at every transition")
+        ],
+        default='ADAPTIVE'
+    )
+    
     blend_frames: bpy.props.IntProperty(
         name="Blend Frames",
-        description="Number of frames to blend at strip transitions",
+        description="Number of frames to blend at strip transitions (the longest blend in Adaptive mode)",
         default=5,
         min=1,
         max=20
     )
     
+    min_blend_frames: bpy.props.IntProperty(
+        name="Min Blend Frames",
+        description="Blend length where the pose barely changes between strips",
+        default=1,
+        min=0,
+        max=20
+    )
+    
+    full_blend_jump: bpy.props.FloatProperty(
+        name="Full Blend Jump",
+        description="Pose jump, as a fraction of each face channel's animated range in the track's actions, that gets the full blend length",
+        default=0.5,
+        min=0.01,
+        max=1.0
+    )
+    
     process_armature: bpy.props.BoolProperty(
         name="Process Armature",
         description="Fix armature/bone transitions",
@@ -50,12 +78,23 @@ class AH_NLASmoothTransitions(bpy.types.Operator):
         try:
             armature_strips = 0
             shapekey_strips = 0
+            # (strips, object name, track name) collected first so every boundary is measured at once
+            self._tracks = []
             
             if self.process_armature:
-                armature_strips = self.process_selected_armature_transitions(selected_objects)
+                self.process_selected_armature_transitions(selected_objects)
+            armature_count = len(self._tracks)
             
             if self.process_shapekeys:
-                shapekey_strips = self.process_selected_shapekey_transitions(selected_objects)
+                self.process_selected_shapekey_transitions(selected_objects)
+            
+            for i, blends in enumerate(self.boundary_blends()):
+                strips, object_name, track_name = self._tracks[i]
+                count = self.apply_strip_blending(strips, object_name, track_name, blends)
+                if i < armature_count:
+                    armature_strips += count
+                else:
+                    shapekey_strips += count
             
             total_strips = armature_strips + shapekey_strips
             
@@ -75,9 +114,8 @@ class AH_NLASmoothTransitions(bpy.types.Operator):
             return {'CANCELLED'}
     
     def process_selected_armature_transitions(self, selected_objects):
-        """Process armature NLA transitions for selected objects only"""
-        strips_processed = 0
-        
+        """Collect armature NLA tracks to smooth for selected objects only"""
+
         # Only process selected armatures
         selected_armatures = [obj for obj in selected_objects if obj.type == 'ARMATURE']
         
@@ -94,19 +132,16 @@ class AH_NLASmoothTransitions(bpy.types.Operator):
                     if not has_selected:
                         continue
                 
-                strips = sorted(track.strips, key=lambda s: s.frame_start)
+                strips = TrackIndex.from_track(track).items
                 
                 if len(strips) < 2:
                     continue
                 
-                strips_processed += self.apply_strip_blending(strips, armature.name, track.name)
-        
-        return strips_processed
+                self._tracks.append((strips, armature.name, track.name))
     
     def process_selected_shapekey_transitions(self, selected_objects):
-        """Process shape key NLA transitions for selected objects only"""
-        strips_processed = 0
-        
+        """Collect shape key NLA tracks to smooth for selected objects only"""
+
         # Only process selected meshes with shape keys
         selected_meshes = [obj for obj in selected_objects 
                           if obj.type == 'MESH' and obj.data.shape_keys]
@@ -125,17 +160,24 @@ class AH_NLASmoothTransitions(bpy.types.Operator):
                     if not has_selected:
                         continue
                 
-                strips = sorted(track.strips, key=lambda s: s.frame_start)
+                strips = TrackIndex.from_track(track).items
                 
                 if len(strips) < 2:
                     continue
                 
-                strips_processed += self.apply_strip_blending(strips, mesh.name, track.name)
+                self._tracks.append((strips, mesh.name, track.name))
+    
+    def boundary_blends(self):
+        """Blend length per boundary of every collected track"""
+        if self.blend_mode == 'FIXED':
+            return [[self.blend_frames] * (len(strips) - 1) for strips, _, _ in self._tracks]
         
-        return strips_processed
+        distances = boundary_pose_distances([strips for strips, _, _ in self._tracks])
+        low = min(self.min_blend_frames, self.blend_frames)
+        return [adaptive_blend_frames(d, low, self.blend_frames, self.full_blend_jump).tolist() for d in distances]
     
-    def apply_strip_blending(self, strips, object_name, track_name):
-        """Apply blending to a list of strips"""
+    def apply_strip_blending(self, strips, object_name, track_name, blends):
+        """Apply blending to a list of strips, blends[i] being the length between strip i and i + 1"""
         strips_processed = 0
         
         for i, strip in enumerate(strips):
@@ -145,15 +187,16 @@ class AH_NLASmoothTransitions(bpy.types.Operator):
             
             strip_length = strip.frame_end - strip.frame_start
             max_blend = max(1, int(strip_length * 0.2))  # Max 20% of strip length
-            blend_amount = min(self.blend_frames, max_blend)
             
             # Apply blend-in (except first strip)
             if i > 0:
+                blend_amount = min(blends[i - 1], max_blend)
                 strip.blend_in = blend_amount
                 print(f"  Applied blend_in={blend_amount} to '{strip.name}' in {object_name}/{track_name}")
             
             # Apply blend-out (except last strip)
             if i < len(strips) - 1:
+                blend_amount = min(blends[i], max_blend)
                 strip.blend_out = blend_amount
                 print(f"  Applied blend_out={blend_amount} to '{strip.name}' in {object_name}/{track_name}")
             
@@ -199,7 +242,14 @@ class AH_NLASmoothTransitions(bpy.types.Operator):
         
         layout.separator()
         
-        layout.prop(self, "blend_frames")
+        layout.prop(self, "blend_mode", expand=True)
+        if self.blend_mode == 'ADAPTIVE':
+            col = layout.column(align=True)
+            col.prop(self, "min_blend_frames")
+            col.prop(self, "blend_frames", text="Max Blend Frames")
+            col.prop(self, "full_blend_jump", slider=True)
+        else:
+            layout.prop(self, "blend_frames")
         layout.separator()
         
         layout.prop(self, "process_armature")
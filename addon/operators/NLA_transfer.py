@@ -1,5 +1,23 @@
+import math
+import os
+
 import bpy
 
+from ..utils.action_copies import ACTION_MODE_ITEMS, ActionCopyTable
+from ..utils.nla_index import StackIndex
+from ..utils.nla_layout import (
+    KIND_SHAPEKEY,
+    LAYOUT_FILE_SUFFIX,
+    LAYOUT_TEXT_NAME,
+    LayoutBuilder,
+    dumps_layout,
+    layout_action_names,
+    layout_of,
+    loads_layout,
+    stack_for,
+)
+
+
 class AH_TransferNLAStrips(bpy.types.Operator):
     """Transfer NLA strips from source object to target object with safe positioning"""
     bl_idname = "anim.transfer_nla_strips_fixed"
@@ -35,6 +53,13 @@ class AH_TransferNLAStrips(bpy.types.Operator):
         description="Prefix for new track names to avoid conflicts",
         default="Transferred_"
     )
+
+    action_mode: bpy.props.EnumProperty(
+        name="Actions",
+        description="How transferred strips get their actions",
+        items=ACTION_MODE_ITEMS,
+        default='COPY_ONCE'
+    )
     
     @classmethod
     def poll(cls, context):
@@ -57,6 +82,7 @@ class AH_TransferNLAStrips(bpy.types.Operator):
         
         strips_copied = 0
         tracks_created = 0
+        copies = ActionCopyTable(self.action_mode)
         
         for target_obj in target_objects:
             # Ensure target has animation data
@@ -66,6 +92,7 @@ class AH_TransferNLAStrips(bpy.types.Operator):
             # Store existing tracks to avoid modifying them
             existing_tracks = list(target_obj.animation_data.nla_tracks)
             existing_track_names = {track.name for track in existing_tracks}
+            stack = StackIndex(existing_tracks)
             
             # Copy each NLA track from source to target
             for source_track in source_obj.animation_data.nla_tracks:
@@ -95,6 +122,7 @@ class AH_TransferNLAStrips(bpy.types.Operator):
                     # Remove existing track with same name
                     for existing_track in list(target_obj.animation_data.nla_tracks):
                         if existing_track.name == source_track.name:
+                            stack.discard(existing_track)
                             target_obj.animation_data.nla_tracks.remove(existing_track)
                             break
                     
@@ -112,29 +140,36 @@ class AH_TransferNLAStrips(bpy.types.Operator):
                 
                 # Copy each strip in the track
                 for source_strip in source_track.strips:
-                    # Create action copy to avoid sharing references
-                    if source_strip.action:
-                        action_copy = source_strip.action.copy()
-                        action_copy.name = f"{source_strip.action.name}_Copy"
-                    else:
-                        action_copy = None
+                    # One copy per source action, shared across targets
+                    action_copy = copies.get(source_strip.action)
+                    
+                    if action_copy is None:
+                        continue  # transitions and metas have no action to copy
                     
                     # Determine strip timing
+                    index = stack.track(target_track)
+                    duration = source_strip.frame_end - source_strip.frame_start
+                    # strips.new makes the strip as long as the whole action before it is cut to length
+                    action_start, action_end = action_copy.frame_range
+                    span = max(duration, action_end - action_start)
                     if self.preserve_timing:
-                        start_frame = source_strip.frame_start
+                        start_frame = int(source_strip.frame_start)
+                        # Appending onto an occupied range would fail, use the next gap
+                        if not index.is_free(start_frame, start_frame + span):
+                            start_frame = math.ceil(index.first_fit(span, after=start_frame))
                     else:
                         # Place after existing strips in target track
-                        start_frame = self.get_next_available_frame(target_track)
+                        start_frame = self.get_next_available_frame(index)
                     
                     # Create new strip
                     target_strip = target_track.strips.new(
                         name=source_strip.name,
-                        start=int(start_frame),
+                        start=start_frame,
                         action=action_copy
                     )
                     
-                    # Copy strip properties
-                    target_strip.frame_end = source_strip.frame_end
+                    # Copy strip properties, keeping the source length wherever it landed
+                    target_strip.frame_end = target_strip.frame_start + duration
                     target_strip.extrapolation = source_strip.extrapolation
                     target_strip.blend_type = source_strip.blend_type
                     target_strip.influence = source_strip.influence
@@ -145,9 +180,10 @@ class AH_TransferNLAStrips(bpy.types.Operator):
                     target_strip.blend_in = source_strip.blend_in
                     target_strip.blend_out = source_strip.blend_out
                     
+                    index.add(target_strip.frame_start, target_strip.frame_end, target_strip)
                     strips_copied += 1
         
-        self.report({'INFO'}, f"Created {tracks_created} tracks, copied {strips_copied} strips to {len(target_objects)} objects")
+        self.report({'INFO'}, f"Created {tracks_created} tracks, copied {strips_copied} strips to {len(target_objects)} objects ({copies.summary()})")
         return {'FINISHED'}
     
     def get_unique_track_name(self, target_obj, base_name):
@@ -166,13 +202,12 @@ class AH_TransferNLAStrips(bpy.types.Operator):
         
         return f"{prefixed_name}_{counter:03d}"
     
-    def get_next_available_frame(self, track):
-        """Find the next available frame after existing strips"""
-        if not track.strips:
+    def get_next_available_frame(self, index):
+        """Find the next available frame after the strips of an indexed track"""
+        if not len(index):
             return 1
         
-        latest_end = max(strip.frame_end for strip in track.strips)
-        return int(latest_end) + 10  # 10 frame gap
+        return int(index.last_end) + 10  # 10 frame gap
     
     def invoke(self, context, event):
         return context.window_manager.invoke_props_dialog(self, width=350)
@@ -211,6 +246,7 @@ class AH_TransferNLAStrips(bpy.types.Operator):
         
         layout.prop(self, "preserve_timing")
         layout.prop(self, "mute_new_tracks")
+        layout.prop(self, "action_mode")
 
 
 class AH_TransferShapeKeyNLA(bpy.types.Operator):
@@ -248,6 +284,13 @@ class AH_TransferShapeKeyNLA(bpy.types.Operator):
         description="Prefix for new track names to avoid conflicts",
         default="Transferred_"
     )
+
+    action_mode: bpy.props.EnumProperty(
+        name="Actions",
+        description="How transferred strips get their actions",
+        items=ACTION_MODE_ITEMS,
+        default='COPY_ONCE'
+    )
     
     @classmethod
     def poll(cls, context):
@@ -272,6 +315,7 @@ class AH_TransferShapeKeyNLA(bpy.types.Operator):
         
         strips_copied = 0
         tracks_created = 0
+        copies = ActionCopyTable(self.action_mode)
         
         for target_mesh in target_meshes:
             target_shape_keys = target_mesh.data.shape_keys
@@ -282,6 +326,7 @@ class AH_TransferShapeKeyNLA(bpy.types.Operator):
             
             # Store existing tracks to avoid modifying them
             existing_tracks = list(target_shape_keys.animation_data.nla_tracks)
+            stack = StackIndex(existing_tracks)
             
             # Copy each NLA track
             for source_track in source_shape_keys.animation_data.nla_tracks:
@@ -311,6 +356,7 @@ class AH_TransferShapeKeyNLA(bpy.types.Operator):
                     # Remove existing track with same name
                     for existing_track in list(target_shape_keys.animation_data.nla_tracks):
                         if existing_track.name == source_track.name:
+                            stack.discard(existing_track)
                             target_shape_keys.animation_data.nla_tracks.remove(existing_track)
                             break
                     
@@ -328,29 +374,36 @@ class AH_TransferShapeKeyNLA(bpy.types.Operator):
                 
                 # Copy each strip in the track
                 for source_strip in source_track.strips:
-                    # Create action copy to avoid sharing references
-                    if source_strip.action:
-                        action_copy = source_strip.action.copy()
-                        action_copy.name = f"{source_strip.action.name}_Copy"
-                    else:
-                        action_copy = None
+                    # One copy per source action, shared across targets
+                    action_copy = copies.get(source_strip.action)
+                    
+                    if action_copy is None:
+                        continue  # transitions and metas have no action to copy
                     
                     # Determine strip timing
+                    index = stack.track(target_track)
+                    duration = source_strip.frame_end - source_strip.frame_start
+                    # strips.new makes the strip as long as the whole action before it is cut to length
+                    action_start, action_end = action_copy.frame_range
+                    span = max(duration, action_end - action_start)
                     if self.preserve_timing:
-                        start_frame = source_strip.frame_start
+                        start_frame = int(source_strip.frame_start)
+                        # Appending onto an occupied range would fail, use the next gap
+                        if not index.is_free(start_frame, start_frame + span):
+                            start_frame = math.ceil(index.first_fit(span, after=start_frame))
                     else:
                         # Place after existing strips in target track
-                        start_frame = self.get_next_available_frame(target_track)
+                        start_frame = self.get_next_available_frame(index)
                     
                     # Create new strip
                     target_strip = target_track.strips.new(
                         name=source_strip.name,
-                        start=int(start_frame),
+                        start=start_frame,
                         action=action_copy
                     )
                     
-                    # Copy strip properties
-                    target_strip.frame_end = source_strip.frame_end
+                    # Copy strip properties, keeping the source length wherever it landed
+                    target_strip.frame_end = target_strip.frame_start + duration
                     target_strip.extrapolation = source_strip.extrapolation
                     target_strip.blend_type = source_strip.blend_type
                     target_strip.influence = source_strip.influence
@@ -361,9 +414,10 @@ class AH_TransferShapeKeyNLA(bpy.types.Operator):
                     target_strip.blend_in = source_strip.blend_in
                     target_strip.blend_out = source_strip.blend_out
                     
+                    index.add(target_strip.frame_start, target_strip.frame_end, target_strip)
                     strips_copied += 1
         
-        self.report({'INFO'}, f"Created {tracks_created} tracks, copied {strips_copied} shape key strips to {len(target_meshes)} meshes")
+        self.report({'INFO'}, f"Created {tracks_created} tracks, copied {strips_copied} shape key strips to {len(target_meshes)} meshes ({copies.summary()})")
         return {'FINISHED'}
     
     def get_unique_track_name(self, shape_keys, base_name):
@@ -382,13 +436,12 @@ class AH_TransferShapeKeyNLA(bpy.types.Operator):
         
         return f"{prefixed_name}_{counter:03d}"
     
-    def get_next_available_frame(self, track):
-        """Find the next available frame after existing strips"""
-        if not track.strips:
+    def get_next_available_frame(self, index):
+        """Find the next available frame after the strips of an indexed track"""
+        if not len(index):
             return 1
         
-        latest_end = max(strip.frame_end for strip in track.strips)
-        return int(latest_end) + 10  # 10 frame gap
+        return int(index.last_end) + 10  # 10 frame gap
     
     def invoke(self, context, event):
         return context.window_manager.invoke_props_dialog(self, width=350)
@@ -430,6 +483,7 @@ class AH_TransferShapeKeyNLA(bpy.types.Operator):
         
         layout.prop(self, "preserve_timing")
         layout.prop(self, "mute_new_tracks")
+        layout.prop(self, "action_mode")
         
 class AH_CleanupAppendedCharacter(bpy.types.Operator):
     """Remove appended character after transferring NLA data"""
@@ -460,4 +514,277 @@ class AH_CleanupAppendedCharacter(bpy.types.Operator):
             bpy.data.objects.remove(obj, do_unlink=True)
         
         self.report({'INFO'}, f"Removed {len(objects_to_delete)} objects")
-        return {'FINISHED'}
\ No newline at end of file
+        return {'FINISHED'}
+
+
+class AH_ExportNLALayout(bpy.types.Operator):
+    """Write the NLA layout of the selected objects to a JSON manifest"""
+    bl_idname = "anim.export_nla_layout"
+    bl_label = "Export NLA Layout"
+    bl_description = "Save every NLA track and strip of the selected objects (and their shape keys) to a JSON manifest"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    embed_in_file: bpy.props.BoolProperty(
+        name="Embed in .blend",
+        description=f"Also store the layout as the '{LAYOUT_TEXT_NAME}' text so other files can load it "
+                    "together with the actions (save the file afterwards)",
+        default=True
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return bool(context.selected_objects)
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            base = bpy.path.display_name_from_filepath(bpy.data.filepath) or "untitled"
+            self.filepath = f"{base}{LAYOUT_FILE_SUFFIX}"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        layout = layout_of(context.selected_objects)
+        if not layout["stacks"]:
+            self.report({'WARNING'}, "Selected objects have no NLA tracks")
+            return {'CANCELLED'}
+
+        text = dumps_layout(layout)
+        path = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), ".json")
+        try:
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(text)
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not write manifest: {str(e)}")
+            return {'CANCELLED'}
+        if self.embed_in_file:
+            block = bpy.data.texts.get(LAYOUT_TEXT_NAME) or bpy.data.texts.new(LAYOUT_TEXT_NAME)
+            block.from_string(text)
+
+        strip_count = sum(len(t["strips"]) for entry in layout["stacks"] for t in entry["tracks"])
+        self.report({'INFO'}, f"Exported {strip_count} strips from {len(layout['stacks'])} stacks to {path}")
+        return {'FINISHED'}
+
+
+class AH_ImportNLALayout(bpy.types.Operator):
+    """Rebuild an NLA layout from a JSON manifest using actions already in the file"""
+    bl_idname = "anim.import_nla_layout"
+    bl_label = "Import NLA Layout"
+    bl_description = "Recreate NLA tracks and strips from a JSON manifest, resolving actions by name"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    target: bpy.props.EnumProperty(
+        name="Targets",
+        items=[
+            ('NAME', "Same Names", "Apply each stack to the object with the name it was exported from"),
+            ('SELECTED', "Selected Objects", "Apply to the selected objects; a manifest with one armature "
+                                              "or one shape key stack goes to every selected object of that type"),
+        ],
+        default='NAME'
+    )
+    track_mode: bpy.props.EnumProperty(
+        name="Existing Tracks",
+        items=[
+            ('REPLACE', "Replace", "Remove tracks with the same name before rebuilding them"),
+            ('APPEND', "Append", "Add strips to tracks with the same name, skipping overlaps"),
+        ],
+        default='REPLACE'
+    )
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "target")
+        layout.prop(self, "track_mode")
+
+    def execute(self, context):
+        try:
+            with open(bpy.path.abspath(self.filepath), encoding="utf-8") as handle:
+                layout = loads_layout(handle.read())
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Could not read manifest: {str(e)}")
+            return {'CANCELLED'}
+
+        builder = LayoutBuilder({action.name: action for action in bpy.data.actions}, self.track_mode)
+        return build_layout(self, context, layout, builder)
+
+
+def build_layout(operator, context, layout, builder, prefix=""):
+    """Apply a loaded manifest with a LayoutBuilder, reporting through the operator"""
+    missing_objects = []
+    stacks = 0
+    for obj, entry in layout_targets(layout, context.selected_objects, operator.target):
+        if obj is None:
+            missing_objects.append(entry["object"])
+            continue
+        anim_data = stack_for(obj, entry["kind"], create=True)
+        if anim_data is None:
+            missing_objects.append(f"{obj.name} (no shape keys)")
+            continue
+        builder.build_stack(anim_data, entry["tracks"])
+        stacks += 1
+
+    for name in sorted(builder.missing_actions):
+        print(f"NLA layout: action not found {name}")
+    for name in missing_objects:
+        print(f"NLA layout: no target for {name}")
+    message = f"{prefix}Rebuilt {stacks} stacks: {builder.summary()}"
+    if builder.missing_actions or missing_objects:
+        message += (f"; {len(builder.missing_actions)} actions and {len(missing_objects)} "
+                    f"targets missing (see console)")
+        operator.report({'WARNING'}, message)
+    else:
+        operator.report({'INFO'}, message)
+    return {'FINISHED'} if stacks else {'CANCELLED'}
+
+
+def layout_targets(layout, selected, target):
+    """(object or None, stack entry) pairs for applying a manifest"""
+    entries = layout.get("stacks", [])
+    if target == 'NAME':
+        return [(bpy.data.objects.get(entry["object"]), entry) for entry in entries]
+
+    by_kind = {}
+    for entry in entries:
+        by_kind.setdefault(entry["kind"], []).append(entry)
+    selected_by_name = {obj.name: obj for obj in selected}
+    pairs = []
+    for kind, kind_entries in by_kind.items():
+        if kind == KIND_SHAPEKEY:
+            candidates = [obj for obj in selected if obj.type == 'MESH' and obj.data.shape_keys]
+        else:
+            candidates = [obj for obj in selected if obj.type == 'ARMATURE'] or list(selected)
+        if len(kind_entries) == 1:
+            pairs.extend((obj, kind_entries[0]) for obj in candidates)
+        else:
+            pairs.extend((selected_by_name.get(entry["object"]), entry) for entry in kind_entries)
+    return pairs
+
+
+class AH_LoadActionsFromBlend(bpy.types.Operator):
+    """Load only the actions of an NLA layout from another .blend and rebuild its tracks"""
+    bl_idname = "anim.load_actions_from_blend"
+    bl_label = "Load Actions from .blend"
+    bl_description = ("Read just the action datablocks and the NLA layout from another .blend file and "
+                      "rebuild the tracks on the targets, without appending the character")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.blend", options={'HIDDEN'})
+
+    target: bpy.props.EnumProperty(
+        name="Targets",
+        items=[
+            ('SELECTED', "Selected Objects", "Apply to the selected objects; a layout with one armature "
+                                              "or one shape key stack goes to every selected object of that type"),
+            ('NAME', "Same Names", "Apply each stack to the object with the name it has in the source file"),
+        ],
+        default='SELECTED'
+    )
+    track_mode: bpy.props.EnumProperty(
+        name="Existing Tracks",
+        items=[
+            ('REPLACE', "Replace", "Remove tracks with the same name before rebuilding them"),
+            ('APPEND', "Append", "Add strips to tracks with the same name, skipping overlaps"),
+        ],
+        default='REPLACE'
+    )
+    existing_actions: bpy.props.EnumProperty(
+        name="Existing Actions",
+        items=[
+            ('REUSE', "Reuse", "Use actions of the same name already in this file instead of loading them again"),
+            ('LOAD', "Load Anyway", "Always load the source actions, Blender renames them on conflicts"),
+        ],
+        default='REUSE'
+    )
+    link: bpy.props.BoolProperty(
+        name="Link",
+        description="Link the actions from the source file instead of appending them",
+        default=False
+    )
+    action_filter: bpy.props.StringProperty(
+        name="Action Filter",
+        description="Without a layout in the source, load the actions whose name contains this text",
+        default="SPEECH"
+    )
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "target")
+        layout.prop(self, "track_mode")
+        layout.prop(self, "existing_actions")
+        layout.prop(self, "link")
+        layout.prop(self, "action_filter")
+
+    def execute(self, context):
+        path = bpy.path.abspath(self.filepath)
+        if not os.path.isfile(path) or not path.lower().endswith(".blend"):
+            self.report({'ERROR'}, "Choose a .blend file")
+            return {'CANCELLED'}
+        if bpy.data.filepath and os.path.normcase(path) == os.path.normcase(bpy.path.abspath(bpy.data.filepath)):
+            self.report({'ERROR'}, "Choose another file than the open one")
+            return {'CANCELLED'}
+
+        try:
+            layout = read_source_layout(path)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Could not read the source layout: {str(e)}")
+            return {'CANCELLED'}
+
+        local = {action.name: action for action in bpy.data.actions if action.library is None}
+        needed = layout_action_names(layout) if layout else None
+        with bpy.data.libraries.load(path, link=self.link) as (data_from, data_to):
+            available = set(data_from.actions)
+            if needed is None:
+                keyword = self.action_filter.strip().lower()
+                needed = {name for name in available if keyword in name.lower()}
+            wanted = sorted(name for name in needed if name in available and
+                            not (self.existing_actions == 'REUSE' and name in local))
+            data_to.actions = wanted
+        loaded = {name: action for name, action in zip(wanted, data_to.actions) if action is not None}
+
+        prefix = f"Loaded {len(loaded)} actions from {os.path.basename(path)}. "
+        if layout is None:
+            # Nothing uses them yet, keep them through the next save
+            for action in loaded.values():
+                if action.library is None:
+                    action.use_fake_user = True
+            self.report({'WARNING'} if not loaded else {'INFO'},
+                        prefix + f"No NLA layout in the source ({LAYOUT_TEXT_NAME} text or "
+                                 f"{LAYOUT_FILE_SUFFIX} file), only actions were loaded")
+            return {'FINISHED'} if loaded else {'CANCELLED'}
+
+        actions = {name: local[name] for name in needed if name in local}
+        actions.update(loaded)
+        return build_layout(self, context, layout, LayoutBuilder(actions, self.track_mode), prefix)
+
+
+def read_source_layout(path):
+    """NLA layout of another .blend: its embedded layout text, else a manifest next to it, else None"""
+    with bpy.data.libraries.load(path, link=False) as (data_from, data_to):
+        embedded = LAYOUT_TEXT_NAME in data_from.texts
+        if embedded:
+            data_to.texts = [LAYOUT_TEXT_NAME]
+    if embedded and data_to.texts and data_to.texts[0] is not None:
+        block = data_to.texts[0]
+        content = block.as_string()
+        bpy.data.texts.remove(block)
+        return loads_layout(content)
+
+    sidecar = os.path.splitext(path)[0] + LAYOUT_FILE_SUFFIX
+    if os.path.isfile(sidecar):
+        with open(sidecar, encoding="utf-8") as handle:
+            return loads_layout(handle.read())
+    return None
@@ -0,0 +1,89 @@
+import time
+
+import bpy
+
+from ..utils.pop_detector import boundary_spikes, channel_label
+
+
+class AH_DetectHeadPops(bpy.types.Operator):
+    """Find velocity and acceleration spikes of the NLA result at strip boundaries"""
+    bl_idname = "anim.detect_head_pops"
+    bl_label = "Detect Head Pops"
+    bl_description = "Sample the NLA result around every strip boundary of the selected objects and list the worst pops"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return len(context.selected_objects) > 0
+
+    def execute(self, context):
+        props = context.scene.ah_pops
+        start = time.perf_counter()
+
+        stacks = []
+        for obj in context.selected_objects:
+            if obj.type == 'ARMATURE' and obj.animation_data:
+                stacks.append(('OBJECT', obj, obj.animation_data))
+            elif obj.type == 'MESH' and obj.data.shape_keys and obj.data.shape_keys.animation_data:
+                stacks.append(('KEY', obj, obj.data.shape_keys.animation_data))
+        if not stacks:
+            self.report({'WARNING'}, "No selected armatures or shape key meshes with animation")
+            return {'CANCELLED'}
+
+        found = []
+        for owner_type, obj, anim_data in stacks:
+            for spike in boundary_spikes(anim_data, props.window, props.min_magnitude):
+                found.append((spike, owner_type, obj.name))
+        found.sort(key=lambda row: row[0][0], reverse=True)
+
+        props.results.clear()
+        for (magnitude, velocity, frame, data_path, index), owner_type, owner_name in found[:props.max_results]:
+            item = props.results.add()
+            item.name = channel_label(data_path, index)
+            item.owner_type = owner_type
+            item.owner_name = owner_name
+            item.data_path = data_path
+            item.array_index = index
+            item.frame = frame
+            item.magnitude = magnitude
+            item.velocity = velocity
+        props.active_index = 0
+
+        elapsed = time.perf_counter() - start
+        self.report({'INFO'}, f"Found {len(found)} spikes on {len(stacks)} stacks in {elapsed:.2f}s, "
+                              f"listing {len(props.results)}")
+        return {'FINISHED'}
+
+
+class AH_JumpToPop(bpy.types.Operator):
+    """Go to a listed pop: set the frame and make its bone or shape key active"""
+    bl_idname = "anim.jump_to_pop"
+    bl_label = "Jump to Pop"
+    bl_description = "Set the current frame to the pop and make its bone or shape key active"
+    bl_options = {'REGISTER'}
+
+    index: bpy.props.IntProperty(
+        name="Index",
+        description="Result to jump to, -1 for the active row",
+        default=-1
+    )
+
+    def execute(self, context):
+        props = context.scene.ah_pops
+        index = props.active_index if self.index < 0 else self.index
+        if not 0 <= index < len(props.results):
+            self.report({'WARNING'}, "No pop selected")
+            return {'CANCELLED'}
+        item = props.results[index]
+        context.scene.frame_set(item.frame)
+
+        obj = bpy.data.objects.get(item.owner_name)
+        if obj is not None and '["' in item.data_path:
+            name = item.data_path.split('"')[1]
+            if item.owner_type == 'OBJECT' and name in obj.data.bones:
+                obj.data.bones.active = obj.data.bones[name]
+            elif item.owner_type == 'KEY':
+                key_index = obj.data.shape_keys.key_blocks.find(name)
+                if key_index >= 0:
+                    obj.active_shape_key_index = key_index
+        return {'FINISHED'}
@@ -1,5 +1,8 @@
 import bpy
 
+from .Facial_auto_processor import FacialAnimationProcessor
+from ..utils.boundary_index import boundary_frames, next_boundary, previous_boundary
+
 class AH_SnapPlayheadToStrip(bpy.types.Operator):
     """Snap the playhead to the selected audio or NLA strip for easier animation syncing"""
     bl_idname = "animation.snap_playhead_to_strip"
@@ -35,4 +38,41 @@ class AH_SnapPlayheadToStrip(bpy.types.Operator):
             return {'FINISHED'}
         else:
             self.report({'WARNING'}, "No audio or NLA strip selected. Select a strip in the Sequencer or NLA editor.")
-            return {'CANCELLED'}
\ No newline at end of file
+            return {'CANCELLED'}
+
+
+class AH_JumpToStripBoundary(bpy.types.Operator):
+    """Move the playhead to the next or previous audio/NLA strip start or end"""
+    bl_idname = "anim.jump_to_strip_boundary"
+    bl_label = "Jump to Strip Boundary"
+    bl_description = "Jump to the next or previous sound or NLA strip boundary, filtered by character"
+    bl_options = {'REGISTER'}
+
+    direction: bpy.props.EnumProperty(
+        name="Direction",
+        items=[
+            ('NEXT', "Next", "Next boundary after the playhead"),
+            ('PREVIOUS', "Previous", "Last boundary before the playhead"),
+        ],
+        default='NEXT'
+    )
+
+    def execute(self, context):
+        scene = context.scene
+        nav = scene.ah_nav
+        frames = boundary_frames(scene, FacialAnimationProcessor().character_code, nav.character,
+                                 nav.include_audio, nav.include_nla, nav.edge)
+        if not len(frames):
+            self.report({'WARNING'}, "No strip boundaries match the navigation filter")
+            return {'CANCELLED'}
+
+        if self.direction == 'NEXT':
+            frame = next_boundary(frames, scene.frame_current)
+        else:
+            frame = previous_boundary(frames, scene.frame_current)
+        if frame is None:
+            self.report({'INFO'}, "No more strip boundaries in that direction")
+            return {'CANCELLED'}
+
+        scene.frame_current = int(frame)
+        return {'FINISHED'}
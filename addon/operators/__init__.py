@@ -15,7 +15,7 @@ from .NLA_action import AH_DuplicateSelectedBonesAction
 from .Knot import AH_Knot
 from .Delete_actions import AH_DeleteActions
 from .Facial_cleanup import AH_RenameAndCleanup
-from .Snap_to_audio import AH_SnapPlayheadToStrip
+from .Snap_to_audio import AH_SnapPlayheadToStrip, AH_JumpToStripBoundary
 from .Mirror_keys import AH_MirrorBoneKeyframes
 from.AH_inside import AH_inside
 from.AH_world import AH_world
@@ -26,10 +26,23 @@ from.Offset import AH_offset
 from.offset_cleanup import AH_offset_cleanup
 from.Facial_auto_processor import AH_StartAutoProcessing, AH_StopAutoProcessing, AH_AutoFacialProcessor, AH_ClearProcessedActions, AH_ToggleAutoCleanup, AH_SetLanguageSuffix
 from.BakeToBones import AH_BakeToBones
-from.NLA_transfer import AH_TransferNLAStrips, AH_TransferShapeKeyNLA, AH_CleanupAppendedCharacter, AH_TransferShapeKeyNLA
+from.NLA_transfer import AH_TransferNLAStrips, AH_TransferShapeKeyNLA, AH_CleanupAppendedCharacter, AH_TransferShapeKeyNLA, AH_ExportNLALayout, AH_ImportNLALayout, AH_LoadActionsFromBlend
 from.NLA_smoothing import AH_NLASmoothTransitions, AH_NLACleanTransitions
-from.Audio_NLA_consolidation import AH_ConsolidateAudioNLA
+from.Audio_NLA_consolidation import AH_ConsolidateAudioNLA, AH_ApplyConsolidationPlan, AH_ClearConsolidationPlan
 from.nla_duplicate_track import AH_NLA_DuplicateTrack
+from.Action_prune import AH_PruneStaticChannels
+from.Action_resample import AH_ResampleActions
+from.Action_archive import AH_ArchiveActions, AH_RehydrateActions, AH_SearchActionArchive
+from.Action_stats import AH_RefreshActionStats
+from.Chain_offset import AH_ChainTimeOffset
+from.NLA_flatten import AH_FlattenNLAStack, AH_FlattenConsolidatedSpeech
+from.Audio_analysis import AH_AnalyzeAudio
+from.Pop_detector import AH_DetectHeadPops, AH_JumpToPop
+from.Lip_sync_qc import AH_DetectLipSyncDrift, AH_ApplyLipSyncOffsets
+from.Cue_sheet_import import AH_ImportCueSheet
+from.Batch_retime import AH_BatchRetimeStrips
+from.NLA_compaction import AH_CompactNLATracks
+from.NLA_profiler import AH_ProfileNLAEvaluation
 # Define all classes that should be registered
 classes = (
     AH_AnimationBake,
@@ -46,6 +59,7 @@ classes = (
     AH_DeleteActions,
     AH_RenameAndCleanup,
     AH_SnapPlayheadToStrip,
+    AH_JumpToStripBoundary,
     AH_MirrorBoneKeyframes,
     AH_inside,
     AH_world,
@@ -67,7 +81,30 @@ classes = (
     AH_NLASmoothTransitions,
     AH_NLACleanTransitions,
     AH_ConsolidateAudioNLA,
+    AH_ApplyConsolidationPlan,
+    AH_ClearConsolidationPlan,
     AH_NLA_DuplicateTrack,
+    AH_PruneStaticChannels,
+    AH_ResampleActions,
+    AH_ArchiveActions,
+    AH_RehydrateActions,
+    AH_SearchActionArchive,
+    AH_RefreshActionStats,
+    AH_ChainTimeOffset,
+    AH_FlattenNLAStack,
+    AH_FlattenConsolidatedSpeech,
+    AH_AnalyzeAudio,
+    AH_DetectLipSyncDrift,
+    AH_ApplyLipSyncOffsets,
+    AH_DetectHeadPops,
+    AH_JumpToPop,
+    AH_ImportCueSheet,
+    AH_ExportNLALayout,
+    AH_ImportNLALayout,
+    AH_LoadActionsFromBlend,
+    AH_BatchRetimeStrips,
+    AH_CompactNLATracks,
+    AH_ProfileNLAEvaluation,
 )
 
 def _safe_register(cls):
@@ -1,5 +1,7 @@
 import bpy
 
+from ..utils.chain_offset import ROTATION_PROPS, object_fcurves, offset_fcurves
+
 class AH_ShoulderLock(bpy.types.Operator):
     """Creates rotation-locked controls for shoulder bones in FK chains"""
     bl_idname = "shoulder.lock"
@@ -89,15 +91,7 @@ class AH_ShoulderLock(bpy.types.Operator):
                     
                 action = empty.animation_data.action
                 # Apply cycles modifier and offset to rotation curves
-                for fcurve in action.fcurves:
-                    if fcurve.data_path == "rotation_euler":
-                        # Add cycles modifier
-                        cycles_mod = fcurve.modifiers.new('CYCLES')
-                        
-                        # Offset keyframes by 2 frames
-                        for keyframe in fcurve.keyframe_points:
-                            keyframe.co.x += 2
-                        fcurve.update()
+                offset_fcurves(object_fcurves(action, ROTATION_PROPS), 2.0, use_cycles=True)
             
             self.report({'INFO'}, f"Created shoulder lock controls for {len(created_empties)} bones with 2-frame offset.")
             return {'FINISHED'}
@@ -2,6 +2,9 @@ import bpy
 from bpy.types import Operator
 from bpy.props import BoolProperty, IntProperty, StringProperty
 
+from ..utils.nla_cow import mark_copy_on_write, private_copy
+from ..utils.nla_index import TrackIndex
+
 class AH_NLA_DuplicateTrack(Operator):
     """Duplicate the entire NLA track (from active track or selected strip)."""
     bl_idname = "animhelper.nla_duplicate_track"
@@ -13,6 +16,11 @@ class AH_NLA_DuplicateTrack(Operator):
         description="Create new Actions for each strip (independent copy)",
         default=True,
     )
+    copy_on_write: BoolProperty(
+        name="Copy on Write",
+        description="Share the source actions until a strip is tweaked, then give it its own copy",
+        default=True,
+    )
     frame_offset: IntProperty(
         name="Frame Offset",
         description="Shift the duplicated track in time (frames)",
@@ -47,10 +55,7 @@ class AH_NLA_DuplicateTrack(Operator):
 
     @staticmethod
     def _duplicate_action(src_action, suffix):
-        new_action = src_action.copy()
-        new_action.name = f"{src_action.name}{suffix}"
-        new_action.use_fake_user = True
-        return new_action
+        return private_copy(src_action, suffix)
 
     @staticmethod
     def _find_track_of_strip(obj, strip):
@@ -91,7 +96,8 @@ class AH_NLA_DuplicateTrack(Operator):
         raise RuntimeError("Select any strip in the track you want to duplicate (or make a track active).")
 
     @classmethod
-    def _duplicate_track(cls, context, duplicate_actions=True, frame_offset=0, name_suffix=".dup"):
+    def _duplicate_track(cls, context, duplicate_actions=True, frame_offset=0, name_suffix=".dup",
+                         copy_on_write=False):
         obj = context.active_object
         if not obj:
             raise RuntimeError("No active object.")
@@ -109,9 +115,13 @@ class AH_NLA_DuplicateTrack(Operator):
         skipped_meta = 0
         skipped_other = 0
 
-        for s in sorted(src_track.strips, key=lambda x: x.frame_start):
+        for s in TrackIndex.from_track(src_track).items:
             if s.type == 'CLIP' and s.action:
-                action_to_use = cls._duplicate_action(s.action, name_suffix) if duplicate_actions else s.action
+                # Copy-on-write strips share the source action until they are edited
+                copy_now = duplicate_actions and not copy_on_write
+                action_to_use = cls._duplicate_action(s.action, name_suffix) if copy_now else s.action
+                if duplicate_actions and copy_on_write:
+                    mark_copy_on_write(s.action, name_suffix)
                 new_start = s.frame_start + frame_offset
 
                 # NlaTrack.strips.new requires int start; restore float afterward
@@ -134,6 +144,7 @@ class AH_NLA_DuplicateTrack(Operator):
             dst_track, copied, skipped_meta, skipped_other = self._duplicate_track(
                 context,
                 duplicate_actions=self.duplicate_actions,
+                copy_on_write=self.copy_on_write,
                 frame_offset=self.frame_offset,
                 name_suffix=self.name_suffix
             )
@@ -142,6 +153,8 @@ class AH_NLA_DuplicateTrack(Operator):
             return {'CANCELLED'}
 
         msg = f"Created '{dst_track.name}': {copied} strip(s) copied"
+        if self.duplicate_actions and self.copy_on_write:
+            msg += " (actions copied on first tweak)"
         if skipped_meta:  msg += f", {skipped_meta} META skipped"
         if skipped_other: msg += f", {skipped_other} non-CLIP skipped"
         self.report({'INFO'}, msg)
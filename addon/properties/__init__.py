@@ -4,6 +4,13 @@ from .bake_properties import AH_BakeProperties
 from .facial_properties import AH_FacialProperties
 from .action_properties import AH_ActionProperties
 from .ah_nla_props import AH_NLAProperties   # <-- fixed spacing
+from .archive_properties import AH_ArchiveEntry, AH_ArchiveProperties
+from .stats_properties import AH_ActionStatsItem, AH_ActionStatsProperties
+from .lipsync_properties import AH_LipSyncResult, AH_LipSyncProperties
+from .pop_properties import AH_PopResult, AH_PopDetectorProperties
+from .nav_properties import AH_BoundaryNavProperties
+from .profile_properties import AH_ProfileResult, AH_ProfileWarning, AH_NLAProfileProperties
+from .consolidation_properties import AH_AudioMatchItem, AH_ConsolidationPlanItem, AH_ConsolidationProperties
 from bpy.props import PointerProperty
 
 property_classes = (
@@ -11,6 +18,21 @@ property_classes = (
     AH_FacialProperties,
     AH_ActionProperties,
     AH_NLAProperties,
+    AH_ArchiveEntry,
+    AH_ArchiveProperties,
+    AH_ActionStatsItem,
+    AH_ActionStatsProperties,
+    AH_LipSyncResult,
+    AH_LipSyncProperties,
+    AH_AudioMatchItem,
+    AH_ConsolidationPlanItem,
+    AH_ConsolidationProperties,
+    AH_PopResult,
+    AH_PopDetectorProperties,
+    AH_BoundaryNavProperties,
+    AH_ProfileResult,
+    AH_ProfileWarning,
+    AH_NLAProfileProperties,
 )
 
 # host → [(attr_name, PropertyGroup)]
@@ -21,6 +43,13 @@ _POINTERS = {
         ("Dprops", AH_ActionProperties),
         ("Factor", AH_ActionProperties),   # if you really want both names
         ("ah_nla", AH_NLAProperties),      
+        ("ah_archive", AH_ArchiveProperties),
+        ("ah_stats", AH_ActionStatsProperties),
+        ("ah_lipsync", AH_LipSyncProperties),
+        ("ah_consolidation", AH_ConsolidationProperties),
+        ("ah_pops", AH_PopDetectorProperties),
+        ("ah_nav", AH_BoundaryNavProperties),
+        ("ah_profile", AH_NLAProfileProperties),
     ]
 }
 
@@ -5,5 +5,6 @@ from bpy.props import BoolProperty, IntProperty, StringProperty
 
 class AH_NLAProperties(PropertyGroup):
     duplicate_actions: BoolProperty(default=True, name="Duplicate Actions")
+    copy_on_write: BoolProperty(default=True, name="Copy on Write")
     frame_offset: IntProperty(default=0, name="Frame Offset")
     name_suffix: StringProperty(default=".dupe", name="Name Suffix")
@@ -0,0 +1,27 @@
+import bpy
+import bpy.props
+
+class AH_ArchiveEntry(bpy.types.PropertyGroup):
+    """One search result from the action archive index"""
+    char_code: bpy.props.StringProperty(name="Character")
+    fcurves: bpy.props.IntProperty(name="F-Curves")
+    keys: bpy.props.IntProperty(name="Keys")
+    size_kb: bpy.props.FloatProperty(name="Size (KB)")
+    is_stub: bpy.props.BoolProperty(name="Archived", description="The action is currently a stub in this file")
+
+
+class AH_ArchiveProperties(bpy.types.PropertyGroup):
+    """Properties for the action archive"""
+    directory: bpy.props.StringProperty(
+        name="Archive Folder",
+        description="Project folder holding archived actions and their index",
+        default="//action_archive/",
+        subtype='DIR_PATH'
+    )
+    search: bpy.props.StringProperty(
+        name="Search",
+        description="Search the archive index by name (e.g. 'JOH SPEECH FR')",
+        default=""
+    )
+    results: bpy.props.CollectionProperty(type=AH_ArchiveEntry)
+    active_index: bpy.props.IntProperty(default=0)
@@ -0,0 +1,77 @@
+import bpy
+import bpy.props
+
+class AH_AudioMatchItem(bpy.types.PropertyGroup):
+    """One NLA strip / sound strip pairing found by the consolidation matcher"""
+    audio_name: bpy.props.StringProperty(name="Audio")
+    kind: bpy.props.EnumProperty(
+        items=[
+            ('RIG', "Rig", "Armature strip"),
+            ('SHAPEKEY', "Shape Keys", "Shape key strip"),
+            ('AUDIO', "Audio", "Sound strip"),
+        ],
+        default='RIG'
+    )
+    status: bpy.props.EnumProperty(
+        items=[
+            ('MATCHED', "Matched", "Strip paired with a sound strip"),
+            ('NO_AUDIO', "No Audio", "No sound strip scored high enough for this strip"),
+            ('UNUSED_AUDIO', "Unused Audio", "No NLA strip was paired with this sound strip"),
+        ],
+        default='MATCHED'
+    )
+    score: bpy.props.FloatProperty(name="Score", min=0.0, max=1.0)
+
+
+class AH_ConsolidationPlanItem(bpy.types.PropertyGroup):
+    """One planned strip move of a consolidation (name is the strip name)"""
+    char_code: bpy.props.StringProperty(name="Character")
+    kind: bpy.props.EnumProperty(
+        items=[
+            ('RIG', "Rig", "Armature strip"),
+            ('SHAPEKEY', "Shape Keys", "Shape key strip"),
+        ],
+        default='RIG'
+    )
+    owner_name: bpy.props.StringProperty(name="Object")
+    source_track: bpy.props.StringProperty(name="Source Track")
+    target_owner: bpy.props.StringProperty(name="Target Object")
+    target_track: bpy.props.StringProperty(name="Target Track")
+    frame_start: bpy.props.FloatProperty(name="Start")
+    duration: bpy.props.FloatProperty(name="Duration")
+    audio_name: bpy.props.StringProperty(name="Audio")
+    move_audio: bpy.props.BoolProperty(name="Move Audio")
+    audio_frame: bpy.props.FloatProperty(name="Audio Start")
+    status: bpy.props.EnumProperty(
+        items=[
+            ('OK', "OK", "Placed where the alignment mode wants it"),
+            ('MOVED', "Moved", "Target range was taken, placed in the next free gap"),
+            ('NO_AUDIO', "No Audio", "No audio match, placed after the previous strip"),
+        ],
+        default='OK'
+    )
+    done: bpy.props.BoolProperty(name="Done")
+    error: bpy.props.StringProperty(name="Error")
+
+
+class AH_ConsolidationProperties(bpy.types.PropertyGroup):
+    """Properties for the Audio-NLA consolidation panel"""
+    matches: bpy.props.CollectionProperty(type=AH_AudioMatchItem)
+    active_match: bpy.props.IntProperty(default=0)
+    plan: bpy.props.CollectionProperty(type=AH_ConsolidationPlanItem)
+    active_plan: bpy.props.IntProperty(default=0)
+    plan_remove_tracks: bpy.props.BoolProperty(
+        name="Delete Original Tracks",
+        description="Delete the original tracks once every planned strip is moved",
+        default=True
+    )
+    show_conflicts_only: bpy.props.BoolProperty(
+        name="Conflicts Only",
+        description="Only list planned strips that were displaced, have no audio or failed",
+        default=False
+    )
+    show_unmatched_only: bpy.props.BoolProperty(
+        name="Unmatched Only",
+        description="Only list strips and clips that were not paired",
+        default=False
+    )
@@ -0,0 +1,75 @@
+import bpy
+import bpy.props
+
+class AH_LipSyncResult(bpy.types.PropertyGroup):
+    """One analyzed facial strip of the lip-sync drift list"""
+    owner_type: bpy.props.EnumProperty(
+        items=[
+            ('OBJECT', "Object", "Strip on an armature's NLA"),
+            ('KEY', "Shape Keys", "Strip on a shape key datablock's NLA"),
+        ],
+        default='OBJECT'
+    )
+    owner_name: bpy.props.StringProperty(name="Owner")
+    track_name: bpy.props.StringProperty(name="Track")
+    strip_name: bpy.props.StringProperty(name="Strip")
+    audio_name: bpy.props.StringProperty(name="Audio")
+    char_code: bpy.props.StringProperty(name="Character")
+    frame_start: bpy.props.FloatProperty(name="Start")
+    offset: bpy.props.IntProperty(
+        name="Offset",
+        description="Frames to move the strip so the mouth follows the audio"
+    )
+    confidence: bpy.props.FloatProperty(name="Confidence", min=-1.0, max=1.0)
+    flagged: bpy.props.BoolProperty(name="Flagged")
+    apply: bpy.props.BoolProperty(
+        name="Apply",
+        description="Include this strip when applying suggested offsets",
+        default=True
+    )
+
+
+class AH_LipSyncProperties(bpy.types.PropertyGroup):
+    """Properties for the lip-sync QC panel"""
+    results: bpy.props.CollectionProperty(type=AH_LipSyncResult)
+    active_index: bpy.props.IntProperty(default=0)
+    rig_track_name: bpy.props.StringProperty(
+        name="Rig Track",
+        description="Consolidated armature track to analyze",
+        default="Main_Dialogue_Rig"
+    )
+    shapekey_track_name: bpy.props.StringProperty(
+        name="Shape Key Track",
+        description="Consolidated shape key track to analyze",
+        default="Main_Dialogue_Shapes"
+    )
+    channel_keywords: bpy.props.StringProperty(
+        name="Channels",
+        description="Comma separated bone or shape key keywords for mouth openness. Leave empty for jaw/lip/mouth defaults",
+        default=""
+    )
+    max_lag: bpy.props.IntProperty(
+        name="Search Range",
+        description="Largest drift in frames searched in each direction",
+        default=12,
+        min=1,
+        max=240
+    )
+    drift_threshold: bpy.props.IntProperty(
+        name="Flag Above",
+        description="Flag strips drifting more than this many frames",
+        default=1,
+        min=0
+    )
+    min_confidence: bpy.props.FloatProperty(
+        name="Min Confidence",
+        description="Ignore matches whose correlation is lower than this",
+        default=0.3,
+        min=0.0,
+        max=1.0
+    )
+    show_flagged_only: bpy.props.BoolProperty(
+        name="Flagged Only",
+        description="Only list strips that drift",
+        default=True
+    )
@@ -0,0 +1,29 @@
+import bpy
+import bpy.props
+
+class AH_BoundaryNavProperties(bpy.types.PropertyGroup):
+    """Filters for next/previous strip boundary navigation"""
+    character: bpy.props.StringProperty(
+        name="Character",
+        description="Only stop at strips of this character code (e.g. 'JOH'). Leave empty for all",
+        default=""
+    )
+    include_audio: bpy.props.BoolProperty(
+        name="Audio",
+        description="Stop at sound strip starts and ends",
+        default=True
+    )
+    include_nla: bpy.props.BoolProperty(
+        name="NLA",
+        description="Stop at NLA strip starts and ends",
+        default=True
+    )
+    edge: bpy.props.EnumProperty(
+        name="Edge",
+        items=[
+            ('BOTH', "Both", "Strip starts and ends"),
+            ('START', "Starts", "Strip starts only"),
+            ('END', "Ends", "Strip ends only"),
+        ],
+        default='BOTH'
+    )
@@ -0,0 +1,51 @@
+import bpy
+import bpy.props
+
+class AH_PopResult(bpy.types.PropertyGroup):
+    """One discontinuity found at a strip boundary (name is the channel label)"""
+    owner_type: bpy.props.EnumProperty(
+        items=[
+            ('OBJECT', "Object", "Armature channel"),
+            ('KEY', "Shape Keys", "Shape key channel"),
+        ],
+        default='OBJECT'
+    )
+    owner_name: bpy.props.StringProperty(name="Owner")
+    data_path: bpy.props.StringProperty(name="Data Path")
+    array_index: bpy.props.IntProperty(name="Index")
+    frame: bpy.props.IntProperty(name="Frame")
+    magnitude: bpy.props.FloatProperty(
+        name="Magnitude",
+        description="Acceleration spike per frame², in pose units (0.35 rad, 0.02 m or 0.5 shape key value)"
+    )
+    velocity: bpy.props.FloatProperty(
+        name="Velocity",
+        description="Largest speed around the boundary in pose units per frame"
+    )
+
+
+class AH_PopDetectorProperties(bpy.types.PropertyGroup):
+    """Properties for the head-pop detector"""
+    results: bpy.props.CollectionProperty(type=AH_PopResult)
+    active_index: bpy.props.IntProperty(default=0)
+    window: bpy.props.IntProperty(
+        name="Window",
+        description="Frames sampled on each side of a strip boundary",
+        default=3,
+        min=2,
+        max=24
+    )
+    min_magnitude: bpy.props.FloatProperty(
+        name="Min Magnitude",
+        description="Ignore spikes smaller than this many pose units per frame²",
+        default=0.2,
+        min=0.0,
+        max=10.0
+    )
+    max_results: bpy.props.IntProperty(
+        name="Max Results",
+        description="Number of worst spikes listed",
+        default=50,
+        min=1,
+        max=1000
+    )
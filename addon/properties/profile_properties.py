@@ -0,0 +1,73 @@
+import bpy
+import bpy.props
+
+class AH_ProfileResult(bpy.types.PropertyGroup):
+    """Evaluation cost of one NLA track or strip (name is the track or strip name)"""
+    kind: bpy.props.EnumProperty(
+        items=[
+            ('TRACK', "Track", "Whole NLA track"),
+            ('STRIP', "Strip", "Single NLA strip"),
+        ],
+        default='TRACK'
+    )
+    owner_name: bpy.props.StringProperty(name="Owner")
+    track_name: bpy.props.StringProperty(name="Track")
+    cost_ms: bpy.props.FloatProperty(
+        name="Cost",
+        description="Milliseconds per frame saved by muting it"
+    )
+    share: bpy.props.FloatProperty(
+        name="Share",
+        description="Fraction of the whole NLA evaluation cost",
+        subtype='FACTOR'
+    )
+
+
+class AH_ProfileWarning(bpy.types.PropertyGroup):
+    """Costly strip setting (name is the message)"""
+    owner_name: bpy.props.StringProperty(name="Owner")
+    track_name: bpy.props.StringProperty(name="Track")
+    strip_name: bpy.props.StringProperty(name="Strip")
+
+
+class AH_NLAProfileProperties(bpy.types.PropertyGroup):
+    """Properties for the NLA evaluation profiler"""
+    results: bpy.props.CollectionProperty(type=AH_ProfileResult)
+    active_index: bpy.props.IntProperty(default=0)
+    warnings: bpy.props.CollectionProperty(type=AH_ProfileWarning)
+    active_warning: bpy.props.IntProperty(default=0)
+
+    granularity: bpy.props.EnumProperty(
+        name="Mute",
+        items=[
+            ('TRACKS', "Tracks", "Mute each track in turn"),
+            ('STRIPS', "Strips", "Mute each strip in turn (slower)"),
+        ],
+        default='TRACKS'
+    )
+    frame_count: bpy.props.IntProperty(
+        name="Frames",
+        description="Frames sampled across the NLA range for every timing",
+        default=24,
+        min=2,
+        max=500
+    )
+    repeats: bpy.props.IntProperty(
+        name="Repeats",
+        description="Timings per configuration, the fastest one counts",
+        default=3,
+        min=1,
+        max=20
+    )
+    include_shapekeys: bpy.props.BoolProperty(
+        name="Shape Keys",
+        description="Also profile the shape key NLA of the object or the meshes parented to the rig",
+        default=True
+    )
+
+    # Last run, milliseconds per frame
+    target_name: bpy.props.StringProperty(name="Object")
+    total_ms: bpy.props.FloatProperty(name="Total")
+    nla_ms: bpy.props.FloatProperty(name="NLA")
+    drivers_ms: bpy.props.FloatProperty(name="Drivers")
+    constraints_ms: bpy.props.FloatProperty(name="Constraints")
@@ -0,0 +1,47 @@
+import bpy
+import bpy.props
+
+class AH_ActionStatsItem(bpy.types.PropertyGroup):
+    """One row of the action statistics list"""
+    char_code: bpy.props.StringProperty(name="Character")
+    fcurves: bpy.props.IntProperty(name="F-Curves")
+    keys: bpy.props.IntProperty(name="Keys")
+    memory_kb: bpy.props.FloatProperty(name="Memory (KB)")
+    eval_us: bpy.props.FloatProperty(name="Evaluation (µs/frame)")
+
+
+class AH_ActionStatsProperties(bpy.types.PropertyGroup):
+    """Properties for the action statistics panel"""
+    items: bpy.props.CollectionProperty(type=AH_ActionStatsItem)
+    active_index: bpy.props.IntProperty(default=0)
+    filter_keyword: bpy.props.StringProperty(
+        name="Keyword",
+        description="Only list actions containing this text",
+        default=""
+    )
+    filter_char_code: bpy.props.StringProperty(
+        name="Character",
+        description="Only list speech actions of this character code (e.g. 'JOH')",
+        default=""
+    )
+    sort_by: bpy.props.EnumProperty(
+        name="Sort By",
+        items=[
+            ('NAME', "Name", "Sort by action name"),
+            ('FCURVES', "F-Curves", "Sort by number of fcurves"),
+            ('KEYS', "Keys", "Sort by total keyframes"),
+            ('MEMORY', "Memory", "Sort by estimated memory"),
+            ('EVAL', "Evaluation", "Sort by measured evaluation time per frame"),
+        ],
+        default='EVAL'
+    )
+    sort_descending: bpy.props.BoolProperty(
+        name="Descending",
+        description="Most expensive first",
+        default=True
+    )
+    measure_eval: bpy.props.BoolProperty(
+        name="Measure Evaluation",
+        description="Time fcurve evaluation per action (slower first refresh)",
+        default=True
+    )
@@ -20,6 +20,14 @@ def register_addon():
     # Register UI panels
     from ..ui import register_panels
     register_panels()
+
+    # Register app handlers
+    from ..handlers import register_handlers
+    register_handlers()
+
+    # Register hotkeys
+    from ..keymaps import register_keymaps
+    register_keymaps()
     
     # Register addon preferences
 
@@ -29,7 +37,15 @@ def unregister_addon():
     
 
     
-    # Unregister UI panels first
+    # Unregister hotkeys first
+    from ..keymaps import unregister_keymaps
+    unregister_keymaps()
+
+    # Unregister app handlers
+    from ..handlers import unregister_handlers
+    unregister_handlers()
+
+    # Unregister UI panels
     from ..ui import unregister_panels
     unregister_panels()
     
@@ -6,10 +6,14 @@ from .panel2 import AH_MaterialTools
 from .panel_action_management import AH_ActionManagement
 from .panel_facial_auto import AH_FacialAutoProcessingPanel
 from.panel_nla_transfer import AH_NLATransferPanel
-from.panel_nla_smoothing import AH_NLASmoothingPanel
-from .panel_audio_nla_consolidation import AH_AudioNLAConsolidationPanel
+from.panel_nla_smoothing import AH_UL_PopResults, AH_NLASmoothingPanel
+from .panel_audio_nla_consolidation import AH_UL_AudioMatches, AH_UL_ConsolidationPlan, AH_AudioNLAConsolidationPanel
 from ..preferences import update_panel_categories
 from .ah_nla_panel import AH_PT_NLA_AnimHelper
+from .panel_action_archive import AH_UL_ArchiveEntries, AH_ActionArchivePanel
+from .panel_action_stats import AH_UL_ActionStats, AH_ActionStatsPanel
+from .panel_lipsync_qc import AH_UL_LipSyncResults, AH_LipSyncQCPanel
+from .panel_nla_profiler import AH_UL_ProfileResults, AH_UL_ProfileWarnings, AH_NLAProfilerPanel
 # Add panels to classes array
 classes = (
     AH_MaterialTools,
@@ -21,9 +25,21 @@ classes = (
     AH_ActionManagement,
     AH_FacialAutoProcessingPanel,
     AH_NLATransferPanel,
+    AH_UL_PopResults,
     AH_NLASmoothingPanel,
+    AH_UL_AudioMatches,
+    AH_UL_ConsolidationPlan,
     AH_AudioNLAConsolidationPanel,
     AH_PT_NLA_AnimHelper,
+    AH_UL_ArchiveEntries,
+    AH_ActionArchivePanel,
+    AH_UL_ActionStats,
+    AH_ActionStatsPanel,
+    AH_UL_LipSyncResults,
+    AH_LipSyncQCPanel,
+    AH_UL_ProfileResults,
+    AH_UL_ProfileWarnings,
+    AH_NLAProfilerPanel,
 )
 
 def register_panels():
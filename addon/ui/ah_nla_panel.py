@@ -29,6 +29,24 @@ class AH_PT_NLA_AnimHelper(Panel):
         op.frame_offset = 0
         op.name_suffix = ".dup"
 
+        col.separator()
+        col.label(text="Flatten")
+        col.operator("anim.flatten_nla_stack",
+                     text="Flatten NLA Stack",
+                     icon="NLA_PUSHDOWN")
+
+        col.separator()
+        col.label(text="Retime")
+        col.operator("anim.batch_retime_strips",
+                     text="Batch Retime Strips",
+                     icon="TIME")
+
+        col.separator()
+        col.label(text="Tracks")
+        col.operator("anim.compact_nla_tracks",
+                     text="Compact Tracks",
+                     icon="NLA")
+
         # Advanced (from Scene props)
         p = getattr(context.scene, "ah_nla", None)
         box = layout.box()
@@ -39,6 +57,7 @@ class AH_PT_NLA_AnimHelper(Panel):
             return
 
         row = box.row(align=True); row.prop(p, "duplicate_actions")
+        row = box.row(align=True); row.enabled = p.duplicate_actions; row.prop(p, "copy_on_write")
         row = box.row(align=True); row.prop(p, "frame_offset")
         row = box.row(align=True); row.prop(p, "name_suffix")
 
@@ -46,5 +65,6 @@ class AH_PT_NLA_AnimHelper(Panel):
                            text="Run with Advanced Settings",
                            icon="PLAY")
         run.duplicate_actions = p.duplicate_actions
+        run.copy_on_write     = p.copy_on_write
         run.frame_offset      = p.frame_offset
         run.name_suffix       = p.name_suffix
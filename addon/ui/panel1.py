@@ -18,6 +18,7 @@ from ..operators.empty_size import AH_OT_EmptySizeShrink
 from ..operators.Offset import AH_offset
 from ..operators.offset_cleanup import AH_offset_cleanup
 from..operators.BakeToBones import AH_BakeToBones
+from ..operators.Chain_offset import AH_ChainTimeOffset
 
 # Import icon utilities safely with fallback
 try:
@@ -95,6 +96,7 @@ class AH_PT_SpaceSwitching(bpy.types.Panel):
         # Shoulder Lock button in Bonus Tools
         row = box.row()
         row.operator(AH_ShoulderLock.bl_idname, icon='CONSTRAINT_BONE', text="Shoulder Lock")
+        row.operator(AH_ChainTimeOffset.bl_idname, icon='LINKED', text="Chain Offset")
         
         row = box.row()
         row.operator(AH_BakeToBones.bl_idname, icon='CONSTRAINT_BONE', text="bake to bones")
@@ -0,0 +1,60 @@
+import bpy
+from ..operators.Action_archive import AH_ArchiveActions, AH_RehydrateActions, AH_SearchActionArchive
+from ..utils.action_archive import is_stub
+
+
+class AH_UL_ArchiveEntries(bpy.types.UIList):
+    """Archive search results"""
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.label(text=item.name, icon='FILE_ARCHIVE' if item.is_stub else 'ACTION')
+        sub = row.row()
+        sub.alignment = 'RIGHT'
+        sub.label(text=f"{item.keys} keys · {item.size_kb:.0f} KB")
+
+
+class AH_ActionArchivePanel(bpy.types.Panel):
+    """Action Archive panel"""
+    bl_label = "Action Archive"
+    bl_idname = "AH_PT_ActionArchive"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'AH Helper'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.ah_archive
+
+        box = layout.box()
+        box.label(text="Archive", icon='FILE_ARCHIVE')
+        box.prop(props, "directory", text="")
+        stub_count = sum(1 for action in bpy.data.actions if is_stub(action))
+        col = box.column(align=True)
+        col.scale_y = 0.8
+        col.label(text=f"Stubs in this file: {stub_count}")
+
+        row = box.row(align=True)
+        row.operator(AH_ArchiveActions.bl_idname, text="Archive Actions", icon='EXPORT')
+        op = row.operator(AH_RehydrateActions.bl_idname, text="Load All", icon='IMPORT')
+        op.mode = 'ALL'
+        op = box.operator(AH_RehydrateActions.bl_idname, text="Load Stubs of Active Object", icon='OBJECT_DATA')
+        op.mode = 'ACTIVE_OBJECT'
+
+        box = layout.box()
+        box.label(text="Search Index", icon='VIEWZOOM')
+        row = box.row(align=True)
+        row.prop(props, "search", text="")
+        row.operator(AH_SearchActionArchive.bl_idname, text="", icon='VIEWZOOM')
+        box.template_list("AH_UL_ArchiveEntries", "", props, "results", props, "active_index", rows=5)
+        op = box.operator(AH_RehydrateActions.bl_idname, text="Load Selected", icon='IMPORT')
+        op.mode = 'RESULT'
+
+        col = box.column(align=True)
+        col.scale_y = 0.8
+        col.label(text="• Stubs reload when used in the NLA or tweaked")
+
+    def draw_header(self, context):
+        layout = self.layout
+        layout.label(icon='FILE_ARCHIVE')
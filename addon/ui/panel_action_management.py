@@ -3,9 +3,10 @@ import bpy.props
 
 # Import operators
 from ..operators.Delete_actions import AH_DeleteActions
-from ..operators.Snap_to_audio import AH_SnapPlayheadToStrip
+from ..operators.Snap_to_audio import AH_SnapPlayheadToStrip, AH_JumpToStripBoundary
 from ..operators.Mirror_keys import AH_MirrorBoneKeyframes
 from ..operators.Facial_cleanup import AH_RenameAndCleanup
+from ..operators.Action_prune import AH_PruneStaticChannels
 
 
 class AH_ActionManagement(bpy.types.Panel):
@@ -26,7 +27,17 @@ class AH_ActionManagement(bpy.types.Panel):
         box.label(text="Action Management")
         box.prop(deleteprops, "keyword")
         box.operator(AH_DeleteActions.bl_idname, text="Delete Actions", icon='TRASH')
+        box.operator(AH_PruneStaticChannels.bl_idname, text="Prune Static Channels", icon='FCURVE')
         box.operator(AH_SnapPlayheadToStrip.bl_idname, text="Snap to Audio", icon='SOUND')
+        nav = scene.ah_nav
+        row = box.row(align=True)
+        row.operator(AH_JumpToStripBoundary.bl_idname, text="Prev Boundary", icon='TRIA_LEFT').direction = 'PREVIOUS'
+        row.operator(AH_JumpToStripBoundary.bl_idname, text="Next Boundary", icon='TRIA_RIGHT').direction = 'NEXT'
+        row = box.row(align=True)
+        row.prop(nav, "character", text="")
+        row.prop(nav, "include_audio", toggle=True)
+        row.prop(nav, "include_nla", toggle=True)
+        box.prop(nav, "edge", expand=True)
         box.operator(AH_MirrorBoneKeyframes.bl_idname, text="Mirror Selected Keys", icon='MOD_MIRROR')
         
         # Facial animation section
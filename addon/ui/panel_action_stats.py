@@ -0,0 +1,99 @@
+import bpy
+import numpy as np
+from ..operators.Action_stats import AH_RefreshActionStats
+
+# sort_by enum value -> (item attribute, foreach_get dtype)
+_SORT_FIELDS = {
+    'FCURVES': ("fcurves", np.int32),
+    'KEYS': ("keys", np.int32),
+    'MEMORY': ("memory_kb", np.float32),
+    'EVAL': ("eval_us", np.float32),
+}
+
+
+class AH_UL_ActionStats(bpy.types.UIList):
+    """Per-action statistics, filtered and sorted from the scene settings"""
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.label(text=item.name, icon='ACTION')
+        sub = row.row(align=True)
+        sub.alignment = 'RIGHT'
+        sub.label(text=f"{item.fcurves} fc")
+        sub.label(text=f"{item.keys} keys")
+        sub.label(text=f"{item.memory_kb:.0f} KB")
+        sub.label(text=f"{item.eval_us:.0f} µs")
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        props = context.scene.ah_stats
+        count = len(items)
+
+        flags = [self.bitflag_filter_item] * count
+        keyword = props.filter_keyword.strip().lower()
+        char_code = props.filter_char_code.strip().upper()
+        if keyword or char_code:
+            for i, item in enumerate(items):
+                if keyword and keyword not in item.name.lower():
+                    flags[i] = 0
+                elif char_code and item.char_code != char_code:
+                    flags[i] = 0
+
+        if props.sort_by == 'NAME':
+            order = np.array(bpy.types.UI_UL_list.sort_items_by_name(items, "name"), dtype=np.int64)
+            if props.sort_descending and count:
+                order = count - 1 - order
+        else:
+            attr, dtype = _SORT_FIELDS[props.sort_by]
+            values = np.empty(count, dtype=dtype)
+            items.foreach_get(attr, values)
+            ranking = np.argsort(values, kind='stable')
+            if props.sort_descending:
+                ranking = ranking[::-1]
+            order = np.empty(count, dtype=np.int64)
+            order[ranking] = np.arange(count)
+
+        return flags, order.tolist()
+
+
+class AH_ActionStatsPanel(bpy.types.Panel):
+    """Action Statistics panel"""
+    bl_label = "Action Statistics"
+    bl_idname = "AH_PT_ActionStats"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'AH Helper'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.ah_stats
+
+        row = layout.row(align=True)
+        row.operator(AH_RefreshActionStats.bl_idname, text="Refresh", icon='FILE_REFRESH')
+        row.prop(props, "measure_eval", text="", icon='TIME')
+
+        box = layout.box()
+        row = box.row(align=True)
+        row.prop(props, "filter_keyword", text="", icon='VIEWZOOM')
+        row.prop(props, "filter_char_code", text="Char")
+        row = box.row(align=True)
+        row.prop(props, "sort_by", text="")
+        row.prop(props, "sort_descending", text="", icon='SORT_DESC' if props.sort_descending else 'SORT_ASC')
+
+        layout.template_list("AH_UL_ActionStats", "", props, "items", props, "active_index", rows=8)
+
+        if props.items:
+            col = layout.column(align=True)
+            col.scale_y = 0.8
+            col.label(text=f"{len(props.items)} actions listed")
+            if 0 <= props.active_index < len(props.items):
+                item = props.items[props.active_index]
+                col.label(text=f"{item.name}: {item.keys} keys in {item.fcurves} fcurves")
+                col.label(text=f"~{item.memory_kb:.1f} KB, {item.eval_us:.1f} µs per frame")
+        else:
+            layout.label(text="Press Refresh to measure actions", icon='INFO')
+
+    def draw_header(self, context):
+        layout = self.layout
+        layout.label(icon='SORTTIME')
@@ -1,5 +1,72 @@
 import bpy
-from ..operators.Audio_NLA_consolidation import AH_ConsolidateAudioNLA
+from ..operators.Audio_NLA_consolidation import (
+    AH_ConsolidateAudioNLA,
+    AH_ApplyConsolidationPlan,
+    AH_ClearConsolidationPlan,
+)
+from ..operators.NLA_flatten import AH_FlattenConsolidatedSpeech
+from ..operators.Audio_analysis import AH_AnalyzeAudio
+
+_MATCH_ICONS = {
+    'MATCHED': 'LINKED',
+    'NO_AUDIO': 'ERROR',
+    'UNUSED_AUDIO': 'SOUND',
+}
+
+
+class AH_UL_AudioMatches(bpy.types.UIList):
+    """NLA strip / audio pairing of the last consolidation or preview"""
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.label(text=item.name or "—", icon=_MATCH_ICONS[item.status])
+        row.label(text=item.audio_name or "—")
+        if item.status == 'MATCHED':
+            sub = row.row(align=True)
+            sub.alignment = 'RIGHT'
+            sub.label(text=f"{item.score:.2f}")
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        flags = [self.bitflag_filter_item] * len(items)
+        if context.scene.ah_consolidation.show_unmatched_only:
+            flags = [self.bitflag_filter_item if item.status != 'MATCHED' else 0 for item in items]
+        return flags, []
+
+
+_PLAN_ICONS = {
+    'OK': 'NLA',
+    'MOVED': 'ERROR',
+    'NO_AUDIO': 'MUTE_IPO_ON',
+}
+
+
+class AH_UL_ConsolidationPlan(bpy.types.UIList):
+    """Planned strip moves, conflicts highlighted"""
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.alert = bool(item.error) or item.status != 'OK'
+        if item.done:
+            icon = 'CHECKMARK'
+        elif item.error:
+            icon = 'CANCEL'
+        else:
+            icon = _PLAN_ICONS[item.status]
+        row.label(text=item.name, icon=icon)
+        sub = row.row(align=True)
+        sub.alignment = 'RIGHT'
+        if item.char_code:
+            sub.label(text=item.char_code)
+        sub.label(text=f"{item.frame_start:.0f}")
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        flags = [self.bitflag_filter_item] * len(items)
+        if context.scene.ah_consolidation.show_conflicts_only:
+            flags = [self.bitflag_filter_item if item.status != 'OK' or item.error else 0 for item in items]
+        return flags, []
+
 
 class AH_AudioNLAConsolidationPanel(bpy.types.Panel):
     """Audio-NLA Consolidation panel"""
@@ -37,6 +104,8 @@ class AH_AudioNLAConsolidationPanel(bpy.types.Panel):
             col.label(text="ℹ️ No audio (will use even spacing)", icon='INFO')
         else:
             col.label(text="✅ Audio available for alignment", icon='CHECKMARK')
+            row = box.row()
+            row.operator(AH_AnalyzeAudio.bl_idname, text="Analyze Audio", icon='SOUND')
         
         if nla_info['total_tracks'] > 1:
             col.label(text="✅ Multiple tracks - consolidation ready", icon='CHECKMARK')
@@ -79,6 +148,16 @@ class AH_AudioNLAConsolidationPanel(bpy.types.Panel):
             op.alignment_mode = 'EVEN_SPACING'
             op.remove_original_tracks = True
             
+            # Every character in one pass, each with its own audio
+            row = col.row()
+            op = row.operator(AH_ConsolidateAudioNLA.bl_idname, 
+                            text="All Characters", 
+                            icon='COMMUNITY')
+            op.target_mode = 'ALL_CHARACTERS'
+            op.alignment_mode = 'MOVE_NLA_TO_AUDIO' if audio_count > 0 else 'EVEN_SPACING'
+            op.use_audio_filter = False
+            op.remove_original_tracks = True
+            
             # Audio alignment (only show if audio exists)
             if audio_count > 0:
                 row = col.row()
@@ -89,6 +168,71 @@ class AH_AudioNLAConsolidationPanel(bpy.types.Panel):
                 op.alignment_mode = 'MOVE_NLA_TO_AUDIO'
                 op.use_audio_filter = False
                 op.remove_original_tracks = True
+                
+                row = col.row()
+                op = row.operator(AH_ConsolidateAudioNLA.bl_idname, 
+                                text="Align to Speech Onset", 
+                                icon='SPEAKER')
+                op.target_mode = 'ACTIVE_OBJECT'
+                op.alignment_mode = 'SPEECH_ONSET'
+                op.use_audio_filter = False
+                op.remove_original_tracks = True
+                
+                # Plan preview: nothing is moved
+                row = col.row()
+                row.operator_context = 'EXEC_DEFAULT'
+                op = row.operator(AH_ConsolidateAudioNLA.bl_idname,
+                                text="Preview Plan",
+                                icon='LINKED')
+                op.target_mode = 'ACTIVE_OBJECT'
+                op.alignment_mode = 'MOVE_NLA_TO_AUDIO'
+                op.preview_only = True
+        
+        # Pairing found by the last preview or consolidation
+        report = context.scene.ah_consolidation
+        if report.matches:
+            box.separator()
+            no_audio = sum(1 for m in report.matches if m.status == 'NO_AUDIO')
+            unused = sum(1 for m in report.matches if m.status == 'UNUSED_AUDIO')
+            row = box.row()
+            row.label(text=f"Pairing: {no_audio} without audio, {unused} unused clips",
+                      icon='ERROR' if no_audio or unused else 'CHECKMARK')
+            row.prop(report, "show_unmatched_only", text="", icon='FILTER')
+            box.template_list("AH_UL_AudioMatches", "", report, "matches", report, "active_match", rows=4)
+        
+        # Plan of the last preview or an interrupted consolidation
+        if report.plan:
+            box.separator()
+            done = sum(1 for item in report.plan if item.done)
+            conflicts = sum(1 for item in report.plan if item.status != 'OK' or item.error)
+            row = box.row()
+            row.label(text=f"Plan: {done}/{len(report.plan)} done, {conflicts} conflicts",
+                      icon='ERROR' if conflicts else 'CHECKMARK')
+            row.prop(report, "show_conflicts_only", text="", icon='FILTER')
+            box.template_list("AH_UL_ConsolidationPlan", "", report, "plan", report, "active_plan", rows=5)
+            if 0 <= report.active_plan < len(report.plan):
+                item = report.plan[report.active_plan]
+                col = box.column(align=True)
+                col.scale_y = 0.8
+                col.label(text=f"{item.owner_name}: {item.source_track} → {item.target_track}")
+                if item.audio_name:
+                    col.label(text=f"Audio: {item.audio_name}" + (" (moves)" if item.move_audio else ""))
+                if item.error:
+                    col.label(text=item.error, icon='ERROR')
+            row = box.row(align=True)
+            row.prop(report, "plan_remove_tracks")
+            row = box.row(align=True)
+            row.operator(AH_ApplyConsolidationPlan.bl_idname,
+                         text="Resume" if done else "Apply Plan",
+                         icon='PLAY')
+            row.operator(AH_ClearConsolidationPlan.bl_idname, text="", icon='X')
+        
+        # Export: flatten consolidated tracks without a scene bake
+        box.separator()
+        row = box.row()
+        row.operator(AH_FlattenConsolidatedSpeech.bl_idname,
+                    text="Flatten to Master Actions",
+                    icon='NLA_PUSHDOWN')
         
         # Show current active object info
         if context.active_object:
@@ -128,7 +272,9 @@ class AH_AudioNLAConsolidationPanel(bpy.types.Panel):
         col.scale_y = 0.8
         col.label(text="• 'Even Spacing' works without audio")
         col.label(text="• 'Align to Audio' preserves audio timing")
+        col.label(text="• Audio is paired by name, duration and position")
         col.label(text="• Works with active object + children")
+        col.label(text="• 'All Characters' routes audio by code or rig name")
         col.label(text="• Consolidates multiple tracks into one")
         col.label(text="• Default: 20 frame spacing, starts at frame 1")
     
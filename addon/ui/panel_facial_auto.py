@@ -1,5 +1,7 @@
 import bpy
 from ..operators.Facial_auto_processor import AH_AutoProcessor, AH_StartAutoProcessing, AH_StopAutoProcessing, AH_AutoFacialProcessor, AH_ClearProcessedActions, AH_ToggleAutoCleanup, AH_SetLanguageSuffix
+from ..operators.Action_resample import AH_ResampleActions
+from ..operators.Cue_sheet_import import AH_ImportCueSheet
 
 class AH_FacialAutoProcessingPanel(bpy.types.Panel):
     """Panel for auto-processing controls"""
@@ -149,4 +151,11 @@ class AH_FacialAutoProcessingPanel(bpy.types.Panel):
             box.label(text="Manual Processing")
             row = box.row()
             row.enabled = valid_rig
-            row.operator(AH_AutoFacialProcessor.bl_idname, text="Process Current Animation", icon='IMPORT')
\ No newline at end of file
+            row.operator(AH_AutoFacialProcessor.bl_idname, text="Process Current Animation", icon='IMPORT')
+            
+            row = box.row()
+            op = row.operator(AH_ResampleActions.bl_idname, text="Retime Speech Actions", icon='TIME')
+            op.target = 'SPEECH'
+
+            row = box.row()
+            row.operator(AH_ImportCueSheet.bl_idname, text="Place from Cue Sheet", icon='TEXT')
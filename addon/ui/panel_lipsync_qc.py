@@ -0,0 +1,75 @@
+import bpy
+from ..operators.Lip_sync_qc import AH_DetectLipSyncDrift, AH_ApplyLipSyncOffsets
+
+
+class AH_UL_LipSyncResults(bpy.types.UIList):
+    """Facial strips with their suggested lip-sync offset"""
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        if item.flagged:
+            row.prop(item, "apply", text="")
+        row.label(text=item.strip_name, icon='ERROR' if item.flagged else 'CHECKMARK')
+        sub = row.row(align=True)
+        sub.alignment = 'RIGHT'
+        sub.label(text=f"{item.offset:+d} f")
+        sub.label(text=f"{item.confidence:.2f}")
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        props = context.scene.ah_lipsync
+        flags = [self.bitflag_filter_item] * len(items)
+        if props.show_flagged_only:
+            flags = [self.bitflag_filter_item if item.flagged else 0 for item in items]
+        return flags, []
+
+
+class AH_LipSyncQCPanel(bpy.types.Panel):
+    """Lip-Sync QC panel"""
+    bl_label = "Lip-Sync QC"
+    bl_idname = "AH_PT_LipSyncQC"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'AH Helper'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.ah_lipsync
+
+        box = layout.box()
+        col = box.column(align=True)
+        col.prop(props, "rig_track_name")
+        col.prop(props, "shapekey_track_name")
+        col.prop(props, "channel_keywords")
+        col = box.column(align=True)
+        col.prop(props, "max_lag")
+        col.prop(props, "drift_threshold")
+        col.prop(props, "min_confidence")
+
+        row = layout.row()
+        row.scale_y = 1.2
+        row.operator(AH_DetectLipSyncDrift.bl_idname, text="Detect Drift", icon='SPEAKER')
+
+        row = layout.row()
+        row.prop(props, "show_flagged_only")
+        layout.template_list("AH_UL_LipSyncResults", "", props, "results", props, "active_index", rows=6)
+
+        if props.results:
+            flagged = sum(1 for item in props.results if item.flagged)
+            col = layout.column(align=True)
+            col.scale_y = 0.8
+            col.label(text=f"{flagged} of {len(props.results)} strips drifting")
+            if 0 <= props.active_index < len(props.results):
+                item = props.results[props.active_index]
+                col.label(text=f"{item.owner_name} / {item.track_name}")
+                col.label(text=f"Audio: {item.audio_name}")
+                col.label(text=f"Start {item.frame_start:.0f}, offset {item.offset:+d}, confidence {item.confidence:.2f}")
+            row = layout.row()
+            row.operator(AH_ApplyLipSyncOffsets.bl_idname, icon='CHECKMARK')
+        else:
+            layout.label(text="Needs consolidated tracks and sound strips", icon='INFO')
+
+    def draw_header(self, context):
+        layout = self.layout
+        layout.label(icon='SPEAKER')
@@ -0,0 +1,76 @@
+import bpy
+from ..operators.NLA_profiler import AH_ProfileNLAEvaluation
+
+
+class AH_UL_ProfileResults(bpy.types.UIList):
+    """NLA tracks or strips ranked by what muting them saves"""
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.label(text=item.name, icon='NLA' if item.kind == 'TRACK' else 'SEQ_STRIP_DUPLICATE')
+        sub = row.row(align=True)
+        sub.alignment = 'RIGHT'
+        sub.label(text=f"{item.cost_ms:.2f} ms")
+        sub.label(text=f"{item.share * 100.0:.0f}%")
+
+
+class AH_UL_ProfileWarnings(bpy.types.UIList):
+    """Strip settings that make the NLA costly to evaluate"""
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        layout.label(text=item.name, icon='ERROR')
+
+
+class AH_NLAProfilerPanel(bpy.types.Panel):
+    """NLA evaluation profiler panel"""
+    bl_label = "NLA Profiler"
+    bl_idname = "AH_PT_NLAProfiler"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'AH Helper'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.ah_profile
+
+        box = layout.box()
+        box.row().prop(props, "granularity", expand=True)
+        col = box.column(align=True)
+        col.prop(props, "frame_count")
+        col.prop(props, "repeats")
+        box.prop(props, "include_shapekeys")
+
+        row = layout.row()
+        row.scale_y = 1.2
+        row.operator(AH_ProfileNLAEvaluation.bl_idname, text="Profile Active Object", icon='TIME')
+
+        if not props.target_name:
+            layout.label(text="Times playback with each track muted", icon='INFO')
+            return
+
+        col = layout.column(align=True)
+        col.scale_y = 0.8
+        col.label(text=f"{props.target_name}: {props.total_ms:.2f} ms per frame")
+        col.label(text=f"NLA {props.nla_ms:.2f} · Drivers {props.drivers_ms:.2f} · Constraints {props.constraints_ms:.2f}")
+
+        layout.template_list("AH_UL_ProfileResults", "", props, "results", props, "active_index", rows=6)
+        if 0 <= props.active_index < len(props.results):
+            item = props.results[props.active_index]
+            col = layout.column(align=True)
+            col.scale_y = 0.8
+            col.label(text=f"{item.owner_name} / {item.track_name}")
+
+        if props.warnings:
+            layout.label(text="Costly Settings", icon='ERROR')
+            layout.template_list("AH_UL_ProfileWarnings", "", props, "warnings", props, "active_warning", rows=3)
+            if 0 <= props.active_warning < len(props.warnings):
+                item = props.warnings[props.active_warning]
+                where = " / ".join(name for name in (item.owner_name, item.track_name, item.strip_name) if name)
+                col = layout.column(align=True)
+                col.scale_y = 0.8
+                col.label(text=where)
+
+    def draw_header(self, context):
+        layout = self.layout
+        layout.label(icon='TIME')
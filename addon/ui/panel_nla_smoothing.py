@@ -1,5 +1,20 @@
 import bpy
 from ..operators.NLA_smoothing import AH_NLASmoothTransitions, AH_NLACleanTransitions
+from ..operators.Pop_detector import AH_DetectHeadPops, AH_JumpToPop
+
+
+class AH_UL_PopResults(bpy.types.UIList):
+    """Worst discontinuities at strip boundaries"""
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.label(text=item.name, icon='BONE_DATA' if item.owner_type == 'OBJECT' else 'SHAPEKEY_DATA')
+        sub = row.row(align=True)
+        sub.alignment = 'RIGHT'
+        sub.label(text=f"f{item.frame}")
+        sub.label(text=f"{item.magnitude:.2f}")
+        op = sub.operator(AH_JumpToPop.bl_idname, text="", icon='TIME')
+        op.index = index
 
 class AH_NLASmoothingPanel(bpy.types.Panel):
     """NLA Smoothing Tools panel"""
@@ -91,6 +106,26 @@ class AH_NLASmoothingPanel(bpy.types.Panel):
                 col.label(text=f"Selected types: {', '.join(selected_types)}")
                 col.label(text="Need: Armatures or Meshes with shape keys")
         
+        # Pop detection on the evaluated NLA result
+        props = context.scene.ah_pops
+        box = layout.box()
+        box.label(text="Head Pop Detection", icon='IPO_ELASTIC')
+        row = box.row(align=True)
+        row.prop(props, "window")
+        row.prop(props, "min_magnitude")
+        row = box.row(align=True)
+        row.scale_y = 1.2
+        row.operator(AH_DetectHeadPops.bl_idname, text="Find Pops", icon='VIEWZOOM')
+        row.prop(props, "max_results", text="")
+        if props.results:
+            box.template_list("AH_UL_PopResults", "", props, "results", props, "active_index", rows=5)
+            if 0 <= props.active_index < len(props.results):
+                item = props.results[props.active_index]
+                col = box.column(align=True)
+                col.scale_y = 0.8
+                col.label(text=f"{item.owner_name} at frame {item.frame}")
+                col.label(text=f"Acceleration {item.magnitude:.2f}, speed {item.velocity:.2f} (pose units/frame)")
+        
         # Instructions section
         layout.separator()
         box = layout.box()
@@ -1,7 +1,14 @@
 import bpy
 
 # Import operators
-from ..operators.NLA_transfer import AH_TransferNLAStrips, AH_TransferShapeKeyNLA, AH_CleanupAppendedCharacter
+from ..operators.NLA_transfer import (
+    AH_TransferNLAStrips,
+    AH_TransferShapeKeyNLA,
+    AH_CleanupAppendedCharacter,
+    AH_ExportNLALayout,
+    AH_ImportNLALayout,
+    AH_LoadActionsFromBlend,
+)
 
 
 class AH_NLATransferPanel(bpy.types.Panel):
@@ -66,6 +73,14 @@ class AH_NLATransferPanel(bpy.types.Panel):
         else:
             box.separator()
             box.label(text="No objects selected", icon='ERROR')
+
+        # Layout manifest round-trip, no character appending needed
+        box = layout.box()
+        box.label(text="NLA Layout Manifest", icon='FILE_TEXT')
+        row = box.row(align=True)
+        row.operator(AH_ExportNLALayout.bl_idname, text="Export", icon='EXPORT')
+        row.operator(AH_ImportNLALayout.bl_idname, text="Import", icon='IMPORT')
+        box.operator(AH_LoadActionsFromBlend.bl_idname, text="Load Actions from .blend", icon='APPEND_BLEND')
     
     def draw_header(self, context):
         layout = self.layout
@@ -0,0 +1,328 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+import bpy
+import numpy as np
+
+from .anim_data import set_action_frame_range
+
+# Custom property marking a stub action, holds the archive file name
+ARCHIVE_PROP = "ah_archive"
+INDEX_NAME = "index.json"
+ARCHIVE_VERSION = 1
+
+_FLOAT_FIELDS = ("co", "handle_left", "handle_right", "back", "amplitude", "period")
+_INT_FIELDS = ("interpolation", "handle_left_type", "handle_right_type", "easing", "type")
+_PAIR_FIELDS = {"co", "handle_left", "handle_right"}
+
+
+def archive_directory(scene):
+    """Absolute archive folder configured on the scene, None while it can't be resolved
+
+    A "//" path stays relative in an unsaved file and would land in
+    Blender's working directory.
+    """
+    directory = bpy.path.abspath(scene.ah_archive.directory)
+    if not directory or not os.path.isabs(directory):
+        return None
+    return directory
+
+
+def is_stub(action):
+    return action is not None and ARCHIVE_PROP in action
+
+
+def _file_name(action_name):
+    """Readable file name made unique by a hash of the exact action name
+
+    Sanitising alone maps "A B" and "A_B" (or names differing in case on
+    case-insensitive disks) onto one file.
+    """
+    safe = re.sub(r'[^A-Za-z0-9_.-]+', '_', action_name)
+    digest = hashlib.sha1(action_name.encode("utf-8")).hexdigest()[:10]
+    return f"{safe}_{digest}.npz"
+
+
+def load_index(directory):
+    """Read the archive index -> {action name: entry dict}"""
+    path = os.path.join(directory, INDEX_NAME)
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle).get("actions", {})
+
+
+def save_index(directory, entries):
+    """Write the index atomically so an interrupted save never corrupts it"""
+    path = os.path.join(directory, INDEX_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump({"version": ARCHIVE_VERSION, "actions": entries}, handle, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def search_index(entries, query):
+    """Entries whose name contains every whitespace separated query term"""
+    terms = query.upper().split()
+    return [entry for name, entry in sorted(entries.items())
+            if all(term in name.upper() for term in terms)]
+
+
+def _read_fcurve_arrays(fcurve):
+    kps = fcurve.keyframe_points
+    count = len(kps)
+    data = {}
+    for attr in _FLOAT_FIELDS:
+        buf = np.empty(count * (2 if attr in _PAIR_FIELDS else 1), dtype=np.float32)
+        kps.foreach_get(attr, buf)
+        data[attr] = buf
+    for attr in _INT_FIELDS:
+        buf = np.empty(count, dtype=np.int32)
+        kps.foreach_get(attr, buf)
+        # Enum values all fit in a byte, which keeps the archive small
+        data[attr] = buf.astype(np.int8)
+    return count, data
+
+
+def archive_action(action, directory, describe=None):
+    """Write an action's fcurves to a compressed file and turn it into a stub
+
+    Returns the index entry. describe(action) may add searchable metadata.
+    """
+    if is_stub(action):
+        raise RuntimeError(f"'{action.name}' is already archived")
+    for fcurve in action.fcurves:
+        if len(fcurve.modifiers):
+            raise RuntimeError(f"'{action.name}' has fcurve modifiers, which the archive can't store")
+
+    os.makedirs(directory, exist_ok=True)
+
+    channels = []
+    arrays = {attr: [] for attr in _FLOAT_FIELDS + _INT_FIELDS}
+    total_keys = 0
+    for fcurve in action.fcurves:
+        count, data = _read_fcurve_arrays(fcurve)
+        channels.append({
+            "data_path": fcurve.data_path,
+            "index": fcurve.array_index,
+            "group": fcurve.group.name if fcurve.group else "",
+            "extrapolation": fcurve.extrapolation,
+            "mute": fcurve.mute,
+            "count": count,
+        })
+        for attr, buf in data.items():
+            arrays[attr].append(buf)
+        total_keys += count
+
+    frame_range = [float(f) for f in action.frame_range]
+    meta = {
+        "version": ARCHIVE_VERSION,
+        "name": action.name,
+        "id_root": action.id_root,
+        "frame_range": frame_range,
+        "use_frame_range": action.use_frame_range,
+        "use_cyclic": action.use_cyclic,
+        "channels": channels,
+    }
+
+    file_name = _file_name(action.name)
+    path = os.path.join(directory, file_name)
+    packed = {}
+    for attr, parts in arrays.items():
+        dtype = np.int8 if attr in _INT_FIELDS else np.float32
+        packed[attr] = np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+    np.savez_compressed(path, meta=np.array(json.dumps(meta)), **packed)
+
+    # Replace the payload with a stub that keeps its name, users and frame range
+    for fcurve in list(action.fcurves):
+        action.fcurves.remove(fcurve)
+    for group in list(action.groups):
+        action.groups.remove(group)
+    action.use_frame_range = True
+    set_action_frame_range(action, *frame_range)
+    action[ARCHIVE_PROP] = file_name
+
+    entry = {
+        "name": action.name,
+        "file": file_name,
+        "fcurves": len(channels),
+        "keys": total_keys,
+        "frame_range": frame_range,
+        "size": os.path.getsize(path),
+        "archived": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    if describe:
+        entry.update(describe(action))
+    return entry
+
+
+def rehydrate_action(directory, name, action=None):
+    """Restore an archived action's fcurves, creating the action if it is gone"""
+    if action is not None and is_stub(action):
+        file_name = action[ARCHIVE_PROP]
+    else:
+        entry = load_index(directory).get(name)
+        if not entry:
+            raise RuntimeError(f"'{name}' is not in the archive")
+        file_name = entry["file"]
+
+    path = os.path.join(directory, file_name)
+    if not os.path.isfile(path):
+        raise RuntimeError(f"Archive file missing: {path}")
+
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        arrays = {attr: data[attr] for attr in _FLOAT_FIELDS + _INT_FIELDS}
+
+    if action is None:
+        action = bpy.data.actions.get(name) or bpy.data.actions.new(name)
+        action.id_root = meta["id_root"]
+        action.use_fake_user = True
+
+    groups = {}
+    offset = 0
+    for channel in meta["channels"]:
+        count = channel["count"]
+        group_name = channel["group"]
+        if group_name and group_name not in groups:
+            groups[group_name] = action.groups.get(group_name) or action.groups.new(group_name)
+        fcurve = action.fcurves.new(channel["data_path"], index=channel["index"],
+                                    action_group=group_name)
+        fcurve.extrapolation = channel["extrapolation"]
+        fcurve.mute = channel["mute"]
+
+        kps = fcurve.keyframe_points
+        kps.add(count)
+        for attr in _FLOAT_FIELDS:
+            width = 2 if attr in _PAIR_FIELDS else 1
+            kps.foreach_set(attr, arrays[attr][offset * width:(offset + count) * width])
+        for attr in _INT_FIELDS:
+            kps.foreach_set(attr, arrays[attr][offset:offset + count].astype(np.int32))
+        fcurve.update()
+        offset += count
+
+    action.use_cyclic = meta["use_cyclic"]
+    action.use_frame_range = meta["use_frame_range"]
+    if meta["use_frame_range"]:
+        set_action_frame_range(action, *meta["frame_range"])
+    if ARCHIVE_PROP in action:
+        del action[ARCHIVE_PROP]
+    return action
+
+
+def stub_actions_in_use(anim_data):
+    """Stub actions played or tweaked by an animation data block"""
+    stubs = set()
+    if is_stub(anim_data.action):
+        stubs.add(anim_data.action)
+    for track in anim_data.nla_tracks:
+        for strip in track.strips:
+            if is_stub(strip.action):
+                stubs.add(strip.action)
+    return stubs
+
+
+def stub_slots(anim_data):
+    """{slot: stub action} of an animation data block
+
+    Slots are strip names, unique per animation data, plus "<tweak>" for the
+    action being tweaked, so a slot appearing means a stub was just placed.
+    """
+    slots = {}
+    if anim_data.use_tweak_mode and is_stub(anim_data.action):
+        slots["<tweak>"] = anim_data.action
+    for track in anim_data.nla_tracks:
+        for strip in track.strips:
+            if is_stub(strip.action):
+                slots[strip.name] = strip.action
+    return slots
+
+
+_pending_rehydration = set()
+# (ID type, ID name) -> (strip name, action name) slots already seen holding a stub
+_known_slots = {}
+_primed = False
+
+
+def _id_key(id_data):
+    return (type(id_data).__name__, id_data.name)
+
+
+def _slot_keys(slots):
+    return {(slot, action.name) for slot, action in slots.items()}
+
+
+def remember_stub_slots():
+    """Record the stubs now in the file so only later placements rehydrate"""
+    global _primed
+    _known_slots.clear()
+    for collection in (bpy.data.objects, bpy.data.shape_keys):
+        for id_data in collection:
+            anim_data = id_data.animation_data
+            if anim_data:
+                _known_slots[_id_key(id_data)] = _slot_keys(stub_slots(anim_data))
+    _primed = True
+
+
+def clear_stub_registry():
+    """Forget the recorded stub slots, e.g. when another file is loaded"""
+    global _primed
+    _known_slots.clear()
+    _pending_rehydration.clear()
+    _primed = False
+
+
+def _rehydrate_pending():
+    """Timer callback: restore stubs found by the depsgraph handler"""
+    names = list(_pending_rehydration)
+    _pending_rehydration.clear()
+    scene = bpy.context.scene
+    if scene is None or not hasattr(scene, "ah_archive"):
+        return None
+    directory = archive_directory(scene)
+    if directory is None:
+        print("Archived actions not restored: save the file or set an absolute archive folder")
+        return None
+    for name in names:
+        action = bpy.data.actions.get(name)
+        if not is_stub(action):
+            continue
+        try:
+            rehydrate_action(directory, name, action)
+            print(f"Rehydrated archived action: {name}")
+        except Exception as e:
+            print(f"Failed to rehydrate {name}: {str(e)}")
+    return None
+
+
+def queue_stubs_from_depsgraph(depsgraph):
+    """Queue rehydration of stubs just placed on a strip or entered in tweak mode
+
+    Stubs that were already sitting in the NLA stay archived, so selecting or
+    moving an object never loads anything. Writing ID data from inside a
+    depsgraph handler is unsafe, so the actual restore runs from a one-shot timer.
+    """
+    if not _primed:
+        remember_stub_slots()
+        return
+    found = False
+    for update in depsgraph.updates:
+        id_data = getattr(update.id, "original", update.id)
+        if not isinstance(id_data, (bpy.types.Object, bpy.types.Key)):
+            continue
+        anim_data = getattr(id_data, "animation_data", None)
+        if not anim_data:
+            continue
+        slots = stub_slots(anim_data)
+        keys = _slot_keys(slots)
+        known = _known_slots.get(_id_key(id_data), set())
+        _known_slots[_id_key(id_data)] = keys
+        for slot, action in slots.items():
+            if (slot, action.name) not in known and action.name not in _pending_rehydration:
+                _pending_rehydration.add(action.name)
+                found = True
+    if found and not bpy.app.timers.is_registered(_rehydrate_pending):
+        bpy.app.timers.register(_rehydrate_pending, first_interval=0.0)
@@ -0,0 +1,101 @@
+import hashlib
+
+import bpy
+import numpy as np
+
+# Custom property on a copied action, holds the name of the action it was copied from
+COPY_SOURCE_PROP = "ah_copy_of"
+# Content fingerprint of the copy when it was made; differs once the copy is edited
+COPY_HASH_PROP = "ah_copy_hash"
+
+_KEY_FIELDS = ("co", "handle_left", "handle_right")
+
+ACTION_MODE_ITEMS = [
+    ('COPY_ONCE', "Copy Once", "One copy per source action, shared by every target and reused by later transfers while unedited"),
+    ('SHARE', "Share Originals", "Targets play the source actions directly, no copies are made"),
+    ('COPY_PER_STRIP', "Copy Per Strip", "Separate copy for every strip on every target (old behaviour)"),
+]
+
+
+def action_fingerprint(action):
+    """Hash of an action's curves and keys, read in bulk"""
+    digest = hashlib.sha1()
+    for fcurve in sorted(action.fcurves, key=lambda fc: (fc.data_path, fc.array_index)):
+        kps = fcurve.keyframe_points
+        count = len(kps)
+        digest.update(f"{fcurve.data_path}[{fcurve.array_index}]{fcurve.extrapolation}{fcurve.mute}".encode("utf-8"))
+        digest.update(",".join(mod.type for mod in fcurve.modifiers).encode("utf-8"))
+        for attr in _KEY_FIELDS:
+            buf = np.empty(count * 2, dtype=np.float32)
+            kps.foreach_get(attr, buf)
+            digest.update(buf.tobytes())
+        interp = np.empty(count, dtype=np.int32)
+        kps.foreach_get("interpolation", interp)
+        digest.update(interp.tobytes())
+    return digest.hexdigest()
+
+
+class ActionCopyTable:
+    """Maps source actions to the copy targets should use
+
+    Built once per operator run from the copy markers already in the file,
+    so repeated transfers pick up earlier copies instead of stacking
+    _Copy_Copy chains. A copy is only reused while its content still matches
+    the action being transferred; an edited copy is itself copied as is.
+    """
+
+    def __init__(self, mode='COPY_ONCE'):
+        self.mode = mode
+        self.created = 0
+        self.reused = 0
+        self._copies = {}
+        self._fingerprints = {}
+        if mode == 'COPY_ONCE':
+            for action in bpy.data.actions:
+                source_name = action.get(COPY_SOURCE_PROP)
+                if source_name and action.library is None and COPY_HASH_PROP in action:
+                    self._copies.setdefault(source_name, []).append(action)
+
+    def fingerprint(self, action):
+        # Actions aren't edited during a run, so each is hashed once
+        key = action.as_pointer()
+        if key not in self._fingerprints:
+            self._fingerprints[key] = action_fingerprint(action)
+        return self._fingerprints[key]
+
+    def source_of(self, action, fingerprint):
+        """The action to copy: unmodified copies stand for the action they came from"""
+        seen = {action.name}
+        while COPY_SOURCE_PROP in action:
+            parent = bpy.data.actions.get(action[COPY_SOURCE_PROP])
+            if parent is None or parent.name in seen or self.fingerprint(parent) != fingerprint:
+                break
+            seen.add(parent.name)
+            action = parent
+        return action
+
+    def get(self, action):
+        if action is None or self.mode == 'SHARE':
+            return action
+
+        fingerprint = self.fingerprint(action)
+        source = self.source_of(action, fingerprint)
+        if self.mode == 'COPY_ONCE':
+            for copy in self._copies.get(source.name, ()):
+                if copy.get(COPY_HASH_PROP) == fingerprint and self.fingerprint(copy) == fingerprint:
+                    self.reused += 1
+                    return copy
+
+        copy = source.copy()
+        copy.name = f"{source.name}_Copy"
+        copy[COPY_SOURCE_PROP] = source.name
+        copy[COPY_HASH_PROP] = fingerprint
+        self.created += 1
+        if self.mode == 'COPY_ONCE':
+            self._copies.setdefault(source.name, []).append(copy)
+        return copy
+
+    def summary(self):
+        if self.mode == 'SHARE':
+            return "actions shared"
+        return f"{self.created} action copies made, {self.reused} reused"
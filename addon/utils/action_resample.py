@@ -0,0 +1,141 @@
+import numpy as np
+
+from .anim_data import set_action_frame_range
+from .fcurve_arrays import (
+    INTERP_CONSTANT,
+    evaluate_fcurve,
+    read_keyframes,
+    sample_interpolation,
+    write_sampled_keyframes,
+)
+
+
+def destination_grid(start, end, scale, pivot, step=1.0):
+    """Whole destination frames covering [start, end] once retimed around pivot"""
+    dst_start = pivot + (start - pivot) * scale
+    dst_end = pivot + (end - pivot) * scale
+    first = np.floor(dst_start + 1e-6)
+    last = np.ceil(dst_end - 1e-6)
+    count = max(1, int(round((last - first) / step)) + 1)
+    return first + np.arange(count) * step
+
+
+def key_extremes(keys):
+    """Indices of keys that are local minima/maxima, plus both end keys"""
+    values = keys.values
+    count = len(values)
+    if count < 3:
+        return np.arange(count)
+    mid = values[1:-1]
+    peak = ((mid >= values[:-2]) & (mid > values[2:])) | ((mid > values[:-2]) & (mid >= values[2:]))
+    trough = ((mid <= values[:-2]) & (mid < values[2:])) | ((mid < values[:-2]) & (mid <= values[2:]))
+    interior = np.nonzero(peak | trough)[0] + 1
+    return np.concatenate(([0], interior, [count - 1]))
+
+
+def simplify_samples(frames, values, tolerance):
+    """Keep mask reducing a sampled curve to the points needed within tolerance
+
+    Iterative Douglas-Peucker on the value axis: a segment is split at the
+    sample that deviates most from the straight line between its ends.
+    """
+    count = len(frames)
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    if count < 3:
+        keep[:] = True
+        return keep
+
+    stack = [(0, count - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo < 2:
+            continue
+        inner = slice(lo + 1, hi)
+        t = (frames[inner] - frames[lo]) / (frames[hi] - frames[lo])
+        line = values[lo] + (values[hi] - values[lo]) * t
+        error = np.abs(values[inner] - line)
+        worst = int(np.argmax(error))
+        if error[worst] > tolerance:
+            split = lo + 1 + worst
+            keep[split] = True
+            stack.append((lo, split))
+            stack.append((split, hi))
+    return keep
+
+
+def stepped_keep(values, interpolation, keep):
+    """Adjust a keep mask so CONSTANT samples still step where the source did
+
+    A constant sample can only go when the one before it is constant too and
+    holds the same value; every other constant sample, and the sample right
+    after a constant run, must stay for the steps to land on the same frames.
+    """
+    const = interpolation == INTERP_CONSTANT
+    if not const.any():
+        return keep
+    keep = keep.copy()
+    held = np.zeros(len(values), dtype=bool)
+    held[1:] = const[1:] & const[:-1] & (values[1:] == values[:-1])
+    keep[const] = ~held[const]
+    keep[1:] |= const[:-1] & ~const[1:]
+    keep[0] = keep[-1] = True
+    return keep
+
+
+def resample_fcurve(fcurve, scale, pivot, step=1.0, preserve_extremes=True, refit_tolerance=0.0):
+    """Resample one fcurve onto a retimed frame grid in a single bulk write
+
+    Returns (keys before, keys after).
+    """
+    keys = read_keyframes(fcurve)
+    count = len(keys.frames)
+    if count == 0:
+        return 0, 0
+
+    dst_frames = destination_grid(keys.frames[0], keys.frames[-1], scale, pivot, step)
+    src_frames = pivot + (dst_frames - pivot) / scale
+    values = evaluate_fcurve(fcurve, src_frames, keys)
+    interpolation = sample_interpolation(keys, src_frames)
+
+    if preserve_extremes and len(dst_frames) > 1:
+        # Pin every extreme key's exact value onto its nearest destination sample
+        extremes = key_extremes(keys)
+        dst_extremes = pivot + (keys.frames[extremes] - pivot) * scale
+        slots = np.clip(np.rint((dst_extremes - dst_frames[0]) / step).astype(np.int64), 0, len(dst_frames) - 1)
+        values[slots] = keys.values[extremes]
+
+    if refit_tolerance > 0.0:
+        keep = simplify_samples(dst_frames, values, refit_tolerance)
+        if preserve_extremes and len(dst_frames) > 1:
+            keep[slots] = True
+        keep = stepped_keep(values, interpolation, keep)
+        dst_frames = dst_frames[keep]
+        values = values[keep]
+        interpolation = interpolation[keep]
+
+    write_sampled_keyframes(fcurve, dst_frames, values, interpolation)
+    return count, len(dst_frames)
+
+
+def resample_action(action, scale, pivot=None, step=1.0, preserve_extremes=True, refit_tolerance=0.0):
+    """Retime every fcurve of an action, returns (keys before, keys after)
+
+    pivot defaults to the action's first frame so the action keeps its start.
+    """
+    if pivot is None:
+        pivot = action.frame_range[0]
+    before = 0
+    after = 0
+    for fcurve in action.fcurves:
+        old_count, new_count = resample_fcurve(
+            fcurve, scale, pivot, step, preserve_extremes, refit_tolerance
+        )
+        before += old_count
+        after += new_count
+
+    if action.use_frame_range:
+        start = pivot + (action.frame_start - pivot) * scale
+        end = pivot + (action.frame_end - pivot) * scale
+        set_action_frame_range(action, start, end)
+    return before, after
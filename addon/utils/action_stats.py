@@ -0,0 +1,54 @@
+import bpy
+import numpy as np
+
+from .fcurve_arrays import BEZTRIPLE_BYTES, FCURVE_BYTES, time_fcurve_evaluation
+
+# session_uid -> stats dict, survives renames and is only recomputed when dirty
+_cache = {}
+_dirty = set()
+
+EVAL_SAMPLE_FRAMES = 8
+
+
+def mark_dirty_from_depsgraph(depsgraph):
+    """Flag actions edited since the last refresh"""
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Action):
+            _dirty.add(update.id.original.session_uid)
+
+
+def clear_cache():
+    _cache.clear()
+    _dirty.clear()
+
+
+def compute_action_stats(action, measure_eval=True):
+    """Count fcurves and keys, estimate memory and time one frame of evaluation"""
+    fcurves = action.fcurves
+    counts = np.fromiter((len(fc.keyframe_points) for fc in fcurves), dtype=np.int64, count=len(fcurves))
+    path_bytes = sum(len(fc.data_path) for fc in fcurves)
+    stats = {
+        'fcurves': len(counts),
+        'keys': int(counts.sum()),
+        'memory': int(len(counts) * FCURVE_BYTES + path_bytes + counts.sum() * BEZTRIPLE_BYTES),
+        'eval_time': 0.0,
+    }
+    if measure_eval and len(counts):
+        start, end = action.frame_range
+        frames = np.linspace(start, end, EVAL_SAMPLE_FRAMES)
+        stats['eval_time'] = time_fcurve_evaluation(fcurves, frames)
+    return stats
+
+
+def get_action_stats(action, measure_eval=True):
+    """Cached stats, recomputed only when the action changed or was never measured"""
+    uid = action.session_uid
+    cached = _cache.get(uid)
+    if (cached is None or uid in _dirty
+            or cached['fcurves'] != len(action.fcurves)
+            or (measure_eval and not cached['measured'])):
+        cached = compute_action_stats(action, measure_eval)
+        cached['measured'] = measure_eval
+        _cache[uid] = cached
+        _dirty.discard(uid)
+    return cached
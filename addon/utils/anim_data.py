@@ -0,0 +1,21 @@
+import bpy
+
+
+def iter_animation_data():
+    """Yield the animation data of every object and shape key datablock"""
+    for obj in bpy.data.objects:
+        if obj.animation_data:
+            yield obj.animation_data
+    for shape_keys in bpy.data.shape_keys:
+        if shape_keys.animation_data:
+            yield shape_keys.animation_data
+
+
+def set_action_frame_range(action, start, end):
+    """Set an action's manual frame range in an order Blender won't clamp"""
+    if start > action.frame_end:
+        action.frame_end = end
+        action.frame_start = start
+    else:
+        action.frame_start = start
+        action.frame_end = end
@@ -0,0 +1,195 @@
+import hashlib
+import os
+import tempfile
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+import numpy as np
+
+ENVELOPE_VERSION = 1
+CACHE_FOLDER = "anim_helper_cache"
+_CHUNK_SAMPLES = 1 << 16
+
+# (cache key) -> envelope, shared by every operator in this session
+_memory_cache = {}
+# aud is not documented as thread-safe, so non-WAV decodes take turns
+_aud_lock = threading.Lock()
+
+
+def cache_directory():
+    """Envelope cache next to the .blend file, or in the temp folder for unsaved files"""
+    if bpy.data.filepath:
+        base = os.path.join(os.path.dirname(bpy.data.filepath), CACHE_FOLDER)
+    else:
+        base = os.path.join(tempfile.gettempdir(), CACHE_FOLDER)
+    return os.path.join(base, "envelopes")
+
+
+def sound_path(strip):
+    sound = strip.sound
+    if sound is None:
+        return ""
+    return os.path.normpath(bpy.path.abspath(sound.filepath, library=sound.library))
+
+
+def cache_key(path, fps):
+    """Key changes whenever the file is replaced, edited or the frame rate differs"""
+    stat = os.stat(path)
+    raw = f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{fps:.6f}|{ENVELOPE_VERSION}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _accumulate(sums, counts, samples, first_sample, rate, fps):
+    """Add squared samples to their per-frame bins"""
+    bins = ((first_sample + np.arange(len(samples))) * fps / rate).astype(np.int64)
+    size = int(bins[-1]) + 1
+    if size > len(sums):
+        sums = np.concatenate([sums, np.zeros(size - len(sums))])
+        counts = np.concatenate([counts, np.zeros(size - len(counts))])
+    sums[:size] += np.bincount(bins, weights=samples * samples, minlength=size)[:size]
+    counts[:size] += np.bincount(bins, minlength=size)[:size]
+    return sums, counts
+
+
+def _wav_envelope(path, fps):
+    """RMS per frame of a PCM WAV file, read in chunks"""
+    sums = np.zeros(0)
+    counts = np.zeros(0)
+    with wave.open(path, "rb") as handle:
+        channels = handle.getnchannels()
+        width = handle.getsampwidth()
+        rate = handle.getframerate()
+        position = 0
+        while True:
+            raw = handle.readframes(_CHUNK_SAMPLES)
+            if not raw:
+                break
+            if width == 1:
+                data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float64) - 128.0) / 128.0
+            elif width == 2:
+                data = np.frombuffer(raw, dtype='<i2') / 32768.0
+            elif width == 3:
+                bytes3 = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+                ints = bytes3[:, 0] | (bytes3[:, 1] << 8) | (bytes3[:, 2] << 16)
+                data = np.where(ints >= 1 << 23, ints - (1 << 24), ints) / float(1 << 23)
+            elif width == 4:
+                data = np.frombuffer(raw, dtype='<i4') / float(1 << 31)
+            else:
+                raise RuntimeError(f"Unsupported WAV sample width: {width} bytes")
+            mono = data.reshape(-1, channels).mean(axis=1)
+            sums, counts = _accumulate(sums, counts, mono, position, rate, fps)
+            position += len(mono)
+    return np.sqrt(sums / np.maximum(counts, 1)).astype(np.float32)
+
+
+def _aud_envelope(path, fps):
+    """RMS per frame of any format Blender's audio library can read"""
+    try:
+        import aud
+    except ImportError:
+        raise RuntimeError("Blender's aud module is needed to decode non-WAV audio")
+    with _aud_lock:
+        sound = aud.Sound(path)
+        rate = sound.specs[0]
+        data = np.asarray(sound.data(), dtype=np.float64)
+    mono = data.mean(axis=1) if data.ndim > 1 else data
+    if not len(mono):
+        return np.zeros(0, dtype=np.float32)
+    sums, counts = _accumulate(np.zeros(0), np.zeros(0), mono, 0, rate, fps)
+    return np.sqrt(sums / np.maximum(counts, 1)).astype(np.float32)
+
+
+def decode_envelope(path, fps):
+    """Per-frame RMS envelope of a sound file, frame 0 being the file start"""
+    if path.lower().endswith((".wav", ".wave")):
+        try:
+            return _wav_envelope(path, fps)
+        except wave.Error:
+            pass  # compressed or extensible WAV, let aud handle it
+    return _aud_envelope(path, fps)
+
+
+def _load_or_decode(path, fps, directory):
+    """Thread worker: cached envelope if present, else decode and store it"""
+    key = cache_key(path, fps)
+    if key in _memory_cache:
+        return key, _memory_cache[key], False
+    cache_file = os.path.join(directory, f"{key}.npy")
+    if os.path.isfile(cache_file):
+        return key, np.load(cache_file), False
+    envelope = decode_envelope(path, fps)
+    os.makedirs(directory, exist_ok=True)
+    tmp_file = cache_file + ".tmp.npy"
+    np.save(tmp_file, envelope)
+    os.replace(tmp_file, cache_file)
+    return key, envelope, True
+
+
+def load_envelopes(paths, fps, max_workers=None):
+    """Envelopes for many sound files, decoding cache misses in parallel
+
+    Returns ({path: envelope}, decoded count, {path: error message}); the
+    other envelopes came from the cache. Counts are per unique path.
+    """
+    directory = cache_directory()
+    unique = sorted({p for p in paths if p})
+    envelopes = {}
+    errors = {}
+    decoded = 0
+    workers = max_workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {path: pool.submit(_load_or_decode, path, fps, directory) for path in unique}
+        for path, future in futures.items():
+            try:
+                key, envelope, was_decoded = future.result()
+            except Exception as e:
+                errors[path] = str(e)
+                continue
+            _memory_cache[key] = envelope
+            envelopes[path] = envelope
+            decoded += int(was_decoded)
+    return envelopes, decoded, errors
+
+
+def scene_fps(scene):
+    return scene.render.fps / scene.render.fps_base
+
+
+def strip_envelope(strip, envelope):
+    """(first scene frame, values) of the audible part of a sound strip"""
+    first = int(round(strip.frame_final_start))
+    last = int(round(strip.frame_final_end))
+    offset = first - int(round(strip.frame_start))
+    values = envelope[offset:offset + max(0, last - first)] * strip.volume
+    return first, values
+
+
+def envelopes_for_strips(scene, strips, max_workers=None):
+    """{strip name: (first scene frame, envelope)} for sound strips, using the cache
+
+    Returns (envelopes, decoded files, cached files, {path: error message}).
+    Strips sharing a sound file count that file once.
+    """
+    fps = scene_fps(scene)
+    paths = {strip.name: sound_path(strip) for strip in strips}
+    envelopes, decoded, errors = load_envelopes(paths.values(), fps, max_workers)
+    result = {}
+    for strip in strips:
+        envelope = envelopes.get(paths[strip.name])
+        if envelope is not None:
+            result[strip.name] = strip_envelope(strip, envelope)
+    return result, decoded, len(envelopes) - decoded, errors
+
+
+def speech_activity(values, threshold=0.1, relative=True):
+    """Boolean speech mask per frame; threshold is a fraction of the peak when relative"""
+    if not len(values):
+        return np.zeros(0, dtype=bool)
+    limit = threshold * float(values.max()) if relative else threshold
+    return values > limit
+
+
+def clear_memory_cache():
+    _memory_cache.clear()
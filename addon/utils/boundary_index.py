@@ -0,0 +1,155 @@
+import bpy
+import numpy as np
+
+from .strip_matching import route_audio, routing_keywords
+
+# IDs whose updates may move sequencer or NLA strips
+_WATCHED_TYPES = (bpy.types.Scene, bpy.types.Object, bpy.types.Key)
+
+_state = {
+    'stale': True,       # set by the depsgraph hook, cleared once the signature is checked
+    'scene': None,
+    'signature': None,
+    'entries': None,     # (frames, is_audio, is_start, codes) arrays
+    'views': {},         # filter key -> sorted unique frames
+}
+
+
+def mark_stale_from_depsgraph(depsgraph):
+    """Flag the index for a signature check after edits that may move strips"""
+    if _state['stale']:
+        return
+    for update in depsgraph.updates:
+        if isinstance(update.id, _WATCHED_TYPES):
+            _state['stale'] = True
+            return
+
+
+def clear_index():
+    _state.update(stale=True, scene=None, signature=None, entries=None, views={})
+
+
+def nla_stacks(scene, code_of):
+    """(AnimData, character code, owner name) of every NLA stack in the scene
+
+    Shape keys count for the character of their parent rig.
+    """
+    stacks = []
+    for obj in scene.objects:
+        if obj.animation_data and obj.animation_data.nla_tracks:
+            stacks.append((obj.animation_data, code_of(obj.name), obj.name))
+        if obj.type == 'MESH' and obj.data.shape_keys:
+            anim_data = obj.data.shape_keys.animation_data
+            if anim_data and anim_data.nla_tracks:
+                rig = obj.parent if obj.parent and obj.parent.type == 'ARMATURE' else obj
+                stacks.append((anim_data, code_of(rig.name), rig.name))
+    return stacks
+
+
+def _bulk_range(collection, start_attr, end_attr, dtype):
+    """Start and end of every item of a strip collection with two foreach_get calls"""
+    count = len(collection)
+    starts = np.empty(count, dtype=dtype)
+    ends = np.empty(count, dtype=dtype)
+    if count:
+        collection.foreach_get(start_attr, starts)
+        collection.foreach_get(end_attr, ends)
+    return starts, ends
+
+
+def _signature(scene, stacks):
+    """Bytes that change whenever a strip is added, removed, moved or rerouted
+
+    Sound strip and rig names are included since audio routing depends on them.
+    """
+    parts = []
+    names = []
+    if scene.sequence_editor:
+        sequences = scene.sequence_editor.sequences_all
+        parts.extend(_bulk_range(sequences, "frame_final_start", "frame_final_end", np.float64))
+        names.extend(s.name for s in sequences)
+    for anim_data, code, owner_name in stacks:
+        names.extend((code, owner_name))
+        for track in anim_data.nla_tracks:
+            parts.extend(_bulk_range(track.strips, "frame_start", "frame_end", np.float64))
+            parts.append(np.array([-1.0]))  # track separator
+    frames = np.concatenate(parts).tobytes() if parts else b""
+    return frames + "\0".join(names).encode("utf-8")
+
+
+def _build(scene, stacks):
+    frames, is_audio, is_start, codes = [], [], [], []
+
+    def add(starts, ends, audio, code):
+        count = len(starts)
+        frames.extend((starts, ends))
+        is_audio.append(np.full(2 * count, audio))
+        is_start.append(np.repeat([True, False], count))
+        codes.append(np.full(2 * count, code, dtype=object))
+
+    owners = {}
+    for anim_data, code, owner_name in stacks:
+        owners.setdefault(code, set()).add(owner_name)
+        for track in anim_data.nla_tracks:
+            add(*_bulk_range(track.strips, "frame_start", "frame_end", np.float64), False, code)
+
+    if scene.sequence_editor:
+        sounds = [s for s in scene.sequence_editor.sequences_all if s.type == 'SOUND']
+        routed, unrouted = route_audio(sounds, {code: routing_keywords(code, names) for code, names in owners.items() if code})
+        for code, strips in list(routed.items()) + [("", unrouted)]:
+            if strips:
+                add(np.array([s.frame_final_start for s in strips], dtype=np.float64),
+                    np.array([s.frame_final_end for s in strips], dtype=np.float64), True, code)
+
+    if not frames:
+        empty = np.zeros(0)
+        return empty, empty.astype(bool), empty.astype(bool), empty.astype(object)
+    return (np.rint(np.concatenate(frames)), np.concatenate(is_audio),
+            np.concatenate(is_start), np.concatenate(codes))
+
+
+def _refresh(scene, code_of):
+    if _state['scene'] != scene.name:
+        clear_index()
+    elif not _state['stale']:
+        return
+    stacks = nla_stacks(scene, code_of)
+    signature = _signature(scene, stacks)
+    if signature != _state['signature'] or _state['entries'] is None:
+        _state.update(entries=_build(scene, stacks), signature=signature, views={})
+    _state.update(stale=False, scene=scene.name)
+
+
+def boundary_frames(scene, code_of, character="", include_audio=True, include_nla=True, edge='BOTH'):
+    """Sorted unique whole frames where sound or NLA strips start or end
+
+    The index is rebuilt only when the sequencer or an NLA stack changed;
+    each filter combination is cached on top of it. code_of maps a rig
+    name to its character code.
+    """
+    _refresh(scene, code_of)
+    key = (character.strip().upper(), include_audio, include_nla, edge)
+    views = _state['views']
+    if key not in views:
+        frames, is_audio, is_start, codes = _state['entries']
+        mask = np.where(is_audio, include_audio, include_nla)
+        if edge == 'START':
+            mask &= is_start
+        elif edge == 'END':
+            mask &= ~is_start
+        if key[0]:
+            mask &= codes == key[0]
+        views[key] = np.unique(frames[mask])
+    return views[key]
+
+
+def next_boundary(frames, current):
+    """First boundary after current, None past the last one"""
+    i = int(np.searchsorted(frames, current, side='right'))
+    return float(frames[i]) if i < len(frames) else None
+
+
+def previous_boundary(frames, current):
+    """Last boundary before current, None before the first one"""
+    i = int(np.searchsorted(frames, current, side='left')) - 1
+    return float(frames[i]) if i >= 0 else None
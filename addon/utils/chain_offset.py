@@ -0,0 +1,63 @@
+import re
+
+import numpy as np
+
+from .fcurve_arrays import shift_keyframes
+
+ROTATION_PROPS = ("rotation_euler", "rotation_quaternion", "rotation_axis_angle")
+BONE_PATH_PATTERN = re.compile(r'^pose\.bones\["((?:[^"\\]|\\.)+)"\]\.(\w+)$')
+
+
+def chain_offsets(count, step, decay=1.0, start=0.0):
+    """Cumulative time offset per chain link
+
+    Link 0 gets start; every following link adds step scaled by decay**k,
+    so decay < 1 makes the lag taper off towards the tip.
+    """
+    if count <= 0:
+        return np.empty(0)
+    increments = step * np.power(decay, np.arange(count - 1, dtype=np.float64))
+    return start + np.concatenate(([0.0], np.cumsum(increments)))
+
+
+def chain_depths(ancestors):
+    """Link index of each item within its own chain of the selection
+
+    ancestors maps every selected item to its ancestors (nearest first).
+    An item's depth is the number of selected ancestors it has, so each
+    chain counts from its own selected root and separate chains selected
+    together (both ears, a branching tail) never shift each other.
+    """
+    selected = set(ancestors)
+    return {item: sum(1 for parent in parents if parent in selected)
+            for item, parents in ancestors.items()}
+
+
+def group_bone_fcurves(action, props):
+    """Map bone name -> fcurves of the given transform properties in one pass"""
+    grouped = {}
+    for fcurve in action.fcurves:
+        match = BONE_PATH_PATTERN.match(fcurve.data_path)
+        if match and match.group(2) in props:
+            grouped.setdefault(match.group(1), []).append(fcurve)
+    return grouped
+
+
+def object_fcurves(action, props):
+    return [fc for fc in action.fcurves if fc.data_path in props]
+
+
+def offset_fcurves(fcurves, offset, use_cycles):
+    """Shift fcurves in time and make them loop with a Cycles modifier or hold their ends
+
+    Holding removes any Cycles modifier already on the curve, which would
+    otherwise keep wrapping the shifted keys.
+    """
+    for fcurve in fcurves:
+        cycles = [mod for mod in fcurve.modifiers if mod.type == 'CYCLES']
+        if use_cycles and not cycles:
+            fcurve.modifiers.new('CYCLES')
+        elif not use_cycles:
+            for mod in cycles:
+                fcurve.modifiers.remove(mod)
+        shift_keyframes(fcurve, offset)
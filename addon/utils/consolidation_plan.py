@@ -0,0 +1,139 @@
+import bpy
+
+# Strip settings carried over to the consolidated copy
+STRIP_SETTINGS = ("blend_in", "blend_out", "blend_type", "extrapolation", "influence")
+
+
+def store_plan(props, rows, remove_original_tracks):
+    """Replace the scene's plan list with plan rows (dicts of plan item fields)"""
+    props.plan.clear()
+    for row in rows:
+        item = props.plan.add()
+        for key, value in row.items():
+            setattr(item, key, value)
+    props.plan_remove_tracks = remove_original_tracks
+    props.active_plan = 0
+
+
+def plan_stack(kind, owner_name):
+    """AnimData holding a plan row's strips, None when the object is gone"""
+    obj = bpy.data.objects.get(owner_name)
+    if obj is None:
+        return None
+    if kind == 'SHAPEKEY':
+        shape_keys = obj.data.shape_keys if obj.type == 'MESH' else None
+        if shape_keys is None:
+            return None
+        return shape_keys.animation_data or shape_keys.animation_data_create()
+    return obj.animation_data or obj.animation_data_create()
+
+
+class PlanApplier:
+    """Executes pending plan rows in batches
+
+    Stacks and consolidated tracks are looked up once and cached. Rows are
+    marked done as they go, so after an error or an interruption a new
+    applier picks up the remaining rows and reuses the tracks created so far.
+    """
+
+    def __init__(self, scene, props):
+        self.scene = scene
+        self.props = props
+        self.applied = 0
+        self.failed = []
+        self._stacks = {}
+        self._tracks = {}
+        self._attempted = set()
+        # (kind, target object) -> consolidated track name from an earlier run
+        self._track_names = {}
+        for item in props.plan:
+            if item.done:
+                self._track_names.setdefault((item.kind, item.target_owner), item.target_track)
+
+    @property
+    def pending(self):
+        return [i for i, item in enumerate(self.props.plan) if not item.done and i not in self._attempted]
+
+    def stack(self, kind, owner_name):
+        key = (kind, owner_name)
+        if key not in self._stacks:
+            self._stacks[key] = plan_stack(kind, owner_name)
+        return self._stacks[key]
+
+    def target_track(self, item):
+        key = (item.kind, item.target_owner)
+        if key in self._tracks:
+            return self._tracks[key]
+        anim_data = self.stack(item.kind, item.target_owner)
+        if anim_data is None:
+            raise RuntimeError(f"{item.target_owner} no longer exists")
+        name = self._track_names.get(key)
+        track = anim_data.nla_tracks.get(name) if name else None
+        if track is None:
+            track = anim_data.nla_tracks.new()
+            track.name = item.target_track
+        self._track_names[key] = track.name
+        self._tracks[key] = track
+        return track
+
+    def apply_item(self, item):
+        anim_data = self.stack(item.kind, item.owner_name)
+        if anim_data is None:
+            raise RuntimeError(f"{item.owner_name} no longer exists")
+        source_track = anim_data.nla_tracks.get(item.source_track)
+        strip = source_track.strips.get(item.name) if source_track else None
+        if strip is None:
+            raise RuntimeError(f"{item.name} not found on {item.source_track}")
+
+        track = self.target_track(item)
+        settings = {attr: getattr(strip, attr) for attr in STRIP_SETTINGS}
+        new_strip = track.strips.new(name=item.name, start=int(item.frame_start), action=strip.action)
+        new_strip.frame_end = item.frame_start + item.duration
+        for attr, value in settings.items():
+            setattr(new_strip, attr, value)
+        source_track.strips.remove(strip)
+        # Strip names are unique per stack, the original name is free again now
+        new_strip.name = item.name
+
+        if item.move_audio and self.scene.sequence_editor:
+            audio = self.scene.sequence_editor.sequences_all.get(item.audio_name)
+            if audio is not None:
+                audio.frame_start = item.audio_frame
+
+        item.target_track = track.name
+        item.done = True
+        item.error = ""
+
+    def apply_batch(self, size=None):
+        """Apply up to size pending rows (all when None), returns how many were tried"""
+        batch = self.pending
+        if size is not None:
+            batch = batch[:size]
+        plan = self.props.plan
+        for i in batch:
+            self._attempted.add(i)
+            item = plan[i]
+            try:
+                self.apply_item(item)
+                self.applied += 1
+            except Exception as e:
+                item.error = str(e)
+                self.failed.append(item.name)
+        return len(batch)
+
+    def remove_original_tracks(self):
+        """Delete every other track on the stacks the plan took strips from"""
+        keep = {}
+        for item in self.props.plan:
+            keep.setdefault(item.kind, set()).add(item.target_track)
+        owners = {(item.kind, item.owner_name) for item in self.props.plan}
+        owners |= {(item.kind, item.target_owner) for item in self.props.plan}
+        removed = 0
+        for kind, owner_name in sorted(owners):
+            anim_data = self.stack(kind, owner_name)
+            if anim_data is None:
+                continue
+            for track in [t for t in anim_data.nla_tracks if t.name not in keep[kind]]:
+                anim_data.nla_tracks.remove(track)
+                removed += 1
+        return removed
@@ -0,0 +1,167 @@
+import csv
+import io
+import os
+import re
+from collections import namedtuple
+
+from .strip_matching import LANGUAGE_SUFFIXES
+
+# One spoken line; start/end are frames from timecode zero, end None when unknown
+Cue = namedtuple("Cue", ["line_id", "start", "end", "text", "character", "sound"])
+
+_SMPTE = re.compile(r'^(\d+):(\d{2}):(\d{2})[:;.](\d{2})$')
+_CLOCK = re.compile(r'^(?:(\d+):)?(\d{1,2}):(\d{2})(?:[.,](\d+))?$')
+_SRT_ARROW = re.compile(r'(\S+)\s*-->\s*(\S+)')
+_EDL_EVENT = re.compile(r'^\s*(\d+)\s+\S+\s+\S+\s+\S+(?:\s+\d+)?\s+'
+                        r'(\S+)\s+(\S+)\s+(\S+)\s+(\S+)\s*$')
+_EDL_CLIP = re.compile(r'^\s*\*\s*(?:FROM CLIP NAME|SOURCE FILE)\s*:\s*(.+?)\s*$', re.IGNORECASE)
+_BRACKET_ID = re.compile(r'^\s*\[([^\]]+)\]\s*')
+
+# Accepted CSV header names per cue field, compared lower-case without spaces/underscores
+_CSV_COLUMNS = {
+    'line_id': ("lineid", "line", "id", "cue", "cueid", "name"),
+    'start': ("start", "in", "tcin", "timecodein", "timecode", "recordin", "frame"),
+    'end': ("end", "out", "tcout", "timecodeout", "recordout"),
+    'text': ("text", "dialogue", "dialog", "line text", "subtitle"),
+    'character': ("character", "char", "charcode", "speaker"),
+    'sound': ("sound", "audio", "file", "filename", "clip"),
+}
+
+
+def parse_timecode(text, fps):
+    """Frames from zero for SMPTE (HH:MM:SS:FF), clock (HH:MM:SS.mmm) or plain frame numbers"""
+    text = text.strip()
+    if not text:
+        raise ValueError("empty timecode")
+    match = _SMPTE.match(text)
+    if match:
+        hours, minutes, seconds, frames = (int(g) for g in match.groups())
+        return (hours * 3600 + minutes * 60 + seconds) * round(fps) + frames
+    match = _CLOCK.match(text)
+    if match:
+        hours, minutes, seconds, fraction = match.groups()
+        total = int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+        if fraction:
+            total += int(fraction) / 10 ** len(fraction)
+        return total * fps
+    return float(text)
+
+
+def _column_map(fieldnames):
+    normalized = {name.strip().lower().replace(" ", "").replace("_", ""): name for name in fieldnames if name}
+    columns = {}
+    for field, aliases in _CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias.replace(" ", "") in normalized:
+                columns[field] = normalized[alias.replace(" ", "")]
+                break
+    return columns
+
+
+def parse_csv(text, fps):
+    """Cues of a CSV/TSV cue sheet with a header row; needs a line id and start column"""
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.DictReader(io.StringIO(text), dialect=dialect)
+    columns = _column_map(reader.fieldnames or ())
+    if 'line_id' not in columns or 'start' not in columns:
+        raise ValueError("CSV cue sheets need a line id and a start column")
+
+    cues = []
+    for row in reader:
+        def value(field):
+            return (row.get(columns[field]) or "").strip() if field in columns else ""
+        if not value('line_id') or not value('start'):
+            continue
+        end = value('end')
+        cues.append(Cue(value('line_id'), parse_timecode(value('start'), fps),
+                        parse_timecode(end, fps) if end else None,
+                        value('text'), value('character').upper(), value('sound')))
+    return cues
+
+
+def parse_srt(text, fps):
+    """Cues of a SubRip file; a leading [ID] in the text is the line id, else the cue number"""
+    cues = []
+    for block in re.split(r'\n\s*\n', text.replace("\r\n", "\n").strip()):
+        lines = [line for line in block.split("\n") if line.strip()]
+        arrow = next((i for i, line in enumerate(lines) if "-->" in line), None)
+        if arrow is None:
+            continue
+        start, end = _SRT_ARROW.search(lines[arrow]).groups()
+        number = lines[arrow - 1].strip() if arrow else str(len(cues) + 1)
+        body = " ".join(line.strip() for line in lines[arrow + 1:])
+        match = _BRACKET_ID.match(body)
+        line_id = match.group(1) if match else number
+        if match:
+            body = body[match.end():]
+        cues.append(Cue(line_id, parse_timecode(start, fps), parse_timecode(end, fps), body, "", ""))
+    return cues
+
+
+def parse_edl(text, fps):
+    """Cues of a CMX3600 EDL, placed at the record in/out; clip names give the line ids"""
+    cues = []
+    for line in text.splitlines():
+        match = _EDL_EVENT.match(line)
+        if match:
+            event, _, _, record_in, record_out = match.groups()
+            cues.append(Cue(event, parse_timecode(record_in, fps), parse_timecode(record_out, fps), "", "", ""))
+            continue
+        match = _EDL_CLIP.match(line)
+        if match and cues:
+            clip = match.group(1)
+            cue = cues[-1]
+            stem = os.path.splitext(os.path.basename(clip))[0]
+            cues[-1] = cue._replace(line_id=stem, sound=clip if not cue.sound else cue.sound)
+    return cues
+
+
+_PARSERS = {
+    ".csv": parse_csv,
+    ".tsv": parse_csv,
+    ".txt": parse_csv,
+    ".srt": parse_srt,
+    ".edl": parse_edl,
+}
+
+
+def read_cue_sheet(path, fps):
+    """Cues of a CSV, SRT or EDL file, by extension"""
+    parser = _PARSERS.get(os.path.splitext(path)[1].lower())
+    if parser is None:
+        raise ValueError(f"Unsupported cue sheet format: {os.path.basename(path)}")
+    with open(path, encoding="utf-8-sig", errors="replace") as handle:
+        return parser(handle.read(), fps)
+
+
+def line_key(line_id, default_code="", default_suffix="", codes=None):
+    """(character code, line number, language suffix) of a line id, None without a number
+
+    'JOH_012_FR', 'joh-12', 'L12' and '12' all resolve; the code and suffix
+    fall back to the defaults when the id doesn't carry them. With codes,
+    only those character codes are recognised, so 'Act_3_Line_12' doesn't
+    read as character ACT.
+    """
+    words = re.findall(r'[A-Za-z]+|\d+', line_id)
+    numbers = [i for i, word in enumerate(words) if word.isdigit()]
+    if not numbers:
+        return None
+    last = numbers[-1]
+    code = next((w.upper() for w in words[:last] if len(w) == 3 and w.isalpha()
+                 and (codes is None or w.upper() in codes)), "")
+    suffix = next((w.upper() for w in words[last + 1:] if w.upper() in LANGUAGE_SUFFIXES), "")
+    return (code or default_code.upper(), int(words[last]), suffix or default_suffix.upper().lstrip("_"))
+
+
+def speech_action_index(actions, parse_name):
+    """{(code, kind, number, suffix): action} of every speech action, built in one pass"""
+    index = {}
+    for action in actions:
+        parts = parse_name(action.name)
+        if parts:
+            key = (parts['char_code'], parts['kind'], parts['number'], parts['suffix'])
+            index.setdefault(key, action)
+    return index
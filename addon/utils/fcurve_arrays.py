@@ -0,0 +1,344 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# KeyframePoint enum values as returned by foreach_get / accepted by foreach_set
+INTERP_CONSTANT = 0
+INTERP_LINEAR = 1
+INTERP_BEZIER = 2
+
+HANDLE_FREE = 0
+HANDLE_AUTO = 1
+HANDLE_VECTOR = 2
+HANDLE_ALIGNED = 3
+HANDLE_AUTO_CLAMPED = 4
+
+# Rough in-memory sizes of Blender's DNA structs, used for size estimates
+BEZTRIPLE_BYTES = 72
+FCURVE_BYTES = 160
+
+# Rest values of the common animated channels (data_path suffix -> per-index default)
+CHANNEL_DEFAULTS = {
+    "location": (0.0, 0.0, 0.0),
+    "rotation_euler": (0.0, 0.0, 0.0),
+    "rotation_quaternion": (1.0, 0.0, 0.0, 0.0),
+    "rotation_axis_angle": (0.0, 0.0, 1.0, 0.0),
+    "scale": (1.0, 1.0, 1.0),
+    "delta_location": (0.0, 0.0, 0.0),
+    "delta_rotation_euler": (0.0, 0.0, 0.0),
+    "delta_rotation_quaternion": (1.0, 0.0, 0.0, 0.0),
+    "delta_scale": (1.0, 1.0, 1.0),
+    "value": (0.0,),
+    "influence": (1.0,),
+}
+
+# Change per property treated as one unit of pose difference, in its own units
+# (shape key value, scene units, radians), so channels of different kinds compare
+CHANNEL_SCALES = {
+    "value": 0.5,
+    "location": 0.02,
+    "rotation_euler": 0.35,
+    "rotation_quaternion": 0.17,
+    "rotation_axis_angle": 0.35,
+    "scale": 0.2,
+}
+
+KeyframeArrays = namedtuple("KeyframeArrays", [
+    "frames", "values", "handle_left", "handle_right", "interpolation",
+    "handle_left_type", "handle_right_type", "easing", "key_type",
+    "back", "amplitude", "period",
+])
+
+_FULL_FIELDS = (
+    ("handle_left_type", np.int32),
+    ("handle_right_type", np.int32),
+    ("easing", np.int32),
+    ("type", np.int32),
+    ("back", np.float32),
+    ("amplitude", np.float32),
+    ("period", np.float32),
+)
+
+
+def channel_default(data_path, index):
+    """Return the rest value for a channel, 0.0 when unknown"""
+    prop = data_path.rsplit(".", 1)[-1]
+    defaults = CHANNEL_DEFAULTS.get(prop)
+    if defaults and 0 <= index < len(defaults):
+        return defaults[index]
+    return 0.0
+
+
+def channel_scale(data_path):
+    """Unit of pose difference for a channel, 1.0 when unknown"""
+    return CHANNEL_SCALES.get(data_path.rsplit(".", 1)[-1], 1.0)
+
+
+def read_keyframes(fcurve, full=False):
+    """Read all keyframes of an fcurve with bulk foreach_get calls
+
+    With full=False only the data needed for evaluation is read and the
+    remaining fields are None.
+    """
+    kps = fcurve.keyframe_points
+    count = len(kps)
+
+    co = np.empty(count * 2, dtype=np.float32)
+    hl = np.empty(count * 2, dtype=np.float32)
+    hr = np.empty(count * 2, dtype=np.float32)
+    interp = np.empty(count, dtype=np.int32)
+    kps.foreach_get("co", co)
+    kps.foreach_get("handle_left", hl)
+    kps.foreach_get("handle_right", hr)
+    kps.foreach_get("interpolation", interp)
+
+    extra = {}
+    if full:
+        for attr, dtype in _FULL_FIELDS:
+            buf = np.empty(count, dtype=dtype)
+            kps.foreach_get(attr, buf)
+            extra[attr] = buf
+
+    co = co.astype(np.float64)
+    return KeyframeArrays(
+        frames=co[0::2],
+        values=co[1::2],
+        handle_left=hl.astype(np.float64).reshape(-1, 2),
+        handle_right=hr.astype(np.float64).reshape(-1, 2),
+        interpolation=interp,
+        handle_left_type=extra.get("handle_left_type"),
+        handle_right_type=extra.get("handle_right_type"),
+        easing=extra.get("easing"),
+        key_type=extra.get("type"),
+        back=extra.get("back"),
+        amplitude=extra.get("amplitude"),
+        period=extra.get("period"),
+    )
+
+
+def subset_keyframes(keys, mask):
+    """Return a KeyframeArrays holding only the keys selected by mask"""
+    return KeyframeArrays(*(None if field is None else field[mask] for field in keys))
+
+
+def write_keyframes(fcurve, keys):
+    """Replace all keyframes of an fcurve in one bulk write
+
+    keys is a KeyframeArrays; fields left as None fall back to Bezier keys
+    with auto-clamped handles, which fcurve.update() then recalculates.
+    """
+    kps = fcurve.keyframe_points
+    count = len(keys.frames)
+    kps.clear()
+    if count == 0:
+        return
+    kps.add(count)
+
+    co = np.empty(count * 2, dtype=np.float32)
+    co[0::2] = keys.frames
+    co[1::2] = keys.values
+    kps.foreach_set("co", co)
+
+    interp = keys.interpolation
+    if interp is None:
+        interp = np.full(count, INTERP_BEZIER, dtype=np.int32)
+    kps.foreach_set("interpolation", np.asarray(interp, dtype=np.int32))
+
+    if keys.handle_left is not None and keys.handle_right is not None:
+        kps.foreach_set("handle_left", np.asarray(keys.handle_left, dtype=np.float32).ravel())
+        kps.foreach_set("handle_right", np.asarray(keys.handle_right, dtype=np.float32).ravel())
+
+    for attr, dtype in _FULL_FIELDS:
+        value = getattr(keys, "key_type" if attr == "type" else attr)
+        if value is not None:
+            kps.foreach_set(attr, np.asarray(value, dtype=dtype))
+
+    if keys.handle_left_type is None:
+        handle_types = np.full(count, HANDLE_AUTO_CLAMPED, dtype=np.int32)
+        kps.foreach_set("handle_left_type", handle_types)
+        kps.foreach_set("handle_right_type", handle_types)
+
+    fcurve.update()
+
+
+def write_sampled_keyframes(fcurve, frames, values, interpolation=None):
+    """Write densely sampled values as keys with auto-clamped handles
+
+    interpolation holds one mode per sample; None writes Bezier keys.
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    write_keyframes(fcurve, KeyframeArrays(frames, values, None, None, interpolation, *([None] * 7)))
+
+
+def sample_interpolation(keys, frames):
+    """Interpolation of the source segment each frame falls in
+
+    Easing modes become Bezier, since dense samples already carry their shape.
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    if len(keys.frames) == 0:
+        return np.full(len(frames), INTERP_BEZIER, dtype=np.int32)
+    seg = np.clip(np.searchsorted(keys.frames, frames, side='right') - 1, 0, len(keys.frames) - 1)
+    return np.minimum(keys.interpolation[seg], INTERP_BEZIER).astype(np.int32)
+
+
+def shift_keyframes(fcurve, offset):
+    """Move every key and handle of an fcurve in time by offset frames"""
+    kps = fcurve.keyframe_points
+    count = len(kps)
+    if count == 0 or offset == 0:
+        return
+    for attr in ("co", "handle_left", "handle_right"):
+        buf = np.empty(count * 2, dtype=np.float32)
+        kps.foreach_get(attr, buf)
+        buf[0::2] += offset
+        kps.foreach_set(attr, buf)
+    fcurve.update()
+
+
+def _bezier_segments(keys, seg, frames):
+    """Evaluate Bezier segments seg (left key index per sample) at frames"""
+    x0 = keys.frames[seg]
+    y0 = keys.values[seg]
+    x3 = keys.frames[seg + 1]
+    y3 = keys.values[seg + 1]
+    x1, y1 = keys.handle_right[seg, 0], keys.handle_right[seg, 1]
+    x2, y2 = keys.handle_left[seg + 1, 0], keys.handle_left[seg + 1, 1]
+
+    # Clamp handle lengths like Blender so x(t) is monotonic over the segment
+    seg_len = x3 - x0
+    len1 = np.abs(x0 - x1)
+    len2 = np.abs(x3 - x2)
+    total = len1 + len2
+    fac = np.where(total > seg_len, seg_len / np.where(total > 0.0, total, 1.0), 1.0)
+    x1 = x0 - fac * (x0 - x1)
+    y1 = y0 - fac * (y0 - y1)
+    x2 = x3 - fac * (x3 - x2)
+    y2 = y3 - fac * (y3 - y2)
+
+    # Solve x(t) == frame by bisection, vectorized over all samples
+    lo = np.zeros_like(frames)
+    hi = np.ones_like(frames)
+    for _ in range(32):
+        t = (lo + hi) * 0.5
+        mt = 1.0 - t
+        x = mt * mt * mt * x0 + 3.0 * mt * mt * t * x1 + 3.0 * mt * t * t * x2 + t * t * t * x3
+        below = x < frames
+        lo = np.where(below, t, lo)
+        hi = np.where(below, hi, t)
+    t = (lo + hi) * 0.5
+    mt = 1.0 - t
+    return mt * mt * mt * y0 + 3.0 * mt * mt * t * y1 + 3.0 * mt * t * t * y2 + t * t * t * y3
+
+
+def evaluate_keyframes(keys, frames, extrapolation='CONSTANT'):
+    """Evaluate keyframe arrays at many frames at once
+
+    Supports CONSTANT, LINEAR and BEZIER interpolation plus the fcurve's
+    CONSTANT/LINEAR extrapolation. Easing interpolation modes are treated as
+    Bezier; use evaluate_fcurve() to fall back to Blender for those.
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    count = len(keys.frames)
+    if count == 0:
+        return np.zeros_like(frames)
+    if count == 1:
+        return np.full_like(frames, keys.values[0])
+
+    kf = keys.frames
+    kv = keys.values
+    seg = np.clip(np.searchsorted(kf, frames, side='right') - 1, 0, count - 2)
+    x0 = kf[seg]
+    x1 = kf[seg + 1]
+    span = np.where(x1 > x0, x1 - x0, 1.0)
+    t = np.clip((frames - x0) / span, 0.0, 1.0)
+
+    ipo = keys.interpolation[seg]
+    result = kv[seg] + (kv[seg + 1] - kv[seg]) * t
+
+    const_mask = ipo == INTERP_CONSTANT
+    if const_mask.any():
+        result[const_mask] = kv[seg[const_mask]]
+
+    bez_mask = ipo >= INTERP_BEZIER
+    if bez_mask.any():
+        result[bez_mask] = _bezier_segments(keys, seg[bez_mask], frames[bez_mask])
+
+    # Exact key hits at the far end of a CONSTANT segment take the key's own value
+    at_last = frames >= kf[-1]
+    result[at_last] = kv[-1]
+
+    before = frames < kf[0]
+    if before.any():
+        result[before] = kv[0]
+        if extrapolation == 'LINEAR' and keys.interpolation[0] != INTERP_CONSTANT:
+            if keys.interpolation[0] == INTERP_LINEAR:
+                dx, dy = kf[1] - kf[0], kv[1] - kv[0]
+            else:
+                dx = kf[0] - keys.handle_left[0, 0]
+                dy = kv[0] - keys.handle_left[0, 1]
+            if dx != 0.0:
+                result[before] = kv[0] + (frames[before] - kf[0]) * (dy / dx)
+
+    after = frames > kf[-1]
+    if after.any() and extrapolation == 'LINEAR' and keys.interpolation[-2] != INTERP_CONSTANT:
+        if keys.interpolation[-2] == INTERP_LINEAR:
+            dx, dy = kf[-1] - kf[-2], kv[-1] - kv[-2]
+        else:
+            dx = keys.handle_right[-1, 0] - kf[-1]
+            dy = keys.handle_right[-1, 1] - kv[-1]
+        if dx != 0.0:
+            result[after] = kv[-1] + (frames[after] - kf[-1]) * (dy / dx)
+
+    return result
+
+
+def needs_blender_evaluation(fcurve, keys=None):
+    """True when an fcurve uses features evaluate_keyframes() doesn't model"""
+    if len(fcurve.modifiers):
+        return True
+    if keys is None:
+        keys = read_keyframes(fcurve)
+    return bool(len(keys.interpolation) and keys.interpolation.max() > INTERP_BEZIER)
+
+
+def evaluate_fcurve(fcurve, frames, keys=None):
+    """Evaluate an fcurve at many frames, vectorized where possible"""
+    frames = np.asarray(frames, dtype=np.float64)
+    if keys is None:
+        keys = read_keyframes(fcurve)
+    if needs_blender_evaluation(fcurve, keys):
+        evaluate = fcurve.evaluate
+        return np.fromiter((evaluate(f) for f in frames), dtype=np.float64, count=len(frames))
+    return evaluate_keyframes(keys, frames, fcurve.extrapolation)
+
+
+def read_action(action):
+    """Bulk-read every fcurve of an action -> {(data_path, index): (fcurve, keys)}"""
+    return {
+        (fc.data_path, fc.array_index): (fc, read_keyframes(fc))
+        for fc in action.fcurves
+    }
+
+
+def estimate_fcurve_bytes(fcurve, key_count=None):
+    """Approximate memory held by one fcurve and its keyframes"""
+    if key_count is None:
+        key_count = len(fcurve.keyframe_points)
+    return FCURVE_BYTES + len(fcurve.data_path) + key_count * BEZTRIPLE_BYTES
+
+
+def time_fcurve_evaluation(fcurves, frames):
+    """Seconds per frame Blender spends evaluating the given fcurves"""
+    fcurves = list(fcurves)
+    frames = list(frames)
+    if not fcurves or not frames:
+        return 0.0
+    start = time.perf_counter()
+    for fcurve in fcurves:
+        evaluate = fcurve.evaluate
+        for frame in frames:
+            evaluate(frame)
+    return (time.perf_counter() - start) / len(frames)
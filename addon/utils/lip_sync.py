@@ -0,0 +1,137 @@
+import re
+
+import numpy as np
+
+from .fcurve_arrays import evaluate_fcurve, read_keyframes
+
+# Bone and shape key names that drive the mouth
+MOUTH_KEYWORDS = ("jaw", "lip", "mouth", "teeth", "tongue", "viseme", "chin")
+_QUOTED_NAME = re.compile(r'\["((?:[^"\\]|\\.)+)"\]')
+# Word boundaries inside a name: camel case humps and acronym ends
+_CAMEL_BREAK = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+_SEPARATORS = re.compile(r'[^A-Za-z0-9]+')
+
+
+def parse_keywords(text):
+    """Comma separated channel keywords, the mouth defaults when empty"""
+    keywords = tuple(word.strip().lower() for word in text.split(",") if word.strip())
+    return keywords or MOUTH_KEYWORDS
+
+
+def name_tokens(name):
+    """Lower-case words of a bone or shape key name
+
+    Splits on separators (_ . - spaces) and camel case, so "LeftForeArm"
+    gives left, fore, arm and "lip.T.L" gives lip, t, l.
+    """
+    return [word.lower() for part in _SEPARATORS.split(name)
+            for word in _CAMEL_BREAK.split(part) if word]
+
+
+def is_mouth_channel(data_path, keywords=MOUTH_KEYWORDS):
+    """Whether a word of the channel's name starts with one of the keywords
+
+    Matching word starts keeps "ear" off forearms and "lid" off sliders,
+    while "lips" and "eyelid" still match "lip" and "eye".
+    """
+    match = _QUOTED_NAME.search(data_path)
+    if not match:
+        return False
+    tokens = name_tokens(match.group(1))
+    return any(token.startswith(keyword) for token in tokens for keyword in keywords)
+
+
+def mouth_fcurves(action, keywords=MOUTH_KEYWORDS):
+    """Mouth-related fcurves of a rig or shape key action, every fcurve if none match"""
+    fcurves = [fc for fc in action.fcurves if not fc.mute]
+    mouth = [fc for fc in fcurves if is_mouth_channel(fc.data_path, keywords)]
+    return mouth or fcurves
+
+
+def motion_curve(action, frames=None, keywords=MOUTH_KEYWORDS):
+    """(frames, activity) of the mouth channels, 0..1 per frame
+
+    Activity is the largest deviation of any mouth channel from its value on
+    the first frame, each channel scaled by its own range so rotations,
+    locations and shape key values weigh the same.
+    """
+    if frames is None:
+        start, end = action.frame_range
+        frames = np.arange(np.floor(start), np.ceil(end) + 1.0)
+    frames = np.asarray(frames, dtype=np.float64)
+    fcurves = mouth_fcurves(action, keywords)
+    if not fcurves or not len(frames):
+        return frames, np.zeros(len(frames))
+
+    values = np.vstack([evaluate_fcurve(fc, frames, read_keyframes(fc)) for fc in fcurves])
+    deviation = np.abs(values - values[:, :1])
+    ranges = values.max(axis=1, keepdims=True) - values.min(axis=1, keepdims=True)
+    scaled = deviation / np.where(ranges > 1e-6, ranges, np.inf)
+    return frames, scaled.max(axis=0)
+
+
+def first_above(values, threshold):
+    """Index of the first value above threshold, None if there is none"""
+    above = np.flatnonzero(values > threshold)
+    return int(above[0]) if len(above) else None
+
+
+def motion_onset(action, threshold=0.05):
+    """Action frame where the mouth starts moving, None for a still action"""
+    frames, activity = motion_curve(action)
+    index = first_above(activity, threshold)
+    return None if index is None else float(frames[index])
+
+
+def speech_onset(values, threshold=0.1):
+    """Index of the first frame louder than threshold x the clip's peak"""
+    if not len(values):
+        return None
+    return first_above(values, threshold * float(values.max()))
+
+
+def strip_frame_of_action_frame(strip, action_frame):
+    """Frames from the strip start to where an action frame plays (first repeat)"""
+    scale = abs(strip.scale) or 1.0
+    if strip.use_reverse:
+        return (strip.action_frame_end - action_frame) * scale
+    return (action_frame - strip.action_frame_start) * scale
+
+
+def batch_cross_correlate(motions, audios, max_lag):
+    """Best lag and confidence for many motion/audio signal pairs with one batched FFT
+
+    audios[i] must cover motions[i] plus max_lag frames on both sides. A
+    positive lag means the audio happens later than the motion, so the
+    strip should move later by that many frames. Confidence is the Pearson
+    correlation at the best lag.
+    """
+    count = len(motions)
+    width = 2 * max_lag + 1
+    if count == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    longest = max(len(m) for m in motions) + max(len(a) for a in audios)
+    size = 1 << int(np.ceil(np.log2(max(longest, 2))))
+    motion_batch = np.zeros((count, size))
+    audio_batch = np.zeros((count, size))
+    for i, (motion, audio) in enumerate(zip(motions, audios)):
+        motion_batch[i, :len(motion)] = motion - motion.mean()
+        audio_batch[i, :len(audio)] = audio - audio.mean()
+
+    spectrum = np.conj(np.fft.rfft(motion_batch, axis=1)) * np.fft.rfft(audio_batch, axis=1)
+    correlation = np.fft.irfft(spectrum, n=size, axis=1)[:, :width]
+
+    lags = np.zeros(count, dtype=np.int64)
+    confidence = np.zeros(count)
+    for i, motion in enumerate(motions):
+        motion_norm = np.sqrt(np.sum(motion_batch[i, :len(motion)] ** 2))
+        if motion_norm <= 1e-9:
+            continue
+        energy = np.concatenate(([0.0], np.cumsum(audio_batch[i] ** 2)))
+        window = np.sqrt(energy[len(motion):len(motion) + width] - energy[:width])
+        scores = correlation[i] / (motion_norm * np.where(window > 1e-9, window, np.inf))
+        best = int(np.argmax(scores))
+        lags[i] = best - max_lag
+        confidence[i] = scores[best]
+    return lags, confidence
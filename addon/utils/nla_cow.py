@@ -0,0 +1,192 @@
+import bpy
+
+from .anim_data import iter_animation_data
+
+# Action custom property: the action is shared copy-on-write, holds the suffix for private copies
+COW_SHARED_PROP = "ah_cow_suffix"
+# Action custom property marking a private copy kept alive by a fake user
+PRIVATE_COPY_PROP = "ah_private_copy"
+
+
+def private_copy(action, suffix):
+    """Independent copy of an action, protected by a fake user"""
+    copy = action.copy()
+    copy.name = f"{action.name}{suffix}"
+    copy.use_fake_user = True
+    copy[PRIVATE_COPY_PROP] = action.name
+    if COW_SHARED_PROP in copy:
+        del copy[COW_SHARED_PROP]
+    return copy
+
+
+def mark_copy_on_write(action, suffix):
+    """Share an action copy-on-write: whichever strip playing it is edited gets a copy
+
+    The mark lives on the action, so renaming or moving tracks and strips
+    never loses it.
+    """
+    action[COW_SHARED_PROP] = suffix
+
+
+def strip_action_shared(strip):
+    """True if any other strip plays the same action"""
+    action = strip.action
+    if action is None:
+        return False
+    for anim_data in iter_animation_data():
+        for track in anim_data.nla_tracks:
+            for other in track.strips:
+                if other.action == action and other != strip:
+                    return True
+    return False
+
+
+def needs_private_copy(strip):
+    """True for a strip whose copy-on-write action another strip still plays"""
+    return strip.action is not None and COW_SHARED_PROP in strip.action and strip_action_shared(strip)
+
+
+def ensure_private_action(strip):
+    """Give a strip its own copy of a copy-on-write action before it is edited
+
+    Returns True when a copy was made. Strip actions can't be relinked in
+    tweak mode, so callers must leave it; private_tweak_action() does that
+    for the strip being tweaked.
+    """
+    if not needs_private_copy(strip):
+        return False
+    strip.action = private_copy(strip.action, strip.action[COW_SHARED_PROP])
+    return True
+
+
+def _tweaked_strip(anim_data):
+    for track in anim_data.nla_tracks:
+        if not track.active:
+            continue
+        for strip in track.strips:
+            if strip.active and strip.action == anim_data.action:
+                return track, strip
+    return None, None
+
+
+def private_tweak_action(anim_data):
+    """Action an operator may edit on this animation data, copied first if shared
+
+    Outside tweak mode this is the active action. In tweak mode a strip
+    sharing its action copy-on-write is relinked to a private copy, on
+    whichever side of the duplication it sits.
+    """
+    if anim_data is None:
+        return None
+    if anim_data.use_tweak_mode:
+        _, strip = _tweaked_strip(anim_data)
+        if strip is not None and needs_private_copy(strip):
+            anim_data.use_tweak_mode = False
+            ensure_private_action(strip)
+            anim_data.use_tweak_mode = True
+            print(f"Copy-on-write: '{strip.name}' now uses {strip.action.name}")
+    return anim_data.action
+
+
+def release_unused_copies():
+    """Drop the fake user of private copies no strip plays any more"""
+    released = 0
+    for action in bpy.data.actions:
+        if PRIVATE_COPY_PROP in action and action.use_fake_user and action.users == 1:
+            action.use_fake_user = False
+            released += 1
+    return released
+
+
+# (ID type, ID name) -> strip count last seen, to notice deleted tracks and strips
+_strip_counts = {}
+# (ID type, ID name) -> name of the tweaked action already checked
+_resolved_tweaks = {}
+_pending_tweaks = set()
+_pending_release = False
+
+
+def _id_key(id_data):
+    return (type(id_data).__name__, id_data.name)
+
+
+def _id_from_key(key):
+    kind, name = key
+    collection = bpy.data.shape_keys if kind == "Key" else bpy.data.objects
+    return collection.get(name)
+
+
+def _process_pending():
+    """Timer callback: relink tweaked shared strips and release unused copies
+
+    Runs outside any operator, so each change gets its own undo step.
+    """
+    global _pending_release
+    keys = list(_pending_tweaks)
+    _pending_tweaks.clear()
+
+    changed = False
+    for key in keys:
+        id_data = _id_from_key(key)
+        anim_data = id_data.animation_data if id_data else None
+        if not anim_data or not anim_data.use_tweak_mode:
+            continue
+        try:
+            before = anim_data.action
+            private_tweak_action(anim_data)
+            changed |= anim_data.action != before
+        except Exception as e:
+            print(f"Copy-on-write failed on {key[1]}: {str(e)}")
+        if anim_data.action is not None:
+            _resolved_tweaks[key] = anim_data.action.name
+
+    if _pending_release:
+        _pending_release = False
+        changed |= release_unused_copies() > 0
+
+    if changed:
+        try:
+            bpy.ops.ed.undo_push(message="Copy-on-Write")
+        except RuntimeError as e:
+            print(f"Copy-on-write undo push failed: {str(e)}")
+    return None
+
+
+def queue_cow_from_depsgraph(depsgraph):
+    """Watch animation data for tweaked copy-on-write strips and deleted strips
+
+    Relinking strips from inside a depsgraph handler is unsafe, so the work
+    runs from a one-shot timer.
+    """
+    global _pending_release
+    found = False
+    for update in depsgraph.updates:
+        id_data = getattr(update.id, "original", update.id)
+        if not isinstance(id_data, (bpy.types.Object, bpy.types.Key)):
+            continue
+        anim_data = id_data.animation_data
+        key = _id_key(id_data)
+        count = sum(len(track.strips) for track in anim_data.nla_tracks) if anim_data else 0
+
+        previous = _strip_counts.get(key)
+        _strip_counts[key] = count
+        if previous is not None and count < previous:
+            _pending_release = True
+            found = True
+
+        if not anim_data or not anim_data.use_tweak_mode:
+            _resolved_tweaks.pop(key, None)
+            continue
+        tweaked = anim_data.action
+        if (key not in _pending_tweaks and tweaked is not None and COW_SHARED_PROP in tweaked
+                and _resolved_tweaks.get(key) != tweaked.name):
+            _pending_tweaks.add(key)
+            found = True
+
+    if found and not bpy.app.timers.is_registered(_process_pending):
+        bpy.app.timers.register(_process_pending, first_interval=0.0)
+
+
+def clear_snapshots():
+    _strip_counts.clear()
+    _resolved_tweaks.clear()
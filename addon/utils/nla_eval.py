@@ -0,0 +1,315 @@
+import numpy as np
+
+from .fcurve_arrays import channel_default, evaluate_fcurve, read_action, write_sampled_keyframes
+
+MIX_ADD = 'ADD'
+MIX_MULTIPLY = 'MULTIPLY'
+MIX_QUATERNION = 'QUATERNION'
+
+_MULTIPLY_PROPS = {"scale", "delta_scale"}
+_QUATERNION_PROPS = {"rotation_quaternion", "delta_rotation_quaternion"}
+
+
+def mix_mode(data_path):
+    """How COMBINE blending treats a channel, following Blender's rules"""
+    prop = data_path.rsplit(".", 1)[-1]
+    if prop in _QUATERNION_PROPS:
+        return MIX_QUATERNION
+    if prop in _MULTIPLY_PROPS:
+        return MIX_MULTIPLY
+    return MIX_ADD
+
+
+def blend_values(blend_type, lower, upper, influence, mode=MIX_ADD, default=0.0):
+    """Blend one channel of an upper strip onto the lower stack result"""
+    if blend_type == 'ADD':
+        return lower + upper * influence
+    if blend_type == 'SUBTRACT':
+        return lower - upper * influence
+    if blend_type == 'MULTIPLY':
+        return influence * (lower * upper) + (1.0 - influence) * lower
+    if blend_type == 'COMBINE':
+        if mode == MIX_MULTIPLY:
+            base = default if default != 0.0 else 1.0
+            return lower * np.power(upper / base, influence)
+        return lower + (upper - default) * influence
+    return lower * (1.0 - influence) + upper * influence
+
+
+def combine_quaternions(lower, upper, influence):
+    """COMBINE blend of (n, 4) quaternions: lower * normalized(upper) ** influence"""
+    norm = np.linalg.norm(upper, axis=1, keepdims=True)
+    upper = upper / np.where(norm > 0.0, norm, 1.0)
+    angle = influence * np.arccos(np.clip(upper[:, 0], -1.0, 1.0))
+    axis = upper[:, 1:]
+    axis_len = np.linalg.norm(axis, axis=1, keepdims=True)
+    axis = axis / np.where(axis_len > 0.0, axis_len, 1.0) * np.sin(angle)[:, None]
+    w2, v2 = np.cos(angle), axis
+
+    w1, v1 = lower[:, 0], lower[:, 1:]
+    out = np.empty_like(lower)
+    out[:, 0] = w1 * w2 - np.einsum('ij,ij->i', v1, v2)
+    out[:, 1:] = w1[:, None] * v2 + w2[:, None] * v1 + np.cross(v1, v2)
+    return out
+
+
+def strip_action_time(strip, frames):
+    """Map scene frames inside a strip to frames of its action"""
+    if strip.use_animated_time:
+        fcurve = strip.fcurves.find("strip_time")
+        if fcurve is not None:
+            times = evaluate_fcurve(fcurve, frames)
+            if strip.use_animated_time_cyclic:
+                length = strip.action_frame_end - strip.action_frame_start or 1.0
+                times = strip.action_frame_start + np.mod(times - strip.action_frame_start, length)
+            return times
+
+    scale = abs(strip.scale) or 1.0
+    act_start = strip.action_frame_start
+    act_end = strip.action_frame_end
+    length = act_end - act_start or 1.0
+    offset = np.fmod(frames - strip.frame_start, length * scale) / scale
+
+    # The last frame of a whole number of repeats shows the action end, not its start
+    at_end = np.isclose(frames, strip.frame_end) if strip.repeat == np.floor(strip.repeat) else False
+    if strip.use_reverse:
+        return np.where(at_end, act_start, act_end - offset)
+    return np.where(at_end, act_end, act_start + offset)
+
+
+def strip_influence(strip, frames):
+    """Influence per frame from animated influence or blend in/out"""
+    if strip.use_animated_influence:
+        fcurve = strip.fcurves.find("influence")
+        if fcurve is not None:
+            return np.maximum(evaluate_fcurve(fcurve, frames), 0.0)
+        return np.full_like(frames, strip.influence)
+
+    influence = np.ones_like(frames)
+    if strip.blend_out:
+        mask = frames >= strip.frame_end - strip.blend_out
+        influence[mask] = np.abs(strip.frame_end - frames[mask]) / strip.blend_out
+    if strip.blend_in:
+        mask = frames <= strip.frame_start + strip.blend_in
+        influence[mask] = np.abs(frames[mask] - strip.frame_start) / strip.blend_in
+    return influence
+
+
+def track_strip_map(strips, frames):
+    """Strip index evaluated at each frame (-1 for none) and the strip-local frame
+
+    Mirrors Blender: inside a strip that strip plays; after it, the nearest
+    previous strip holds unless its extrapolation is NOTHING; before the
+    first strip only HOLD extends backwards.
+    """
+    count = len(strips)
+    selected = np.full(len(frames), -1, dtype=np.int64)
+    local = frames.copy()
+    if count == 0:
+        return selected, local
+
+    starts = np.array([s.frame_start for s in strips])
+    ends = np.array([s.frame_end for s in strips])
+    holds = np.array([s.extrapolation != 'NOTHING' for s in strips])
+
+    idx = np.searchsorted(starts, frames, side='right') - 1
+    # A frame shared by one strip's end and the next one's start belongs to the earlier strip
+    earlier = (idx > 0) & (frames <= ends[np.maximum(idx - 1, 0)])
+    idx = np.where(earlier, idx - 1, idx)
+
+    valid = idx >= 0
+    safe = np.maximum(idx, 0)
+    inside = valid & (frames <= ends[safe])
+    after = valid & ~inside & holds[safe]
+    before = ~valid & (strips[0].extrapolation == 'HOLD')
+
+    selected[inside | after] = idx[inside | after]
+    local[after] = ends[idx[after]]
+    selected[before] = 0
+    local[before] = starts[0]
+    return selected, local
+
+
+class _NoStripFCurves:
+    @staticmethod
+    def find(data_path, index=0):
+        return None
+
+
+class _ActiveActionStrip:
+    """The active action seen as the top strip, like Blender's NLA dummy strip"""
+
+    type = 'CLIP'
+    mute = False
+    scale = 1.0
+    repeat = 1.0
+    use_reverse = False
+    use_animated_time = False
+    use_animated_time_cyclic = False
+    use_animated_influence = True
+    blend_in = 0.0
+    blend_out = 0.0
+    fcurves = _NoStripFCurves()
+
+    def __init__(self, anim_data):
+        action = anim_data.action
+        self.action = action
+        self.name = action.name
+        if any(len(fc.modifiers) for fc in action.fcurves):
+            # Modifiers such as Cycles give the action an unbounded range
+            start, end = -1.0e9, 1.0e9
+        else:
+            start, end = action.frame_range
+        self.frame_start = self.action_frame_start = start
+        self.frame_end = self.action_frame_end = end if end > start else start + 1.0
+        self.extrapolation = anim_data.action_extrapolation
+        self.blend_type = anim_data.action_blend_type
+        self.influence = anim_data.action_influence
+
+
+class NLAStackEvaluator:
+    """Evaluate an NLA stack from action fcurves only, vectorized over frames
+
+    No constraints, drivers or other objects are involved, so the result is
+    the pure NLA output: the values Blender writes to the animated
+    properties before the rest of the depsgraph runs.
+    """
+
+    def __init__(self, anim_data, include_action=True, track_names=None):
+        self.anim_data = anim_data
+        self.include_action = include_action
+        self.track_names = set(track_names) if track_names else None
+        self.unsupported = []
+        self._actions = {}
+
+    def _channels(self, action):
+        key = action.name
+        if key not in self._actions:
+            self._actions[key] = {k: v for k, v in read_action(action).items() if not v[0].mute}
+        return self._actions[key]
+
+    def layers(self):
+        """Strip lists from bottom to top that take part in evaluation"""
+        tracks = list(self.anim_data.nla_tracks)
+        if self.track_names is not None:
+            # Explicitly named tracks are evaluated on their own, muted or not
+            return [sorted(track.strips, key=lambda s: s.frame_start)
+                    for track in tracks if track.name in self.track_names]
+        solo = [track for track in tracks if track.is_solo]
+        if solo:
+            tracks = solo
+        layers = [sorted(track.strips, key=lambda s: s.frame_start) for track in tracks if not track.mute]
+        if self.include_action and self.anim_data.action and not solo:
+            layers.append([_ActiveActionStrip(self.anim_data)])
+        return layers
+
+    def evaluate(self, frames):
+        """{(data_path, index): values} for every channel the stack animates"""
+        frames = np.asarray(frames, dtype=np.float64)
+        result = {}
+        for strips in self.layers():
+            selected, local = track_strip_map(strips, frames)
+            for i, strip in enumerate(strips):
+                mask = selected == i
+                if not mask.any() or strip.mute:
+                    continue
+                if strip.type != 'CLIP' or strip.action is None:
+                    if strip.type != 'SOUND':
+                        self.unsupported.append(strip.name)
+                    continue
+                self._blend_strip(result, strip, mask, local[mask], len(frames))
+        return result
+
+    def _blend_strip(self, result, strip, mask, local, frame_count):
+        times = strip_action_time(strip, local)
+        influence = strip_influence(strip, local)
+        channels = self._channels(strip.action)
+        blend_type = strip.blend_type
+
+        quaternions = {}
+        for (data_path, index), (fcurve, keys) in channels.items():
+            upper = evaluate_fcurve(fcurve, times, keys)
+            mode = mix_mode(data_path)
+            if blend_type == 'COMBINE' and mode == MIX_QUATERNION:
+                quaternions.setdefault(data_path, {})[index] = upper
+                continue
+            default = channel_default(data_path, index)
+            channel = result.setdefault((data_path, index), np.full(frame_count, default))
+            channel[mask] = blend_values(blend_type, channel[mask], upper, influence, mode, default)
+
+        for data_path, components in quaternions.items():
+            upper = np.empty((len(times), 4))
+            lower = np.empty((len(times), 4))
+            for index in range(4):
+                default = channel_default(data_path, index)
+                upper[:, index] = components.get(index, default)
+                channel = result.setdefault((data_path, index), np.full(frame_count, default))
+                lower[:, index] = channel[mask]
+            blended = combine_quaternions(lower, upper, influence)
+            for index in range(4):
+                result[(data_path, index)][mask] = blended[:, index]
+
+
+def nla_frame_range(anim_data, track_names=None):
+    """First strip start and last strip end over all unmuted (or the named) tracks"""
+    starts = []
+    ends = []
+    for track in anim_data.nla_tracks:
+        if track_names is not None:
+            if track.name not in track_names:
+                continue
+        elif track.mute:
+            continue
+        for strip in track.strips:
+            starts.append(strip.frame_start)
+            ends.append(strip.frame_end)
+    if not starts:
+        return None
+    return min(starts), max(ends)
+
+
+def _group_name(data_path):
+    if data_path.startswith('pose.bones["'):
+        return data_path.split('"')[1]
+    return ""
+
+
+def write_flat_action(action, channels, frames):
+    """Write evaluated channels into an action as sampled keys"""
+    for (data_path, index), values in sorted(channels.items()):
+        fcurve = action.fcurves.find(data_path, index=index)
+        if fcurve is None:
+            fcurve = action.fcurves.new(data_path, index=index, action_group=_group_name(data_path))
+        write_sampled_keyframes(fcurve, frames, values)
+    return action
+
+
+def compare_with_blender(scene, owner, channels, frames, sample_count=5):
+    """Largest difference between the evaluated channels and Blender's NLA result
+
+    Sets a few frames on the scene and reads the animated properties back.
+    Returns (max error, (data_path, index) where it occurred, frame).
+    """
+    if sample_count <= 0 or not len(frames):
+        return 0.0, None, None
+    positions = np.unique(np.linspace(0, len(frames) - 1, sample_count).round().astype(int))
+    current = scene.frame_current
+
+    worst = (0.0, None, None)
+    try:
+        for pos in positions:
+            frame = frames[pos]
+            scene.frame_set(int(frame), subframe=float(frame - int(frame)))
+            for (data_path, index), values in channels.items():
+                try:
+                    value = owner.path_resolve(data_path)
+                except ValueError:
+                    continue
+                if hasattr(value, "__len__"):
+                    value = value[index]
+                error = abs(float(value) - values[pos])
+                if error > worst[0]:
+                    worst = (error, (data_path, index), float(frame))
+    finally:
+        scene.frame_set(current)
+    return worst
@@ -0,0 +1,138 @@
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+# One occupied range on a track; item is usually the NlaStrip
+Interval = namedtuple("Interval", ["start", "end", "item"])
+
+
+class TrackIndex:
+    """Sorted interval index of one NLA track
+
+    Strips on a track never overlap, so sorting by start also sorts the
+    ends and every lookup is a bisect. Keep it in sync with add() while
+    placing strips instead of rescanning the track.
+    """
+
+    def __init__(self, intervals=()):
+        self.intervals = sorted(intervals, key=lambda iv: (iv.start, iv.end))
+        self._starts = [iv.start for iv in self.intervals]
+
+    @classmethod
+    def from_track(cls, track):
+        return cls(Interval(strip.frame_start, strip.frame_end, strip) for strip in track.strips)
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def __iter__(self):
+        return iter(self.intervals)
+
+    @property
+    def items(self):
+        return [iv.item for iv in self.intervals]
+
+    @property
+    def last_end(self):
+        """End frame of the last strip, None for an empty track"""
+        if not self.intervals:
+            return None
+        return self.intervals[-1].end
+
+    def add(self, start, end, item=None):
+        interval = Interval(start, end, item)
+        pos = bisect_right(self._starts, start)
+        self._starts.insert(pos, start)
+        self.intervals.insert(pos, interval)
+        return interval
+
+    def remove(self, item):
+        for pos, iv in enumerate(self.intervals):
+            if iv.item == item:
+                del self.intervals[pos]
+                del self._starts[pos]
+                return iv
+        return None
+
+    def overlapping(self, start, end):
+        """Intervals sharing more than a boundary frame with [start, end]"""
+        hi = bisect_left(self._starts, end)
+        lo = hi
+        while lo > 0 and self.intervals[lo - 1].end > start:
+            lo -= 1
+        return self.intervals[lo:hi]
+
+    def is_free(self, start, end):
+        hi = bisect_left(self._starts, end)
+        return hi == 0 or self.intervals[hi - 1].end <= start
+
+    def previous(self, frame):
+        """Last interval starting before frame"""
+        pos = bisect_left(self._starts, frame)
+        return self.intervals[pos - 1] if pos else None
+
+    def next(self, frame):
+        """First interval starting after frame"""
+        pos = bisect_right(self._starts, frame)
+        return self.intervals[pos] if pos < len(self.intervals) else None
+
+    def at(self, frame):
+        """Interval containing frame, if any"""
+        iv = self.previous(frame + 1e-6)
+        return iv if iv is not None and iv.start <= frame <= iv.end else None
+
+    def first_fit(self, length, after=0.0, gap=0.0):
+        """Earliest start >= after where length frames fit with gap on both sides"""
+        start = after
+        pos = bisect_left(self._starts, start)
+        if pos and self.intervals[pos - 1].end + gap > start:
+            start = self.intervals[pos - 1].end + gap
+        for iv in self.intervals[pos:]:
+            if start + length + gap <= iv.start:
+                break
+            start = max(start, iv.end + gap)
+        return start
+
+
+class StackIndex:
+    """Interval indices of the tracks of one NLA stack
+
+    Tracks are keyed by pointer, so renaming a track mid-run keeps its
+    index. Indices are built from the tracks given; tracks added later get
+    an empty one on first use.
+    """
+
+    def __init__(self, nla_tracks=()):
+        self._tracks = {}
+        for track in nla_tracks:
+            self._tracks[track.as_pointer()] = (track, TrackIndex.from_track(track))
+
+    def track(self, track):
+        """Index for a track, created empty for tracks added after building"""
+        key = track.as_pointer()
+        if key not in self._tracks:
+            self._tracks[key] = (track, TrackIndex())
+        return self._tracks[key][1]
+
+    def discard(self, track):
+        """Forget a track, call before removing it from the stack"""
+        self._tracks.pop(track.as_pointer(), None)
+
+    def free_tracks(self, start, end):
+        """(track, index) pairs with room for [start, end], bottom to top"""
+        return [(track, index) for track, index in self._tracks.values() if index.is_free(start, end)]
+
+
+def move_strip(strip, offset):
+    """Slide a strip by offset frames keeping its length"""
+    if not offset:
+        return
+    if hasattr(strip, "frame_start_ui"):
+        # Blender 3.3+: the UI setter moves the whole strip
+        strip.frame_start_ui = strip.frame_start + offset
+    elif offset > 0:
+        # Older versions clamp each end against the other, so lead with the far one
+        strip.frame_end += offset
+        strip.frame_start += offset
+    else:
+        strip.frame_start += offset
+        strip.frame_end += offset
@@ -0,0 +1,196 @@
+import json
+import math
+
+from .nla_index import TrackIndex
+
+MANIFEST_VERSION = 1
+
+# Strip attributes in manifest column order; "action" holds the action name.
+# Import sets them in this order: action range before scale/repeat, those
+# before frame_end, and blends last since they are clamped to the length.
+STRIP_FIELDS = (
+    "name", "action", "frame_start", "action_frame_start", "action_frame_end",
+    "scale", "repeat", "frame_end", "blend_type", "extrapolation", "influence",
+    "use_animated_influence", "blend_in", "blend_out", "use_auto_blend",
+    "use_reverse", "use_sync_length", "mute",
+)
+TRACK_FIELDS = ("name", "mute", "lock", "is_solo")
+
+# Text datablock an exported layout can be embedded in, read by cross-file loads
+LAYOUT_TEXT_NAME = "AH_NLA_Layout.json"
+# Manifest next to a .blend that has no embedded layout: <name>_nla_layout.json
+LAYOUT_FILE_SUFFIX = "_nla_layout.json"
+
+KIND_OBJECT = 'OBJECT'
+KIND_SHAPEKEY = 'SHAPEKEY'
+
+
+def object_stacks(obj):
+    """(kind, AnimData) pairs of an object that hold NLA tracks"""
+    stacks = []
+    if obj.animation_data and obj.animation_data.nla_tracks:
+        stacks.append((KIND_OBJECT, obj.animation_data))
+    if obj.type == 'MESH' and obj.data.shape_keys:
+        anim_data = obj.data.shape_keys.animation_data
+        if anim_data and anim_data.nla_tracks:
+            stacks.append((KIND_SHAPEKEY, anim_data))
+    return stacks
+
+
+def stack_for(obj, kind, create=False):
+    """AnimData of one kind on an object, None when it can't have one"""
+    if kind == KIND_SHAPEKEY:
+        if obj.type != 'MESH' or obj.data.shape_keys is None:
+            return None
+        owner = obj.data.shape_keys
+    else:
+        owner = obj
+    if owner.animation_data is None and create:
+        owner.animation_data_create()
+    return owner.animation_data
+
+
+def _strip_row(strip):
+    row = []
+    for field in STRIP_FIELDS:
+        if field == "action":
+            row.append(strip.action.name if strip.action else None)
+        else:
+            row.append(getattr(strip, field))
+    return row
+
+
+def strip_info(strip):
+    """Manifest fields of one strip as a dict"""
+    return dict(zip(STRIP_FIELDS, _strip_row(strip)))
+
+
+def new_strip_from_info(track, info, action):
+    """Strip on track recreated from manifest fields, the caller checks the range is free
+
+    Raises RuntimeError when the strip at its full action length doesn't fit.
+    """
+    start, end = info["frame_start"], info["frame_end"]
+    try:
+        strip = track.strips.new(info["name"], int(start), action)
+    except RuntimeError:
+        # A fractional start can't be rounded down onto a strip ending just before it
+        strip = track.strips.new(info["name"], math.ceil(start), action)
+    # Whole-frame start from strips.new, exact value once the length is right
+    for field in STRIP_FIELDS[3:]:
+        if field in info and info[field] is not None:
+            try:
+                setattr(strip, field, info[field])
+            except (AttributeError, TypeError, ValueError):
+                pass  # read-only or unknown in this Blender version
+    if strip.frame_start != start:
+        strip.frame_start = start
+        strip.frame_end = end
+    strip.name = info["name"]
+    return strip
+
+
+def layout_of(objects):
+    """Manifest dict describing every NLA track and strip of the objects"""
+    entries = []
+    for obj in objects:
+        for kind, anim_data in object_stacks(obj):
+            tracks = []
+            for track in anim_data.nla_tracks:
+                info = {field: getattr(track, field) for field in TRACK_FIELDS if hasattr(track, field)}
+                info["strips"] = [_strip_row(strip) for strip in track.strips]
+                tracks.append(info)
+            entries.append({"object": obj.name, "kind": kind, "tracks": tracks})
+    return {
+        "version": MANIFEST_VERSION,
+        "strip_fields": list(STRIP_FIELDS),
+        "stacks": entries,
+    }
+
+
+def dumps_layout(layout):
+    return json.dumps(layout, separators=(",", ":"))
+
+
+def loads_layout(text):
+    """Manifest dict from JSON, strips turned back into field dicts"""
+    layout = json.loads(text)
+    if layout.get("version", 0) > MANIFEST_VERSION:
+        raise ValueError(f"Manifest version {layout.get('version')} is newer than this add-on supports")
+    fields = layout.get("strip_fields") or list(STRIP_FIELDS)
+    for entry in layout.get("stacks", ()):
+        for track in entry.get("tracks", ()):
+            track["strips"] = [dict(zip(fields, row)) for row in track.get("strips", ())]
+    return layout
+
+
+def layout_action_names(layout):
+    """Every action name a loaded manifest refers to"""
+    return {strip["action"] for entry in layout.get("stacks", ()) for track in entry.get("tracks", ())
+            for strip in track["strips"] if strip.get("action")}
+
+
+class LayoutBuilder:
+    """Rebuilds manifest tracks on animation data, resolving actions by name
+
+    actions is a {name: action} index built once by the caller. In REPLACE
+    mode tracks of the same name are removed first; in APPEND mode strips go
+    onto existing tracks of that name and strips that would overlap are skipped.
+    So are trimmed or scaled strips whose full-length copy can't be created in
+    front of a later strip.
+    """
+
+    def __init__(self, actions, mode='REPLACE'):
+        self.actions = actions
+        self.mode = mode
+        self.tracks_created = 0
+        self.strips_created = 0
+        self.skipped = 0
+        self.missing_actions = set()
+
+    def build_stack(self, anim_data, tracks):
+        existing = {track.name: track for track in anim_data.nla_tracks}
+        for info in tracks:
+            track = existing.get(info["name"])
+            if track is not None and self.mode == 'REPLACE':
+                anim_data.nla_tracks.remove(track)
+                track = None
+            if track is None:
+                track = anim_data.nla_tracks.new()
+                track.name = info["name"]
+                for field in TRACK_FIELDS[1:]:
+                    if field in info and hasattr(track, field):
+                        setattr(track, field, info[field])
+                self.tracks_created += 1
+                index = TrackIndex()
+            else:
+                index = TrackIndex.from_track(track)
+            for row in info["strips"]:
+                self.build_strip(track, index, row)
+
+    def build_strip(self, track, index, info):
+        action = self.actions.get(info.get("action"))
+        if action is None:
+            self.missing_actions.add(info.get("action") or "<none>")
+            self.skipped += 1
+            return None
+        start, end = info["frame_start"], info["frame_end"]
+        if not index.is_free(start, end):
+            self.skipped += 1
+            return None
+
+        try:
+            strip = new_strip_from_info(track, info, action)
+        except RuntimeError:
+            # Created at full action length first, which can overlap a later strip
+            self.skipped += 1
+            return None
+        index.add(strip.frame_start, strip.frame_end, strip)
+        self.strips_created += 1
+        return strip
+
+    def summary(self):
+        text = f"{self.strips_created} strips on {self.tracks_created} new tracks"
+        if self.skipped:
+            text += f", {self.skipped} skipped"
+        return text
@@ -0,0 +1,104 @@
+import time
+
+# Blend modes that layer on top of what is below instead of replacing it
+LAYERED_BLENDS = {'ADD', 'SUBTRACT', 'MULTIPLY', 'COMBINE'}
+
+
+class StateRestorer:
+    """Remembers the first value of every attribute it changes and puts them all back"""
+
+    def __init__(self):
+        self._saved = []
+        self._seen = set()
+
+    def set(self, struct, attr, value):
+        key = (struct.as_pointer(), attr)
+        if key not in self._seen:
+            self._seen.add(key)
+            self._saved.append((struct, attr, getattr(struct, attr)))
+        setattr(struct, attr, value)
+
+    def restore(self):
+        for struct, attr, value in reversed(self._saved):
+            try:
+                setattr(struct, attr, value)
+            except (ReferenceError, AttributeError):
+                pass  # removed while profiling
+        self._saved.clear()
+        self._seen.clear()
+
+
+def sample_frames(start, end, count):
+    """Up to count whole frames spread evenly over [start, end]"""
+    start, end = int(round(start)), int(round(end))
+    if end <= start or count <= 1:
+        return [start]
+    span = end - start
+    return sorted({start + round(i * span / (count - 1)) for i in range(count)})
+
+
+def time_frames(scene, frames, repeats):
+    """Seconds per frame to evaluate the scene over frames, best of repeats
+
+    Every repeat starts away from the first frame so it is really re-evaluated.
+    """
+    best = float("inf")
+    for _ in range(max(1, repeats)):
+        scene.frame_set(frames[-1] + 1)
+        start = time.perf_counter()
+        for frame in frames:
+            scene.frame_set(frame)
+        best = min(best, time.perf_counter() - start)
+    return best / len(frames)
+
+
+def stack_range(stacks):
+    """(first, last) frame covered by the strips of some AnimData, None without strips"""
+    starts = [s.frame_start for anim_data in stacks for t in anim_data.nla_tracks for s in t.strips]
+    ends = [s.frame_end for anim_data in stacks for t in anim_data.nla_tracks for s in t.strips]
+    return (min(starts), max(ends)) if starts else None
+
+
+def layer_depth(strips):
+    """(deepest overlap, first frame, last frame) of layered strips, by sweeping their bounds"""
+    events = sorted([(s.frame_start, 1) for s in strips] + [(s.frame_end, -1) for s in strips],
+                    key=lambda e: (e[0], e[1]))
+    depth = best = 0
+    best_start = best_end = None
+    for frame, change in events:
+        depth += change
+        if depth > best:
+            best, best_start, best_end = depth, frame, None
+        elif change < 0 and best_end is None and best_start is not None and depth == best - 1:
+            best_end = frame
+    return best, best_start, best_end
+
+
+def setting_warnings(anim_data, min_layers=3):
+    """(track name, strip name, message) for strip settings that make evaluation costly"""
+    warnings = []
+    layered = []
+    holding = 0
+    for track in anim_data.nla_tracks:
+        if track.mute:
+            continue
+        strips = [s for s in track.strips if not s.mute]
+        for strip in strips:
+            if strip.use_animated_influence:
+                warnings.append((track.name, strip.name, "Animated influence (evaluates an extra fcurve per frame)"))
+            if strip.use_animated_time:
+                warnings.append((track.name, strip.name, "Animated strip time"))
+            if strip.blend_type in LAYERED_BLENDS:
+                layered.append(strip)
+            if strip.repeat > 10:
+                warnings.append((track.name, strip.name, f"Repeats {strip.repeat:.0f} times"))
+        if strips and any(s.extrapolation != 'NOTHING' for s in strips):
+            holding += 1
+
+    depth, first, last = layer_depth(layered)
+    if depth >= min_layers:
+        span = f"{first:.0f}-{last:.0f}" if last is not None else f"from {first:.0f}"
+        warnings.append(("", "", f"{depth} Add/Combine layers overlap (frames {span})"))
+    if holding > 1:
+        warnings.append(("", "", f"{holding} tracks hold outside their strips and are evaluated on every frame"))
+    return warnings
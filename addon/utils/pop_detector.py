@@ -0,0 +1,74 @@
+import re
+
+import numpy as np
+
+from .fcurve_arrays import channel_scale
+from .nla_eval import NLAStackEvaluator
+
+_QUOTED_NAME = re.compile(r'\["((?:[^"\\]|\\.)+)"\]')
+
+
+def strip_boundaries(anim_data):
+    """Sorted whole frames where a strip starts or ends on an unmuted track"""
+    frames = set()
+    for track in anim_data.nla_tracks:
+        if track.mute:
+            continue
+        for strip in track.strips:
+            if not strip.mute:
+                frames.add(int(round(strip.frame_start)))
+                frames.add(int(round(strip.frame_end)))
+    return np.array(sorted(frames), dtype=np.float64)
+
+
+def channel_label(data_path, index):
+    """'jaw rotation_euler[0]' for bones, the key name for shape keys"""
+    match = _QUOTED_NAME.search(data_path)
+    prop = data_path.rsplit(".", 1)[-1]
+    if data_path.startswith("key_blocks[") and match:
+        return match.group(1) if prop == "value" else f"{match.group(1)} {prop}"
+    if match:
+        return f"{match.group(1)} {prop}[{index}]"
+    return f"{data_path}[{index}]"
+
+
+def boundary_spikes(anim_data, window=3, min_magnitude=0.2):
+    """Acceleration spikes of the NLA result at strip boundaries
+
+    The stack is evaluated once on a (boundary, offset) grid of +-window
+    frames. Velocity and acceleration are taken per channel on that grid
+    in channel_scale() units, so every kind of channel ranks on one absolute
+    scale, and the largest acceleration within a frame of each boundary is
+    its magnitude. Returns
+    [(magnitude, velocity, frame, data_path, index)] above min_magnitude.
+    """
+    boundaries = strip_boundaries(anim_data)
+    window = max(window, 2)
+    if not len(boundaries):
+        return []
+    offsets = np.arange(-window, window + 1, dtype=np.float64)
+    grid = boundaries[:, None] + offsets[None, :]
+    channels = NLAStackEvaluator(anim_data).evaluate(grid.ravel())
+    if not channels:
+        return []
+
+    keys = list(channels)
+    values = np.stack([channels[key] for key in keys]).reshape(len(keys), len(boundaries), len(offsets))
+    units = np.array([channel_scale(data_path) for data_path, _ in keys])
+    values = values / units[:, None, None]
+
+    velocity = np.diff(values, axis=2)
+    acceleration = np.abs(np.diff(velocity, axis=2))
+    # acceleration[..., k] is centred on offset k + 1 - window; keep the boundary and its neighbours
+    centre = np.flatnonzero(np.abs(np.arange(acceleration.shape[2]) + 1 - window) <= 1)
+    near = acceleration[:, :, centre]
+    peak = near.argmax(axis=2)
+    magnitude = np.take_along_axis(near, peak[:, :, None], axis=2)[:, :, 0]
+    speed = np.abs(velocity[:, :, window - 2:window + 2]).max(axis=2)
+
+    spikes = []
+    for c, b in zip(*np.nonzero(magnitude > min_magnitude)):
+        frame = boundaries[b] + centre[peak[c, b]] + 1 - window
+        data_path, index = keys[c]
+        spikes.append((float(magnitude[c, b]), float(speed[c, b]), int(frame), data_path, index))
+    return spikes
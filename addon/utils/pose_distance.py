@@ -0,0 +1,91 @@
+import numpy as np
+
+from .fcurve_arrays import channel_default, channel_scale, evaluate_fcurve, read_keyframes
+from .lip_sync import MOUTH_KEYWORDS, is_mouth_channel
+from .nla_eval import strip_action_time
+
+# Starts of bone name words of the face and head, on top of the mouth ones
+FACE_KEYWORDS = MOUTH_KEYWORDS + ("brow", "eye", "lid", "cheek", "nose", "ear", "forehead", "head", "neck")
+
+
+def is_face_channel(data_path):
+    """Shape key values and face/head bone channels"""
+    if data_path.startswith("key_blocks["):
+        return True
+    return data_path.startswith("pose.bones[") and is_mouth_channel(data_path, FACE_KEYWORDS)
+
+
+def boundary_pose_distances(strip_lists, channel_filter=is_face_channel):
+    """Pose jump at every boundary of every strip list, one array per list
+
+    For strips a, b following each other, the pose at the end of a is
+    compared with the pose at the start of b, both straight from the
+    actions. Each channel is scaled by its key range over the list's
+    actions, never less than its channel_scale() unit, and a boundary's
+    distance is its largest scaled jump (0..1). Every action is evaluated
+    once, at all the times requested from it.
+    """
+    requests = {}  # action name -> (action, [action times])
+
+    def request(strip, frame):
+        if strip.action is None:
+            return None
+        time = float(strip_action_time(strip, np.array([frame], dtype=np.float64))[0])
+        action, times = requests.setdefault(strip.action.name, (strip.action, []))
+        times.append(time)
+        return strip.action.name, len(times) - 1
+
+    slots = []
+    for strips in strip_lists:
+        slots.append([(request(a, a.frame_end), request(b, b.frame_start)) for a, b in zip(strips, strips[1:])])
+
+    values = {}
+    extents = {}  # action name -> {channel: (lowest key, highest key)}
+    for name, (action, times) in requests.items():
+        frames = np.asarray(times, dtype=np.float64)
+        values[name] = {}
+        extents[name] = {}
+        for fc in action.fcurves:
+            if fc.mute or not channel_filter(fc.data_path):
+                continue
+            keys = read_keyframes(fc)
+            key = (fc.data_path, fc.array_index)
+            values[name][key] = evaluate_fcurve(fc, frames, keys)
+            if len(keys.values):
+                extents[name][key] = (keys.values.min(), keys.values.max())
+
+    distances = []
+    for pairs in slots:
+        keys = sorted({key for pair in pairs for slot in pair if slot for key in values[slot[0]]})
+        if not pairs or not keys:
+            distances.append(np.zeros(len(pairs)))
+            continue
+        outgoing = np.empty((len(pairs), len(keys)))
+        incoming = np.empty((len(pairs), len(keys)))
+        for c, key in enumerate(keys):
+            default = channel_default(*key)
+            for r, (out_slot, in_slot) in enumerate(pairs):
+                outgoing[r, c] = values[out_slot[0]][key][out_slot[1]] if out_slot and key in values[out_slot[0]] else default
+                incoming[r, c] = values[in_slot[0]][key][in_slot[1]] if in_slot and key in values[in_slot[0]] else default
+        names = {slot[0] for pair in pairs for slot in pair if slot}
+        ranges = np.array([channel_range(key, [extents[name][key] for name in names if key in extents[name]])
+                           for key in keys])
+        jumps = np.abs(incoming - outgoing) / ranges
+        distances.append(np.minimum(jumps.max(axis=1), 1.0))
+    return distances
+
+
+def channel_range(key, extents):
+    """Scale a channel's jumps are measured against: its key range, at least its unit"""
+    unit = channel_scale(key[0])
+    if not extents:
+        return unit
+    low = min(lo for lo, _ in extents)
+    high = max(hi for _, hi in extents)
+    return max(high - low, unit)
+
+
+def adaptive_blend_frames(distances, min_frames, max_frames, full_jump=0.5):
+    """Blend length per boundary, growing linearly with the pose jump up to full_jump"""
+    scale = np.clip(np.asarray(distances, dtype=np.float64) / max(full_jump, 1e-6), 0.0, 1.0)
+    return np.rint(min_frames + (max_frames - min_frames) * scale).astype(np.int64)
@@ -0,0 +1,77 @@
+import bisect
+import math
+from collections import namedtuple
+
+# One strip of a lane and where it ends up
+Move = namedtuple("Move", ["item", "old_start", "old_end", "new_start", "new_end"])
+
+
+class RetimeTransform(namedtuple("RetimeTransform", ["offset", "scale", "pivot", "snap"])):
+    """Frame mapping: scale around pivot, then offset, optionally rounded"""
+
+    def frame(self, value):
+        mapped = self.pivot + (value - self.pivot) * self.scale + self.offset
+        return float(round(mapped)) if self.snap else mapped
+
+
+def lane_moves(intervals, window_start, window_end, transform, ripple=False, scale_lengths=False, movable=None):
+    """Final positions of the strips of one lane (NLA track or sequencer channel)
+
+    intervals are (start, end, item). Strips starting inside the window
+    are remapped, with ripple the ones after it follow the window end, and
+    the rest stay. One sweep in start order pushes any strip that would
+    overlap its predecessor to the right, so the order never changes and the
+    result never overlaps. Items movable(item) rejects keep their place and
+    only push moving strips past them. Returns ([Move] of changed strips,
+    pushed count).
+    """
+    if movable is None:
+        fixed, moving = [], intervals
+    else:
+        fixed = sorted((iv[0], iv[1]) for iv in intervals if not movable(iv[2]))
+        moving = [iv for iv in intervals if movable(iv[2])]
+    fixed_starts = [start for start, _ in fixed]
+
+    after_delta = transform.frame(window_end) - window_end
+    moves = []
+    pushed = 0
+    previous_end = -math.inf
+    for start, end, item in sorted(moving, key=lambda iv: (iv[0], iv[1])):
+        if window_start <= start < window_end:
+            new_start = transform.frame(start)
+            new_end = transform.frame(end) if scale_lengths else new_start + (end - start)
+        elif ripple and start >= window_end:
+            new_start, new_end = start + after_delta, end + after_delta
+        else:
+            new_start, new_end = start, end
+        if new_end <= new_start:
+            new_end = new_start + 1.0
+        shift = max(previous_end - new_start, 0.0)
+        while True:
+            if transform.snap:
+                shift = math.ceil(shift - 1e-6)
+            # The fixed strip starting last before this one ends reaches furthest right
+            i = bisect.bisect_left(fixed_starts, new_end + shift - 1e-6)
+            if i == 0 or fixed[i - 1][1] <= new_start + shift + 1e-6:
+                break
+            shift = fixed[i - 1][1] - new_start
+        if shift > 1e-6:
+            new_start += shift
+            new_end += shift
+            pushed += 1
+        previous_end = new_end
+        if abs(new_start - start) > 1e-6 or abs(new_end - end) > 1e-6:
+            moves.append(Move(item, start, end, new_start, new_end))
+    return moves, pushed
+
+
+def application_order(moves):
+    """Moves ordered so no intermediate state overlaps
+
+    Strips going right are handled last-to-first, then strips going left
+    first-to-last; with the order kept by lane_moves every strip only ever
+    slides into space its neighbours have already left.
+    """
+    right = sorted((m for m in moves if m.new_start > m.old_start), key=lambda m: m.old_start, reverse=True)
+    rest = sorted((m for m in moves if m.new_start <= m.old_start), key=lambda m: m.old_start)
+    return right + rest
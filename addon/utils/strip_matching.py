@@ -0,0 +1,222 @@
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+
+# Language suffixes recognised in audio names besides those found on NLA strips
+LANGUAGE_SUFFIXES = ("FR", "SP", "IT", "DE", "EN", "ES", "PT")
+_TOKEN = re.compile(r'[A-Za-z]+|\d+')
+_AUDIO_EXTENSIONS = (".wav", ".wave", ".mp3", ".ogg", ".flac", ".aif", ".aiff", ".m4a")
+
+# What a strip name tells about the line it belongs to
+NameFeatures = namedtuple("NameFeatures", ["tokens", "numbers", "code", "number", "suffix"])
+
+
+def name_tokens(name):
+    """Lower-case word and number tokens; numbers lose their leading zeros"""
+    root, ext = os.path.splitext(name)
+    if ext.lower() in _AUDIO_EXTENSIONS:
+        name = root
+    return [str(int(t)) if t.isdigit() else t.lower() for t in _TOKEN.findall(name)]
+
+
+def nla_features(strip, parse_name):
+    """Features of an NLA strip, read from its speech action name when it has one
+
+    parse_name splits a speech action name into a dict with 'char_code',
+    'number' and 'suffix', or returns None for other names.
+    """
+    names = [strip.name]
+    if strip.action is not None:
+        names.insert(0, strip.action.name)
+    parts = None
+    for name in names:
+        parts = parse_name(name)
+        if parts:
+            break
+    tokens = frozenset(t for name in names for t in name_tokens(name))
+    numbers = frozenset(int(t) for t in tokens if t.isdigit())
+    if parts is None:
+        return NameFeatures(tokens, numbers, "", None, "")
+    return NameFeatures(tokens, numbers, parts['char_code'].lower(), parts['number'], parts['suffix'].lower())
+
+
+def audio_features(strip):
+    """Features of a sound strip from its name and file name"""
+    names = [strip.name]
+    sound = getattr(strip, "sound", None)
+    if sound is not None and sound.filepath:
+        names.append(os.path.basename(sound.filepath.replace("\\", "/")))
+    tokens = frozenset(t for name in names for t in name_tokens(name))
+    numbers = frozenset(int(t) for t in tokens if t.isdigit())
+    return NameFeatures(tokens, numbers, "", None, "")
+
+
+def name_similarity(nla, audio, languages):
+    """0..1 agreement between an NLA strip name and a sound strip name
+
+    Speech actions are compared by line number, character code and
+    language suffix; other names by shared tokens.
+    """
+    if nla.number is None:
+        union = nla.tokens | audio.tokens
+        return len(nla.tokens & audio.tokens) / len(union) if union else 0.0
+
+    number = 1.0 if nla.number in audio.numbers else 0.0
+    code = 1.0 if any(t.startswith(nla.code) or nla.code.startswith(t) for t in audio.tokens
+                      if len(t) >= 3 and not t.isdigit()) else 0.0
+    audio_languages = audio.tokens & languages
+    if nla.suffix:
+        language = 1.0 if nla.suffix in audio_languages else 0.0
+    else:
+        # Untranslated lines should not grab dubbed clips
+        language = 0.0 if audio_languages else 1.0
+    return 0.5 * number + 0.2 * code + 0.3 * language
+
+
+def score_matrix(nla_strips, audio_strips, parse_name, name_weight=0.5, duration_weight=0.25,
+                 proximity_weight=0.25, proximity_scale=250.0):
+    """(len(nla), len(audio)) pair scores in 0..1
+
+    Each score is a weighted mix of name similarity, how close the two
+    durations are and how near the strips currently sit in time.
+    """
+    nla = [nla_features(s, parse_name) for s in nla_strips]
+    audio = [audio_features(s) for s in audio_strips]
+    languages = {s.lower() for s in LANGUAGE_SUFFIXES} | {f.suffix for f in nla if f.suffix}
+
+    names = np.array([[name_similarity(n, a, languages) for a in audio] for n in nla], dtype=np.float64)
+    names = names.reshape(len(nla), len(audio))
+
+    nla_start = np.array([s.frame_start for s in nla_strips], dtype=np.float64)
+    nla_length = np.array([s.frame_end - s.frame_start for s in nla_strips], dtype=np.float64)
+    audio_start = np.array([s.frame_final_start for s in audio_strips], dtype=np.float64)
+    audio_length = np.array([s.frame_final_end - s.frame_final_start for s in audio_strips], dtype=np.float64)
+
+    longer = np.maximum(nla_length[:, None], audio_length[None, :])
+    shorter = np.minimum(nla_length[:, None], audio_length[None, :])
+    durations = np.where(longer > 0, shorter / np.where(longer > 0, longer, 1.0), 1.0)
+    proximity = np.exp(-np.abs(nla_start[:, None] - audio_start[None, :]) / max(proximity_scale, 1e-6))
+
+    total = name_weight + duration_weight + proximity_weight
+    if total <= 0:
+        return names
+    return (name_weight * names + duration_weight * durations + proximity_weight * proximity) / total
+
+
+def solve_assignment(cost):
+    """Minimum cost assignment of every row to a distinct column (rows <= columns)
+
+    Hungarian method with potentials, O(n^2 m) with the inner loop in numpy.
+    Returns the column chosen for each row.
+    """
+    rows, cols = cost.shape
+    u = np.zeros(rows + 1)
+    v = np.zeros(cols + 1)
+    owner = np.zeros(cols + 1, dtype=np.int64)  # row (1-based) assigned to each column
+    way = np.zeros(cols + 1, dtype=np.int64)
+
+    for row in range(1, rows + 1):
+        owner[0] = row
+        col0 = 0
+        min_slack = np.full(cols + 1, np.inf)
+        used = np.zeros(cols + 1, dtype=bool)
+        while True:
+            used[col0] = True
+            row0 = owner[col0]
+            slack = cost[row0 - 1] - u[row0] - v[1:]
+            free = ~used[1:]
+            better = free & (slack < min_slack[1:])
+            min_slack[1:][better] = slack[better]
+            way[1:][better] = col0
+            candidates = np.where(free, min_slack[1:], np.inf)
+            col1 = int(np.argmin(candidates)) + 1
+            delta = candidates[col1 - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_slack[1:][free] -= delta
+            col0 = col1
+            if owner[col0] == 0:
+                break
+        while col0:
+            col1 = way[col0]
+            owner[col0] = owner[col1]
+            col0 = col1
+
+    result = np.full(rows, -1, dtype=np.int64)
+    assigned = np.flatnonzero(owner[1:])
+    result[owner[1:][assigned] - 1] = assigned
+    return result
+
+
+def match_strips(scores, min_score=0.3):
+    """Globally best one-to-one pairs from a score matrix
+
+    Every row may also stay unmatched, which wins over any pair scoring
+    below min_score. Returns (pairs [(row, col, score)], unmatched rows,
+    unmatched columns).
+    """
+    rows, cols = scores.shape
+    if rows == 0 or cols == 0:
+        return [], list(range(rows)), list(range(cols))
+    # One "unmatched" column per row costs 0, a real pair costs min_score - score
+    cost = np.zeros((rows, cols + rows))
+    cost[:, :cols] = min_score - scores
+    choice = solve_assignment(cost)
+
+    pairs = [(r, int(c), float(scores[r, c])) for r, c in enumerate(choice) if c < cols]
+    matched_cols = {c for _, c, _ in pairs}
+    unmatched_rows = [r for r, c in enumerate(choice) if c >= cols]
+    unmatched_cols = [c for c in range(cols) if c not in matched_cols]
+    return pairs, unmatched_rows, unmatched_cols
+
+
+# Words of rig names that say nothing about the character
+_GENERIC_WORDS = {"rig", "armature", "metarig", "root", "cc", "base", "body", "face", "head", "mesh", "geo"}
+_WORD = re.compile(r'[A-Za-z]{3,}')
+
+
+def routing_keywords(code, owner_names=(), extra=()):
+    """Audio name keywords of a character: its code, the words of its rig names and any extra"""
+    keywords = {code.lower()}
+    for name in owner_names:
+        keywords.update(w.lower() for w in _WORD.findall(name) if w.lower() not in _GENERIC_WORDS)
+    keywords.update(k.strip().lower() for k in extra if k.strip())
+    return keywords
+
+
+def parse_routing(text):
+    """'JOH:john, MAR:mark' -> {'JOH': ['john'], 'MAR': ['mark']}"""
+    routing = {}
+    for entry in text.split(","):
+        code, sep, keyword = entry.partition(":")
+        if sep and code.strip() and keyword.strip():
+            routing.setdefault(code.strip().upper(), []).append(keyword.strip())
+    return routing
+
+
+def route_audio(audio_strips, keywords_by_code):
+    """Split sound strips between characters by keyword, in one pass
+
+    Each clip goes to the character with the longest keyword found at the
+    start of a word in its name. Returns ({code: [strips]}, [unrouted strips]).
+    """
+    patterns = {
+        code: re.compile(r'(?<![a-z])(?:' + '|'.join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)) + ')',
+                         re.IGNORECASE)
+        for code, keywords in keywords_by_code.items() if keywords
+    }
+    routed = {code: [] for code in keywords_by_code}
+    unrouted = []
+    for strip in audio_strips:
+        best = None
+        for code, pattern in patterns.items():
+            match = pattern.search(strip.name)
+            if match and (best is None or len(match.group(0)) > best[0]):
+                best = (len(match.group(0)), code)
+        if best is None:
+            unrouted.append(strip)
+        else:
+            routed[best[1]].append(strip)
+    return routed, unrouted
@@ -0,0 +1,159 @@
+import math
+
+from .nla_index import TrackIndex
+from .nla_layout import new_strip_from_info, strip_info
+
+# Track flags that keep a track exactly where it is
+_PINNED_FLAGS = ("mute", "lock", "is_solo")
+
+
+def pack_levels(lanes):
+    """Lowest track level for every strip, keeping the order of overlapping strips
+
+    lanes are the tracks bottom to top, each a list of (start, end, key,
+    pinned). A strip goes to the lowest free level above every overlapping
+    strip from a lower lane, so whatever it covered it still covers; pinned
+    strips keep their own lane. No strip ends up above its own lane.
+    Returns ({key: level}, level count).
+    """
+    levels = []
+    placed = {}
+    for lane_number, lane in enumerate(lanes):
+        for start, end, key, pinned in lane:
+            if pinned:
+                level = lane_number
+            else:
+                floor = 0
+                for candidate in range(len(levels) - 1, -1, -1):
+                    if levels[candidate].overlapping(start, end):
+                        floor = candidate + 1
+                        break
+                level = floor
+                while level < len(levels) and not levels[level].is_free(start, end):
+                    level += 1
+            while len(levels) <= level:
+                levels.append(TrackIndex())
+            levels[level].add(start, end, key)
+            placed[key] = level
+    return placed, len(levels)
+
+
+def track_segments(nla_tracks):
+    """Runs of adjacent tracks that may be packed together, bottom to top
+
+    Muted, locked and solo tracks split the stack and stay untouched, and so
+    do tracks holding transition, meta or other strips without an action,
+    which can't be recreated elsewhere. Empty tracks are left alone and
+    don't split it.
+    """
+    segments = [[]]
+    for track in nla_tracks:
+        if (any(getattr(track, flag, False) for flag in _PINNED_FLAGS)
+                or any(strip.type != 'CLIP' or strip.action is None for strip in track.strips)):
+            segments.append([])
+        elif len(track.strips):
+            segments[-1].append(track)
+    return [segment for segment in segments if len(segment) > 1]
+
+
+def segment_lanes(segment, clear_holds, stuck=()):
+    """(start, end, (lane, name), pinned) lanes of a segment
+
+    With clear_holds strips count with their own range only. Otherwise a
+    holding strip occupies everything it holds and stays on its track, since
+    moving it would change how far it holds. Strips named in stuck keep
+    their track too.
+    """
+    lanes = []
+    for lane_number, track in enumerate(segment):
+        strips = sorted(track.strips, key=lambda s: s.frame_start)
+        lane = []
+        for position, strip in enumerate(strips):
+            key = (lane_number, strip.name)
+            if clear_holds or strip.extrapolation == 'NOTHING':
+                lane.append((strip.frame_start, strip.frame_end, key, strip.name in stuck))
+            else:
+                next_start = strips[position + 1].frame_start if position + 1 < len(strips) else math.inf
+                start = -math.inf if strip.extrapolation == 'HOLD' else strip.frame_start
+                lane.append((start, next_start, key, True))
+        lanes.append(lane)
+    return lanes
+
+
+def copy_strip_fcurves(source, target):
+    """Animated influence/time keys of a strip onto its copy"""
+    for fcurve in source.fcurves:
+        copy = target.fcurves.find(fcurve.data_path, index=fcurve.array_index)
+        if copy is None or not len(fcurve.keyframe_points):
+            continue
+        count = len(fcurve.keyframe_points)
+        coords = [0.0] * (2 * count)
+        fcurve.keyframe_points.foreach_get("co", coords)
+        copy.keyframe_points.clear()
+        copy.keyframe_points.add(count)
+        copy.keyframe_points.foreach_set("co", coords)
+        copy.update()
+
+
+def compact_stack(anim_data, clear_holds=False, track_name=""):
+    """Pack the NLA tracks of one animation data block into as few tracks as possible
+
+    Strips only ever move down, onto tracks whose overlapping strips they
+    are already above, so moves are done bottom-up and each target range is
+    free when it is filled. Returns (strips moved, tracks removed, holds cleared).
+    """
+    moved = removed = holds = 0
+    for segment in track_segments(anim_data.nla_tracks):
+        if clear_holds:
+            for track in segment:
+                for strip in track.strips:
+                    if strip.extrapolation != 'NOTHING':
+                        strip.extrapolation = 'NOTHING'
+                        holds += 1
+
+        stuck = set()
+        while True:
+            levels, count = pack_levels(segment_lanes(segment, clear_holds, stuck))
+            if count >= len(segment):
+                break
+            count, left = move_to_levels(segment, levels)
+            moved += count
+            if not left:
+                break
+            # Plan again around the strip that couldn't move, the moves so far keep the stack consistent
+            stuck |= left
+
+        for track in segment:
+            if not len(track.strips):
+                anim_data.nla_tracks.remove(track)
+                removed += 1
+            elif track_name:
+                track.name = track_name
+    return moved, removed, holds
+
+
+def move_to_levels(segment, levels):
+    """Move strips to their planned tracks bottom-up, returns (moved, names left in place)
+
+    strips.new makes a copy as long as its whole action before it is cut
+    down, so a trimmed or sped-up strip may not be creatable in front of a
+    later strip even though its real range fits. Such a strip is left where
+    it is, and moving stops there since strips above may rely on its move.
+    """
+    moved = 0
+    for lane_number, track in enumerate(segment):
+        for strip in sorted(track.strips, key=lambda s: s.frame_start):
+            level = levels[(lane_number, strip.name)]
+            if level == lane_number:
+                continue
+            info = strip_info(strip)
+            # Strip names are unique per stack, the copy takes the name once the original is gone
+            try:
+                copy = new_strip_from_info(segment[level], dict(info, name=f"{info['name']}__moving"), strip.action)
+            except RuntimeError:
+                return moved, {strip.name}
+            copy_strip_fcurves(strip, copy)
+            track.strips.remove(strip)
+            copy.name = info["name"]
+            moved += 1
+    return moved, set()